@@ -10,6 +10,8 @@ from src.core.server import Server
 from colorama import init, Fore, Back
 from collections import defaultdict
 
+from src.core.cache_server import CacheServer
+from src.core.release_catalog import ReleaseCatalog
 from src.core.virtual_host import VirtualHost
 from src.core.cli_arguments import Arguments
 
@@ -37,98 +39,148 @@ def show_help():
     print(Fore.YELLOW + "-" * 80)
 
 
-try:
-    args = Arguments()
+# Pool workers (spawned on Windows) re-import this script; only the parent may dispatch
+if __name__ == "__main__":
+    try:
+        args = Arguments()
 
-    registered_commands = {
-        "dev:setup": {
-            "func": lambda: Server().setup(),
-            "desc": "Setup fresh server stack for PHP development environment"
-        },
-        "dev:clear": {
-            "func": lambda: Server().clear(),
-            "desc": "Clear,Delete development environment"
-        },
-        # "server:init": {
-        #     "func": lambda: Server().init(),
-        #     "desc": "Initialize the server stack"
-        # },
-        # "server:conf": {
-        #     "func": lambda: Server().conf(),
-        #     "desc": "Configure server settings"
-        # },
-        # "server:update": {
-        #     "func": lambda: Server().update(),
-        #     "desc": "Update the server stack"
-        # },
-        # "app:init": {
-        #     "func": lambda: App().init(),
-        #     "desc": "Initialize the application"
-        # },
-        # "app:conf": {
-        #     "func": lambda: App().conf(),
-        #     "desc": "Configure application settings"
-        # },
-        # "app:update": {
-        #     "func": lambda: App().update(),
-        #     "desc": "Update application stack"
-        # },
-        # "app:migrate": {
-        #     "func": lambda: App().migrate(),
-        #     "desc": "Run database migrations"
-        # },
-        # "app:open": {
-        #     "func": lambda: App().open(),
-        #     "desc": "Open the application in browser"
-        # },
-        "service:install": {
-            "func": lambda: Service().install(),
-            "desc": "Install background service"
-        },
-        "service:remove": {
-            "func": lambda: Service().remove(),
-            "desc": "Remove background service"
-        },
-        "service:start": {
-            "func": lambda: Service().start(),
-            "desc": "Start service"
-        },
-        "service:stop": {
-            "func": lambda: Service().stop(),
-            "desc": "Stop service"
-        },
-        "service:restart": {
-            "func": lambda: Service().restart(),
-            "desc": "Restart service"
-        },
-        "vhost:add": {
-            "func": lambda: VirtualHost().add_project(args),
-            "desc": "Add random virtual host for any PHP project"
-        },
-        "vhost:remove":{
-            "func": lambda : VirtualHost().remove_project(args),
-            "desc": "Remove random added virtual host for any PHP project"
-        },
-        "help": {
-            "func": lambda: show_help(),
-            "desc": "Show this help message"
-        },
-    }
+        registered_commands = {
+            "dev:setup": {
+                "func": lambda: Server(args).setup(),
+                "desc": "Setup fresh server stack for PHP development environment"
+            },
+            "dev:verify": {
+                "func": lambda: Server(args).verify(),
+                "desc": "Verify installed binaries against their manifests (--deep, --repair)"
+            },
+            "dev:modules": {
+                "func": lambda: Server(args).modules(),
+                "desc": "Report Apache modules no directive uses (--apply to unload them)"
+            },
+            "dev:clear": {
+                "func": lambda: Server(args).clear(),
+                "desc": "Clear,Delete development environment"
+            },
+            # "server:init": {
+            #     "func": lambda: Server().init(),
+            #     "desc": "Initialize the server stack"
+            # },
+            # "server:conf": {
+            #     "func": lambda: Server().conf(),
+            #     "desc": "Configure server settings"
+            # },
+            # "server:update": {
+            #     "func": lambda: Server().update(),
+            #     "desc": "Update the server stack"
+            # },
+            # "app:init": {
+            #     "func": lambda: App().init(),
+            #     "desc": "Initialize the application"
+            # },
+            # "app:conf": {
+            #     "func": lambda: App().conf(),
+            #     "desc": "Configure application settings"
+            # },
+            # "app:update": {
+            #     "func": lambda: App().update(),
+            #     "desc": "Update application stack"
+            # },
+            # "app:migrate": {
+            #     "func": lambda: App().migrate(),
+            #     "desc": "Run database migrations"
+            # },
+            # "app:open": {
+            #     "func": lambda: App().open(),
+            #     "desc": "Open the application in browser"
+            # },
+            "service:install": {
+                "func": lambda: Service().install(),
+                "desc": "Install background service"
+            },
+            "service:remove": {
+                "func": lambda: Service().remove(),
+                "desc": "Remove background service"
+            },
+            "service:start": {
+                "func": lambda: Service().start(check=not args.get("no-check", False)),
+                "desc": "Start service"
+            },
+            "service:stop": {
+                "func": lambda: Service().stop(),
+                "desc": "Stop service"
+            },
+            "service:restart": {
+                "func": lambda: Service().restart(check=not args.get("no-check", False)),
+                "desc": "Restart service"
+            },
+            "service:check": {
+                "func": lambda: Service().check(),
+                "desc": "Validate the Apache configuration without touching the service"
+            },
+            "vhost:add": {
+                "func": lambda: VirtualHost().add_project(args),
+                "desc": "Add random virtual host for any PHP project"
+            },
+            "vhost:remove":{
+                "func": lambda : VirtualHost().remove_project(args),
+                "desc": "Remove random added virtual host for any PHP project"
+            },
+            "vhost:import": {
+                "func": lambda: VirtualHost().import_projects(args),
+                "desc": "Add every virtual host of a JSON/CSV manifest (--file) with a single restart"
+            },
+            "vhost:export": {
+                "func": lambda: VirtualHost().export_projects(args),
+                "desc": "Write all virtual hosts to a JSON/CSV manifest (--file)"
+            },
+            "vhost:list": {
+                "func": lambda: VirtualHost().list_projects(args),
+                "desc": "List registered virtual hosts (--port=N to filter)"
+            },
+            "vhost:show": {
+                "func": lambda: VirtualHost().show_project(args),
+                "desc": "Show a registered virtual host and its generated config"
+            },
+            "vhost:ini": {
+                "func": lambda: VirtualHost().ini_project(args),
+                "desc": "Show or change a virtual host's PHP settings (--set=key=value,... --unset=key,...)"
+            },
+            "vhost:preload": {
+                "func": lambda: VirtualHost().preload_project(args),
+                "desc": "Generate an OPcache preload script for a virtual host (--hostname or --dir)"
+            },
+            "catalog:refresh": {
+                "func": lambda: ReleaseCatalog(ttl=args.get("ttl", ReleaseCatalog.TTL)).refresh(force=True),
+                "desc": "Revalidate the Apache/PHP release indexes"
+            },
+            "catalog:list": {
+                "func": lambda: ReleaseCatalog(ttl=args.get("ttl", ReleaseCatalog.TTL)).list(args.get("name")),
+                "desc": "List available Apache/PHP releases from the local catalog"
+            },
+            "cache:serve": {
+                "func": lambda: CacheServer().serve_project(args),
+                "desc": "Share the local artifact cache over HTTP as a LAN mirror"
+            },
+            "help": {
+                "func": lambda: show_help(),
+                "desc": "Show this help message"
+            },
+        }
 
-    # No command provided → show help
-    if len(sys.argv) < 2:
-        print(Back.RED + " Error: No command provided.")
-        show_help()
-        sys.exit(1)
+        # No command provided → show help
+        if len(sys.argv) < 2:
+            print(Back.RED + " Error: No command provided.")
+            show_help()
+            sys.exit(1)
 
-    command = sys.argv[1]
+        command = sys.argv[1]
 
-    if command in registered_commands:
-        registered_commands[command]['func']()
-    else:
-        print(f"{Back.RED} Error: Unknown command '{command}'")
-        show_help()
+        if command in registered_commands:
+            registered_commands[command]['func']()
+        else:
+            print(f"{Back.RED} Error: Unknown command '{command}'")
+            show_help()
 
-except Exception as e:
-    print(e)
-    traceback.print_exc()
+    except Exception as e:
+        print(e)
+        traceback.print_exc()
@@ -0,0 +1,381 @@
+import glob
+import os
+import re
+import threading
+from collections import defaultdict
+from typing import Iterator, List, Optional
+
+from colorama import Fore
+
+from src.core.apache_modules import ApacheModules
+from src.core.path_manager import PathManager
+
+
+class ConfigNode:
+    """One directive or section of the Apache configuration, with where it was read from."""
+
+    def __init__(self, name: str, args: List[str], file: str = None, line: int = 0, active: bool = True):
+        self.name = name
+        self.args = args
+        self.file = file
+        self.line = line
+        self.active = active
+        self.children: List["ConfigNode"] = []
+
+    @property
+    def key(self) -> str:
+        return self.name.lower()
+
+    def walk(self, active_only: bool = True) -> Iterator["ConfigNode"]:
+        """Depth-first over the subtree, skipping sections Apache would not evaluate."""
+        for child in self.children:
+            if active_only and not child.active:
+                continue
+            yield child
+            yield from child.walk(active_only)
+
+    def find(self, name: str) -> List["ConfigNode"]:
+        return [node for node in self.walk() if node.key == name.lower()]
+
+    def __repr__(self):
+        return f"<{self.name} {' '.join(self.args)} @ {self.file}:{self.line}>"
+
+
+class ConfigIssue:
+    ERROR = "error"
+    WARNING = "warning"
+
+    def __init__(self, level: str, message: str, node: ConfigNode = None, file: str = None, line: int = 0):
+        self.level = level
+        self.message = message
+        self.file = node.file if node else file
+        self.line = node.line if node else line
+
+    def __str__(self):
+        location = f"{self.file}:{self.line}" if self.file else "config"
+        return f"{location}: {self.message}"
+
+
+class ApacheConfig:
+    """
+    In-process reader and static checker for httpd.conf.
+
+    Follows Include/IncludeOptional (globs, relative to ServerRoot), Define/UnDefine and
+    ${VAR} substitution, and evaluates <IfModule>/<IfDefine> against the LoadModule lines
+    and defines seen so far, the way httpd does while reading its config. The resulting
+    directive tree is cached per config file and reused while no file it was built from
+    has changed, so checking before every restart costs a handful of stat calls.
+
+    check() catches what would otherwise only surface as a failed `net start`: broken
+    sections, missing includes/modules/certificates, conflicting Listen lines, vhosts
+    shadowed by a duplicate ServerName and DocumentRoots that do not exist.
+    """
+
+    # Compiled into the Windows httpd binary, usable in <IfModule> without LoadModule
+    STATIC_MODULES = {"core_module", "win32_module", "mpm_winnt_module", "http_module", "so_module"}
+    CONDITIONALS = {"ifmodule", "ifdefine"}
+    CERTIFICATE_DIRECTIVES = {
+        "sslcertificatefile", "sslcertificatekeyfile", "sslcertificatechainfile", "sslcacertificatefile",
+    }
+    VARIABLE = re.compile(r"\$\{(\w+)}")
+    ARGUMENT = re.compile(r'"((?:[^"\\]|\\.)*)"|\'([^\']*)\'|(\S+)')
+
+    _cache = {}
+    _cache_lock = threading.Lock()
+
+    def __init__(self, conf_file: str = None, server_root: str = None, defines: dict = None):
+        if conf_file is None or server_root is None:
+            path_manager = PathManager()
+            conf_file = conf_file or path_manager.deploy_structure("httpd_conf")
+            server_root = server_root or path_manager.deploy_structure("apache_root")
+        self.conf_file = os.path.abspath(conf_file)
+        self.initial_server_root = server_root
+        self.initial_defines = dict(defines or {})
+
+    # -------------------------
+    # Public operations
+    # -------------------------
+    def parse(self) -> ConfigNode:
+        """Directive tree of the whole configuration (from cache while no source file changed)."""
+        key = (self.conf_file, self.initial_server_root, tuple(sorted(self.initial_defines.items())))
+        with self._cache_lock:
+            cached = self._cache.get(key)
+        if cached and self._signature(cached["sources"]) == cached["signature"]:
+            self.__dict__.update(cached["state"])
+            return cached["tree"]
+
+        self.server_root = self.initial_server_root
+        self.defines = dict(self.initial_defines)
+        self.modules = set(self.STATIC_MODULES)
+        self.sources = set()
+        self.issues: List[ConfigIssue] = []
+        tree = ConfigNode("ROOT", [], self.conf_file)
+        self._read(self.conf_file, tree, [], include_chain=())
+
+        state = {k: getattr(self, k) for k in ("server_root", "defines", "modules", "sources", "issues")}
+        with self._cache_lock:
+            self._cache[key] = {
+                "tree": tree, "state": state, "sources": self.sources,
+                "signature": self._signature(self.sources),
+            }
+        return tree
+
+    def check(self) -> List[ConfigIssue]:
+        tree = self.parse()
+        issues = list(self.issues)
+        issues += self._check_listen(tree)
+        issues += self._check_server_names(tree)
+        issues += self._check_paths(tree)
+        issues += self._check_modules(tree)
+        return issues
+
+    def report(self, verbose: bool = True) -> bool:
+        """Print the problems found; returns False when Apache would refuse to start."""
+        issues = self.check()
+        errors = [i for i in issues if i.level == ConfigIssue.ERROR]
+        warnings = [i for i in issues if i.level == ConfigIssue.WARNING]
+        for issue in errors + (warnings if verbose else []):
+            color = Fore.RED if issue.level == ConfigIssue.ERROR else Fore.YELLOW
+            print(color + f"  {issue.level:<8}" + Fore.WHITE + f" {issue}")
+        if errors:
+            print(Fore.RED + f"❌ Apache configuration has {len(errors)} error(s), {len(warnings)} warning(s)")
+        elif verbose:
+            print(Fore.GREEN + f"✔ Apache configuration OK ({len(warnings)} warning(s), {len(self.sources)} files)")
+        return not errors
+
+    # -------------------------
+    # Reader
+    # -------------------------
+    def _read(self, path: str, parent: ConfigNode, stack: List[ConfigNode], include_chain: tuple):
+        if path in include_chain:
+            self.issues.append(ConfigIssue(ConfigIssue.ERROR, f"Include loop through {path}", parent))
+            return
+        self.sources.add(path)
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                lines = f.read().splitlines()
+        except OSError as e:
+            self.issues.append(ConfigIssue(ConfigIssue.ERROR, f"Cannot read {path}: {e}", parent))
+            return
+
+        depth = len(stack)
+        current = parent
+        for number, text in self._logical_lines(lines):
+            active = current.active
+            if text.startswith("</"):
+                name = text[2:].rstrip(">").strip()
+                if len(stack) == depth or stack[-1].key != name.lower():
+                    expected = f"</{stack[-1].name}>" if len(stack) > depth else "no open section"
+                    self.issues.append(ConfigIssue(
+                        ConfigIssue.ERROR, f"</{name}> does not close anything ({expected})", file=path, line=number
+                    ))
+                    continue
+                stack.pop()
+                current = stack[-1] if len(stack) > depth else parent
+                continue
+
+            if text.startswith("<"):
+                name, _, rest = text[1:].rstrip(">").strip().partition(" ")
+                args = self._split(self._substitute(rest, path, number) if active else rest)
+                node = ConfigNode(name, args, path, number)
+                node.active = active and self._condition(node)
+                current.children.append(node)
+                stack.append(node)
+                current = node
+                continue
+
+            name, _, rest = text.partition(" ")
+            args = self._split(self._substitute(rest, path, number) if active else rest)
+            node = ConfigNode(name, args, path, number, active)
+            current.children.append(node)
+            if active:
+                self._apply(node, current, stack, include_chain + (path,))
+
+        while len(stack) > depth:
+            unclosed = stack.pop()
+            self.issues.append(ConfigIssue(ConfigIssue.ERROR, f"<{unclosed.name}> is never closed", unclosed))
+
+    def _apply(self, node: ConfigNode, current: ConfigNode, stack: List[ConfigNode], include_chain: tuple):
+        """Directives that change how the rest of the configuration is read."""
+        if node.key == "define" and node.args:
+            self.defines[node.args[0]] = node.args[1] if len(node.args) > 1 else ""
+        elif node.key == "undefine" and node.args:
+            self.defines.pop(node.args[0], None)
+        elif node.key == "serverroot" and node.args:
+            self.server_root = node.args[0]
+        elif node.key == "loadmodule" and node.args:
+            self.modules.add(node.args[0])
+        elif node.key in ("include", "includeoptional") and node.args:
+            pattern = self.resolve(node.args[0])
+            matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+            if glob.has_magic(pattern):
+                self.sources.add(os.path.dirname(pattern))
+            matches = [m for m in matches if os.path.isfile(m)]
+            if not matches and node.key == "include":
+                self.issues.append(ConfigIssue(ConfigIssue.ERROR, f"Include target not found: {pattern}", node))
+            for match in matches:
+                self._read(os.path.abspath(match), current, stack, include_chain)
+
+    def _condition(self, node: ConfigNode) -> bool:
+        if node.key not in self.CONDITIONALS or not node.args:
+            return True  # other sections are always read
+        argument = node.args[0]
+        negate = argument.startswith("!")
+        argument = argument.lstrip("!")
+        if node.key == "ifmodule":
+            result = self.module_id(argument) in self.modules
+        else:
+            result = argument in self.defines
+        return result != negate
+
+    @staticmethod
+    def _logical_lines(lines: List[str]) -> Iterator[tuple]:
+        """(line number, text) with comments dropped and backslash continuations joined."""
+        buffer, start = "", 0
+        for number, line in enumerate(lines, start=1):
+            stripped = line.strip()
+            if not buffer:
+                start = number
+                if not stripped or stripped.startswith("#"):
+                    continue
+            if stripped.endswith("\\"):
+                buffer += stripped[:-1] + " "
+                continue
+            yield start, (buffer + stripped).strip()
+            buffer = ""
+        if buffer.strip():
+            yield start, buffer.strip()
+
+    def _substitute(self, text: str, path: str, line: int) -> str:
+        def value(match):
+            name = match.group(1)
+            if name in self.defines:
+                return self.defines[name]
+            if name in os.environ:
+                return os.environ[name]
+            self.issues.append(ConfigIssue(ConfigIssue.WARNING, f"${{{name}}} is not defined", file=path, line=line))
+            return match.group(0)
+
+        return self.VARIABLE.sub(value, text)
+
+    @staticmethod
+    def module_id(name: str) -> str:
+        """Module identifier for an <IfModule> argument (mod_ssl.c -> ssl_module)."""
+        match = re.fullmatch(r"mod_(\w+)\.c", name)
+        return f"{match.group(1)}_module" if match else name
+
+    @classmethod
+    def _split(cls, text: str) -> List[str]:
+        arguments = []
+        for match in cls.ARGUMENT.finditer(text):
+            double, single, bare = match.groups()
+            if double is not None:
+                arguments.append(double.replace('\\"', '"'))
+            else:
+                arguments.append(single if single is not None else bare)
+        return arguments
+
+    def resolve(self, path: str) -> str:
+        """Absolute form of a config path; relative paths are relative to ServerRoot."""
+        if os.path.isabs(path) or re.match(r"^[A-Za-z]:[/\\]", path):
+            return os.path.normpath(path)
+        return os.path.normpath(os.path.join(self.server_root or "", path))
+
+    # -------------------------
+    # Checks
+    # -------------------------
+    def _check_listen(self, tree: ConfigNode) -> List[ConfigIssue]:
+        issues, seen = [], {}
+        for node in tree.find("Listen"):
+            if not node.args:
+                continue
+            host, _, port = node.args[0].rpartition(":")
+            host = host.strip("[]") or "*"
+            if host == "0.0.0.0":
+                host = "*"
+            for (other_host, other_port), other in seen.items():
+                if other_port == port and (other_host == host or "*" in (host, other_host)):
+                    message = f"Listen {node.args[0]} conflicts with line {other.line} of {other.file}"
+                    issues.append(ConfigIssue(ConfigIssue.ERROR, message, node))
+                    break
+            else:
+                seen[(host, port)] = node
+        return issues
+
+    def _check_server_names(self, tree: ConfigNode) -> List[ConfigIssue]:
+        issues = []
+        global_names = [n for n in tree.find("ServerName") if self._section_of(tree, n) is None]
+        for node in global_names[1:]:
+            issues.append(ConfigIssue(
+                ConfigIssue.WARNING, f"ServerName set again (line {global_names[0].line}), the last one wins", node
+            ))
+
+        names = defaultdict(list)
+        for vhost in tree.find("VirtualHost"):
+            addresses = {self._address(a) for a in vhost.args}
+            for node in vhost.walk():
+                if node.key in ("servername", "serveralias"):
+                    for name in node.args:
+                        names[name.split(":")[0].lower()].append((addresses, vhost, node))
+        for name, entries in names.items():
+            for i, (addresses, vhost, node) in enumerate(entries):
+                for other_addresses, other_vhost, _ in entries[:i]:
+                    if other_vhost is not vhost and addresses & other_addresses:
+                        issues.append(ConfigIssue(
+                            ConfigIssue.ERROR,
+                            f"{name} is already served by the VirtualHost at line {other_vhost.line} of "
+                            f"{other_vhost.file}; this block is unreachable for it",
+                            node,
+                        ))
+                        break
+        return issues
+
+    def _check_paths(self, tree: ConfigNode) -> List[ConfigIssue]:
+        issues = []
+        for node in tree.walk():
+            if not node.args:
+                continue
+            if node.key == "documentroot" and not os.path.isdir(self.resolve(node.args[0])):
+                issues.append(ConfigIssue(ConfigIssue.WARNING, f"DocumentRoot does not exist: {node.args[0]}", node))
+            elif node.key in self.CERTIFICATE_DIRECTIVES and not os.path.isfile(self.resolve(node.args[0])):
+                issues.append(ConfigIssue(ConfigIssue.ERROR, f"{node.name} file not found: {node.args[0]}", node))
+            elif node.key == "loadmodule" and len(node.args) > 1 and not os.path.isfile(self.resolve(node.args[1])):
+                issues.append(ConfigIssue(ConfigIssue.ERROR, f"Module file not found: {node.args[1]}", node))
+        return issues
+
+    def _check_modules(self, tree: ConfigNode) -> List[ConfigIssue]:
+        """Directives whose module is not loaded; httpd rejects them as invalid commands."""
+        issues = []
+        for node in tree.walk():
+            module = ApacheModules.provider(node.name)
+            if module and module not in self.modules:
+                issues.append(ConfigIssue(ConfigIssue.ERROR, f"{node.name} needs {module}, which is not loaded", node))
+        return issues
+
+    @staticmethod
+    def _address(address: str) -> str:
+        host, _, port = address.rpartition(":")
+        host = "*" if host in ("", "*", "_default_", "0.0.0.0") else host.lower()
+        return f"{host}:{port or '*'}"
+
+    @staticmethod
+    def _section_of(tree: ConfigNode, target: ConfigNode) -> Optional[ConfigNode]:
+        """Innermost VirtualHost containing target, if any."""
+        for vhost in tree.find("VirtualHost"):
+            if any(node is target for node in vhost.walk()):
+                return vhost
+        return None
+
+    # -------------------------
+    # Utilities
+    # -------------------------
+    @staticmethod
+    def _signature(sources) -> tuple:
+        signature = []
+        for path in sorted(sources):
+            try:
+                stat = os.stat(path)
+                signature.append((path, stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append((path, None, None))
+        return tuple(signature)
@@ -0,0 +1,180 @@
+from typing import Optional, Set
+
+
+class ApacheModules:
+    """
+    Which httpd module provides a directive, and which modules a directive's arguments pull in
+    (handlers, filters, Options, Require providers, proxy schemes).
+
+    Only modules listed in DIRECTIVES are "known": a LoadModule for anything else is never
+    judged unused, because its directives cannot be recognised.
+    """
+
+    DIRECTIVES = {
+        "access_compat_module": ("order", "allow", "deny", "satisfy"),
+        "actions_module": ("action", "script"),
+        "alias_module": (
+            "alias", "aliasmatch", "redirect", "redirectmatch", "redirectpermanent", "redirecttemp",
+            "scriptalias", "scriptaliasmatch",
+        ),
+        "allowmethods_module": ("allowmethods",),
+        "asis_module": (),
+        "auth_basic_module": (
+            "authbasicprovider", "authbasicauthoritative", "authbasicfake", "authbasicusedigestalgorithm",
+        ),
+        "auth_digest_module": (
+            "authdigestprovider", "authdigestalgorithm", "authdigestdomain", "authdigestnoncelifetime",
+            "authdigestqop", "authdigestshmemsize",
+        ),
+        "authn_core_module": ("authname", "authtype", "authnprovideralias"),
+        "authn_file_module": ("authuserfile",),
+        "authz_core_module": (
+            "require", "requireall", "requireany", "requirenone", "authmerging", "authzprovideralias",
+            "authzsendforbiddenonfailure",
+        ),
+        "authz_groupfile_module": ("authgroupfile",),
+        "authz_host_module": (),
+        "authz_owner_module": (),
+        "authz_user_module": (),
+        "autoindex_module": (
+            "addalt", "addaltbyencoding", "addaltbytype", "adddescription", "addicon", "addiconbyencoding",
+            "addiconbytype", "defaulticon", "headername", "indexheadinsert", "indexignore", "indexignorereset",
+            "indexoptions", "indexorderdefault", "indexstylesheet", "readmename",
+        ),
+        "cgi_module": ("scriptlog", "scriptlogbuffer", "scriptloglength"),
+        "deflate_module": (
+            "deflatebuffersize", "deflatecompressionlevel", "deflatefilternote", "deflateinflatelimitrequestbody",
+            "deflatememlevel", "deflatewindowsize",
+        ),
+        "dir_module": (
+            "directorycheckhandler", "directoryindex", "directoryindexredirect", "directoryslash", "fallbackresource",
+        ),
+        "env_module": ("passenv", "setenv", "unsetenv"),
+        "expires_module": ("expiresactive", "expiresbytype", "expiresdefault"),
+        "filter_module": (
+            "addoutputfilterbytype", "filterchain", "filterdeclare", "filterprotocol", "filterprovider", "filtertrace",
+        ),
+        "headers_module": ("header", "requestheader"),
+        "include_module": (
+            "ssiendtag", "ssierrormsg", "ssietag", "ssilastmodified", "ssilegacyexprparser", "ssistarttag",
+            "ssitimeformat", "ssiundefinedecho", "xbithack",
+        ),
+        "info_module": ("addmoduleinfo",),
+        "isapi_module": (
+            "isapiappendlogtoerrors", "isapiappendlogtoquery", "isapicachefile", "isapifakeasync",
+            "isapilognotsupported", "isapireadaheadbuffer",
+        ),
+        "log_config_module": ("bufferedlogs", "customlog", "logformat", "transferlog", "globallog"),
+        "logio_module": ("logiotrackttfb",),
+        "mime_module": (
+            "addcharset", "addencoding", "addhandler", "addinputfilter", "addlanguage", "addoutputfilter", "addtype",
+            "defaultlanguage", "modmimeusepathinfo", "multiviewsmatch", "removecharset", "removeencoding",
+            "removehandler", "removeinputfilter", "removelanguage", "removeoutputfilter", "removetype", "typesconfig",
+        ),
+        "negotiation_module": ("cachenegotiateddocs", "forcelanguagepriority", "languagepriority"),
+        "proxy_module": ("balancermember", "proxy", "proxymatch"),
+        "proxy_balancer_module": (),
+        "proxy_fcgi_module": (),
+        "proxy_http_module": (),
+        "proxy_wstunnel_module": (),
+        "proxy_html_module": (),
+        "reqtimeout_module": ("requestreadtimeout",),
+        "rewrite_module": (
+            "rewritebase", "rewritecond", "rewriteengine", "rewritemap", "rewriteoptions", "rewriterule",
+        ),
+        "setenvif_module": ("browsermatch", "browsermatchnocase", "setenvif", "setenvifexpr", "setenvifnocase"),
+        "socache_shmcb_module": (),
+        "ssl_module": (),
+        "status_module": ("extendedstatus", "seerequesttail"),
+        "php_module": ("php_value", "php_flag", "php_admin_value", "php_admin_flag", "phpinidir"),
+    }
+    # Directive families recognised by prefix (longest first)
+    PREFIXES = (
+        ("proxyhtml", "proxy_html_module"), ("proxy", "proxy_module"), ("ssl", "ssl_module"), ("h2", "http2_module"),
+    )
+    HANDLERS = {
+        "cgi-script": "cgi_module", "server-status": "status_module", "server-info": "info_module",
+        "type-map": "negotiation_module", "send-as-is": "asis_module", "isapi-handler": "isapi_module",
+        "imap-file": "imagemap_module", "application/x-httpd-php": "php_module",
+    }
+    FILTERS = {"includes": "include_module", "deflate": "deflate_module", "brotli_compress": "brotli_module"}
+    OPTIONS = {
+        "includes": "include_module",
+        "includesnoexec": "include_module",
+        "multiviews": "negotiation_module",
+        "indexes": "autoindex_module",
+    }
+    REQUIRE = {
+        "ip": "authz_host_module", "host": "authz_host_module", "local": "authz_host_module",
+        "forward-dns": "authz_host_module", "user": "authz_user_module", "valid-user": "authz_user_module",
+        "group": "authz_groupfile_module", "file-owner": "authz_owner_module", "file-group": "authz_owner_module",
+    }
+    AUTH_TYPES = {"basic": "auth_basic_module", "digest": "auth_digest_module"}
+    PROXY_SCHEMES = {
+        "http": "proxy_http_module", "https": "proxy_http_module", "fcgi": "proxy_fcgi_module",
+        "ws": "proxy_wstunnel_module", "wss": "proxy_wstunnel_module", "balancer": "proxy_balancer_module",
+    }
+    SESSION_CACHES = {"shmcb": "socache_shmcb_module", "dbm": "socache_dbm_module"}
+
+    _providers = {directive: module for module, directives in DIRECTIVES.items() for directive in directives}
+
+    @classmethod
+    def known(cls, module: str) -> bool:
+        return module in cls.DIRECTIVES or module in dict(cls.PREFIXES).values()
+
+    @classmethod
+    def provider(cls, directive: str) -> Optional[str]:
+        """Module implementing a directive or section name; None for core and unrecognised ones."""
+        directive = directive.lower()
+        if directive in cls._providers:
+            return cls._providers[directive]
+        for prefix, module in cls.PREFIXES:
+            if directive.startswith(prefix):
+                return module
+        return None
+
+    @classmethod
+    def requires(cls, directive: str, args) -> Set[str]:
+        """Every module a directive needs: its provider plus what its arguments refer to."""
+        directive = directive.lower()
+        values = [a.lower() for a in args]
+        modules = set()
+        provider = cls.provider(directive)
+        if provider:
+            modules.add(provider)
+
+        if directive in ("sethandler", "addhandler") and values:
+            handler = values[0]
+            if handler in cls.HANDLERS:
+                modules.add(cls.HANDLERS[handler])
+            elif handler.startswith("proxy:"):
+                modules.add("proxy_module")
+                modules.update(cls._scheme(handler[len("proxy:"):]))
+        elif directive in ("setoutputfilter", "setinputfilter", "addoutputfilter", "addoutputfilterbytype"):
+            for name in (values[0].split(";") if values else []):
+                if name in cls.FILTERS:
+                    modules.add(cls.FILTERS[name])
+        elif directive == "options":
+            modules.update(cls.OPTIONS[v.lstrip("+")] for v in values if v.lstrip("+") in cls.OPTIONS)
+        elif directive == "require" and values:
+            entity = values[1] if values[0] == "not" and len(values) > 1 else values[0]
+            if entity in cls.REQUIRE:
+                modules.add(cls.REQUIRE[entity])
+        elif directive == "authtype" and values and values[0] in cls.AUTH_TYPES:
+            modules.add(cls.AUTH_TYPES[values[0]])
+        elif directive in ("scriptalias", "scriptaliasmatch"):
+            modules.add("cgi_module")
+        elif directive in ("proxypass", "proxypassmatch", "balancermember", "proxy") and values:
+            for value in values:
+                if "://" in value:
+                    modules.update(cls._scheme(value))
+        elif directive == "sslsessioncache" and values:
+            cache = cls.SESSION_CACHES.get(values[0].split(":")[0])
+            if cache:
+                modules.add(cache)
+        return modules
+
+    @classmethod
+    def _scheme(cls, url: str) -> Set[str]:
+        scheme = url.split("://")[0].split(":")[0]
+        return {cls.PROXY_SCHEMES[scheme]} if scheme in cls.PROXY_SCHEMES else set()
@@ -0,0 +1,91 @@
+import re
+
+import psutil
+
+
+class ApacheTuning:
+    """
+    Picks mpm_winnt, keep-alive and I/O settings for this machine.
+
+    A preset sets the intent (how many threads per core, how much RAM the pool may take,
+    how long idle connections are kept); core count and installed memory, read through
+    psutil, turn it into concrete values. The result is rendered into
+    conf/extra/httpd-tuning.conf, which the httpd.conf template includes.
+    """
+
+    PRESETS = {
+        # Few threads, short keep-alive: stays out of the way of the IDE and browser
+        "laptop": {
+            "threads_per_core": 16, "min_threads": 64, "max_threads": 150, "memory_share": 0.10,
+            "keep_alive_timeout": 5, "max_keep_alive_requests": 100, "timeout": 60,
+        },
+        "workstation": {
+            "threads_per_core": 32, "min_threads": 150, "max_threads": 512, "memory_share": 0.20,
+            "keep_alive_timeout": 5, "max_keep_alive_requests": 500, "timeout": 60,
+        },
+        # Large pool and quick recycling of idle connections for benchmark clients
+        "loadtest": {
+            "threads_per_core": 64, "min_threads": 256, "max_threads": 1920, "memory_share": 0.50,
+            "keep_alive_timeout": 2, "max_keep_alive_requests": 10000, "timeout": 30,
+        },
+    }
+    # Working set of one busy mod_php thread (stack, request pool, PHP request memory)
+    THREAD_MEMORY_MB = 8
+    MIN_THREADS = 25
+    PRESET_PATTERN = re.compile(r'"(\w+)" tuning preset')
+
+    def __init__(self, preset: str = None):
+        if preset is not None and preset not in self.PRESETS:
+            raise ValueError(f"Unknown tuning preset '{preset}', expected one of: {', '.join(self.PRESETS)}")
+        self.preset = preset or self.default_preset()
+        self.cpu_count = psutil.cpu_count(logical=True) or 1
+        self.memory_mb = psutil.virtual_memory().total // (1024 * 1024)
+
+    # -------------------------
+    # Public operations
+    # -------------------------
+    @staticmethod
+    def default_preset() -> str:
+        """laptop when the machine has a battery, workstation otherwise."""
+        try:
+            return "laptop" if psutil.sensors_battery() is not None else "workstation"
+        except (AttributeError, NotImplementedError, RuntimeError):
+            return "workstation"
+
+    @classmethod
+    def installed_preset(cls, path: str):
+        """Preset recorded in a rendered tuning include, or None."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                match = cls.PRESET_PATTERN.search(f.readline())
+        except OSError:
+            return None
+        return match.group(1) if match and match.group(1) in cls.PRESETS else None
+
+    def threads(self) -> int:
+        settings = self.PRESETS[self.preset]
+        by_cpu = self.cpu_count * settings["threads_per_core"]
+        by_memory = int(self.memory_mb * settings["memory_share"]) // self.THREAD_MEMORY_MB
+        # Cores set the target, the preset bounds it, and RAM has the last word on small machines
+        target = min(max(by_cpu, settings["min_threads"]), settings["max_threads"])
+        return max(min(target, by_memory), self.MIN_THREADS)
+
+    def tokens(self) -> dict:
+        settings = self.PRESETS[self.preset]
+        threads = self.threads()
+        return {
+            "TUNING_PRESET": self.preset,
+            "CPU_COUNT": self.cpu_count,
+            "MEMORY_GB": round(self.memory_mb / 1024, 1),
+            "THREAD_LIMIT": threads,
+            "THREADS_PER_CHILD": threads,
+            # mpm_winnt runs a single child; recycling it stalls every site, so it is never recycled
+            "MAX_CONNECTIONS_PER_CHILD": 0,
+            "TIMEOUT": settings["timeout"],
+            "KEEP_ALIVE": "On",
+            "KEEP_ALIVE_TIMEOUT": settings["keep_alive_timeout"],
+            "MAX_KEEP_ALIVE_REQUESTS": settings["max_keep_alive_requests"],
+            "ENABLE_SENDFILE": "On",
+            "ENABLE_MMAP": "On",
+            "HOSTNAME_LOOKUPS": "Off",
+        }
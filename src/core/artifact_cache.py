@@ -0,0 +1,89 @@
+import json
+import os
+import re
+import shutil
+import threading
+from pathlib import Path
+from typing import Optional
+
+from src.core.path_manager import PathManager
+
+
+class ArtifactCache:
+    """
+    Content-addressed store of verified downloads, laid out as <root>/sha256/<ab>/<digest>.
+
+    An entry is only ever written after its digest has been checked, so a hit is trusted
+    as-is: no network I/O and no re-hashing.
+    """
+
+    ALGORITHM = "sha256"
+    INDEX_FILE = "index.json"
+    _index_lock = threading.Lock()
+
+    def __init__(self, root=None):
+        self.root = Path(root or PathManager().project_structure("cache"))
+        (self.root / self.ALGORITHM).mkdir(parents=True, exist_ok=True)
+        self._index_path = self.root / self.INDEX_FILE
+
+    # -------------------------
+    # Public operations
+    # -------------------------
+    @staticmethod
+    def normalize(checksum) -> Optional[str]:
+        """Return a lower-case SHA-256 hex digest, or None for missing/placeholder checksums."""
+        if isinstance(checksum, str) and re.fullmatch(r"[0-9a-fA-F]{64}", checksum.strip()):
+            return checksum.strip().lower()
+        return None
+
+    def path_for(self, digest: str) -> Path:
+        return self.root / self.ALGORITHM / digest[:2] / digest
+
+    def get(self, checksum=None, file=None) -> Optional[str]:
+        """
+        Resolve an artifact by its catalog checksum.
+        Artifacts without a usable checksum fall back to the digest recorded for their file name.
+        """
+        digest = self.normalize(checksum) or (file and self._read_index().get(file))
+        if not digest:
+            return None
+        path = self.path_for(digest)
+        return str(path) if path.is_file() else None
+
+    def entries(self) -> dict:
+        """{file name: digest} for every named artifact currently present in the store."""
+        return {file: digest for file, digest in self._read_index().items() if self.path_for(digest).is_file()}
+
+    def put(self, src_file, digest: str, file=None) -> str:
+        """Move a verified file into the store and return its cached path."""
+        target = self.path_for(digest)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if target.is_file():
+            os.remove(src_file)
+        else:
+            tmp = target.with_name(target.name + ".tmp")
+            shutil.move(src_file, tmp)
+            os.replace(tmp, target)
+        if file:
+            with self._index_lock:
+                index = self._read_index()
+                if index.get(file) != digest:
+                    index[file] = digest
+                    self._write_index(index)
+        return str(target)
+
+    # -------------------------
+    # Utilities
+    # -------------------------
+    def _read_index(self) -> dict:
+        try:
+            with open(self._index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_index(self, index: dict):
+        tmp = self._index_path.with_name(self._index_path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(index, f, indent=2, sort_keys=True)
+        os.replace(tmp, self._index_path)
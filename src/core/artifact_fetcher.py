@@ -0,0 +1,206 @@
+import os
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+import requests
+from tqdm import tqdm
+
+from src.core.artifact_cache import ArtifactCache
+from src.core.console_logger import ConsoleLogger
+from src.core.file_downloader import FileDownloader
+from src.core.mirror_selector import MirrorSelector
+from src.core.path_manager import PathManager
+from src.core.remote_zip import RemoteZip
+from src.core.stream_extractor import StreamingExtractor
+
+
+class ArtifactFetcher:
+    """
+    Acquisition phase for dev:setup.
+
+    Resolves every Binaries entry from the artifact cache and every Prerequisite installer
+    from its folder, then downloads whatever is missing concurrently over one pooled session.
+    Wall time approaches the slowest single artifact instead of the sum of all of them.
+    """
+
+    # One worker per artifact, up to this many
+    MAX_WORKERS = 8
+
+    def __init__(self, cache: ArtifactCache = None, workers: int = MAX_WORKERS,
+                 connections: int = FileDownloader.CONNECTIONS, external_tools: bool = False):
+        self.cache = cache or ArtifactCache()
+        self.workers = max(1, int(workers))
+        self.connections = connections
+        self.external_tools = external_tools
+        self.binary_root = Path(PathManager().project_structure("binary"))
+        self.selector = None
+        self.session = None
+        self.extract_plans = {}
+        self._lock = threading.Lock()
+        self._progress = {}
+
+    # -------------------------
+    # Public operations
+    # -------------------------
+    def acquire(self, binaries: dict, prerequisites: dict = None, prerequisite_root: str = None,
+                fetch_binaries: bool = True, extract_plans: dict = None) -> dict:
+        """
+        Return {key: local path} for every binary (and every prerequisite that could be fetched).
+        Binary failures raise after all transfers finish; prerequisite failures only warn.
+        With fetch_binaries=False, binaries missing locally are left out for the caller to handle.
+        extract_plans maps binary keys to StreamingExtractor arguments (target_dir, include,
+        exclude, store); those archives are extracted while they download.
+        """
+        self.extract_plans = extract_plans or {}
+        resolved, jobs, failures = {}, [], []
+
+        for key, item in binaries.items():
+            try:
+                cached = self._resolve_local(item)
+            except Exception as e:
+                # Reported with the download failures; the dropped file stays where the user put it
+                failures.append((key, True, e))
+                continue
+            if cached:
+                resolved[key] = cached
+            elif fetch_binaries:
+                jobs.append((key, item, self.binary_root, True))
+
+        for key, item in (prerequisites or {}).items():
+            target = os.path.join(prerequisite_root, item.get("file"))
+            if os.path.exists(target):
+                resolved[key] = target
+            elif item.get("sources"):
+                jobs.append((key, item, prerequisite_root, False))
+            # Without a source a missing prerequisite is skipped quietly
+
+        if jobs:
+            failures.extend(self._fetch_all(jobs, resolved))
+        elif not failures:
+            ConsoleLogger.info("All artifacts resolved locally, nothing to download")
+
+        for key, required, error in failures:
+            if required:
+                ConsoleLogger.error(f"Failed to fetch {key}: {error}")
+            else:
+                ConsoleLogger.warning(f"Failed to fetch prerequisite {key}: {error}")
+        if any(required for _, required, _ in failures):
+            raise RuntimeError("Required binaries could not be fetched or verified")
+        return resolved
+
+    # -------------------------
+    # Fetch helpers
+    # -------------------------
+    def _fetch_all(self, jobs: list, resolved: dict) -> list:
+        """Download every job concurrently into resolved; returns [(key, required, error)] of the failed ones."""
+        ConsoleLogger.info(f"Downloading {len(jobs)} artifact(s) concurrently...")
+        failures = []
+        with (
+            self._session(len(jobs)) as session,
+            tqdm(total=0, unit="B", unit_scale=True, desc=f"Total ({len(jobs)} files)", position=0) as total_bar,
+            ThreadPoolExecutor(max_workers=min(self.workers, len(jobs))) as pool,
+        ):
+            self.session = session
+            self.selector = MirrorSelector(session=session)
+
+            def listener(name, done, total):
+                self._on_progress(total_bar, name, done, total)
+
+            futures = {}
+            for position, (key, item, folder, required) in enumerate(jobs, start=1):
+                downloader = FileDownloader(
+                    folder, self.connections, session=session, position=position, listener=listener,
+                    external_tools=self.external_tools,
+                )
+                if required:
+                    future = pool.submit(self._fetch_binary, item, downloader, self.extract_plans.get(key))
+                else:
+                    future = pool.submit(self._fetch_prerequisite, item, downloader)
+                futures[future] = (key, item, required)
+
+            for future in as_completed(futures):
+                key, item, required = futures[future]
+                try:
+                    resolved[key] = future.result()
+                except Exception as e:
+                    failures.append((key, required, e))
+        return failures
+
+    def _resolve_local(self, item: dict):
+        """Cache hit by checksum, else import a file dropped into src/binary (hashed once)."""
+        checksum = ArtifactCache.normalize(item.get("checksum"))
+        cached = self.cache.get(checksum, item.get("file"))
+        if cached:
+            return cached
+
+        source_file = self.binary_root / item.get("file")
+        if not source_file.exists():
+            return None
+        # Hashed in place: the file only moves into the cache once it is verified
+        digest = FileDownloader.hash_file(source_file)
+        if checksum and digest != checksum:
+            raise RuntimeError(
+                f"Checksum mismatch for {source_file}: expected {checksum}, got {digest} (file left in place)"
+            )
+        return self.cache.put(str(source_file), digest, item.get("file"))
+
+    def _fetch_binary(self, item: dict, downloader: FileDownloader, plan: dict = None) -> str:
+        checksum = ArtifactCache.normalize(item.get("checksum"))
+        if not checksum:
+            ConsoleLogger.warning(f"No valid SHA-256 checksum for {item.get('file')}, download cannot be verified")
+        source_file = self._download(item, downloader, checksum, plan)
+        return self.cache.put(source_file, downloader.sha256(source_file), item.get("file"))
+
+    def _fetch_prerequisite(self, item: dict, downloader: FileDownloader) -> str:
+        return self._download(item, downloader)
+
+    def _download(self, item: dict, downloader: FileDownloader, checksum: str = None, plan: dict = None) -> str:
+        """Try the sources fastest first, failing over to the next one."""
+        errors = []
+        for source in self.selector.rank(item):
+            try:
+                sink = self._sink(source, plan) if plan else None
+                return downloader.download(source, item.get("file"), checksum, sink)
+            except Exception as e:
+                errors.append(f"{source}: {e}")
+        raise RuntimeError("; ".join(errors) or f"No sources for {item.get('file')}")
+
+    def _sink(self, source: str, plan: dict):
+        """
+        Read the archive's central directory up front so its members can be extracted while
+        the body streams in. Returns None (plain download, extract later) when that fails.
+        """
+        try:
+            if MirrorSelector.is_local(source):
+                with zipfile.ZipFile(MirrorSelector.local_path(source)) as zip_ref:
+                    members = zip_ref.infolist()
+            else:
+                with RemoteZip(source, session=self.session) as remote:
+                    members = remote.infolist()
+        except Exception as e:
+            ConsoleLogger.warning(f"Cannot read the zip directory of {source} ({e}), extracting after download")
+            return None
+        return StreamingExtractor(members, **plan)
+
+    # -------------------------
+    # Utilities
+    # -------------------------
+    def _session(self, jobs: int) -> requests.Session:
+        """One keep-alive pool shared by every transfer, sized for all their segments."""
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=jobs, pool_maxsize=jobs * self.connections)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _on_progress(self, total_bar: tqdm, name: str, done: int, total: int):
+        """Fold per-file cumulative progress into the aggregate bar."""
+        with self._lock:
+            old_done, old_total = self._progress.get(name, (0, 0))
+            self._progress[name] = (done, total or 0)
+            if total and total != old_total:
+                total_bar.total += total - old_total
+                total_bar.refresh()
+            total_bar.update(done - old_done)
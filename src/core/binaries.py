@@ -2,6 +2,8 @@ from os.path import dirname
 
 
 class Binaries:
+    PROFILES = ("runtime", "full", "debug")
+
     def __init__(self):
         # self.path_manager = PathManager()
         # self.root = os.path.join(self.path_manager.project(Constants.KEY_ROOT), "src", "binary")
@@ -12,8 +14,19 @@ class Binaries:
                 "name": "Apache HTTPD",
                 "version": "2.4.65",
                 "file": "httpd-2.4.65-250724-Win64-VS17.zip",
-                "checksum": "E324797985825424AF00CDB9D78B029723F18862DF6C02C2219B341E33E31F04",  # Placeholder checksum
-                "url": "https://www.apachelounge.com/download/VS17/binaries/httpd-2.4.65-250724-Win64-VS17.zip",
+                # SHA-256 of the archive; when None, setup takes the digest upstream publishes for this
+                # file from the release catalog, and only downloads with neither go unverified
+                "checksum": None,
+                # Candidate locations, ranked by MirrorSelector; more can be added via WINAPDEV_MIRRORS
+                "sources": [
+                    "https://www.apachelounge.com/download/VS17/binaries/httpd-2.4.65-250724-Win64-VS17.zip",
+                ],
+                # Install profiles: include/exclude globs on archive member names (--profile)
+                "profiles": {
+                    "runtime": {"exclude": ["Apache24/manual/*", "Apache24/include/*", "Apache24/lib/*", "*.pdb"]},
+                    "debug": {"exclude": ["Apache24/manual/*", "Apache24/include/*", "Apache24/lib/*"]},
+                    "full": {},
+                },
                 "source": dirname(__file__)
                 # "target": os.path.join(self.path_manager.get_structure(Constants.DIR_BIN), Constants.DIR_APACHE)
             },
@@ -21,9 +34,16 @@ class Binaries:
                 "name": "PHP",
                 "version": "8.1.0",
                 "file": "php-8.4.12-Win32-vs17-x64.zip",
-                "checksum": "602dbfd1a65e99e8bb29c7ff2c8a7888f3cd72a8162de99b7860bbe117779d1c456",
-                # Placeholder checksum
-                "url": "https://windows.php.net/downloads/releases/php-8.4.12-Win32-vs17-x64.zip",
+                "checksum": None,
+                "sources": [
+                    "https://windows.php.net/downloads/releases/php-8.4.12-Win32-vs17-x64.zip",
+                    "https://windows.php.net/downloads/releases/archives/php-8.4.12-Win32-vs17-x64.zip",
+                ],
+                "profiles": {
+                    "runtime": {"exclude": ["dev/*", "*.pdb", "*.lib"]},
+                    "debug": {"exclude": ["*.lib"]},
+                    "full": {},
+                },
                 "source": dirname(__file__),
                 # "target": os.path.join(self.path_manager.get_structure(Constants.DIR_BIN), Constants.DIR_PHP)
             },
@@ -31,3 +51,10 @@ class Binaries:
 
     def get(self):
         return self.__items
+
+    def filters(self, key: str, profile: str) -> tuple:
+        """(include, exclude) member globs of a binary for the given install profile."""
+        if profile not in self.PROFILES:
+            raise ValueError(f"Unknown profile '{profile}', expected one of: {', '.join(self.PROFILES)}")
+        rules = self.__items[key].get("profiles", {}).get(profile, {})
+        return rules.get("include"), rules.get("exclude")
@@ -0,0 +1,165 @@
+import base64
+import email.utils
+import json
+import os
+import re
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+
+from colorama import Fore
+
+from src.core.artifact_cache import ArtifactCache
+from src.core.cli_arguments import Arguments
+
+
+class _CacheRequestHandler(BaseHTTPRequestHandler):
+    """
+    Serves the artifact cache read-only:
+      GET /                  JSON listing of cached artifacts
+      GET /<file>            artifact by its catalog file name (usable as a WINAPDEV_MIRRORS base)
+      GET /sha256/<digest>   artifact by content hash
+    Single byte ranges and If-Range are honoured; the strong ETag is the SHA-256 itself.
+    """
+
+    protocol_version = "HTTP/1.1"
+    server_version = "WinAPDevCache/1.0"
+    cache: ArtifactCache = None
+
+    def log_message(self, fmt, *args):
+        print(Fore.CYAN + f"[cache] {self.address_string()} " + Fore.WHITE + fmt % args)
+
+    def do_HEAD(self):
+        self._serve(send_body=False)
+
+    def do_GET(self):
+        self._serve(send_body=True)
+
+    # -------------------------
+    # Routing
+    # -------------------------
+    def _serve(self, send_body: bool):
+        path = unquote(self.path.split("?", 1)[0]).lstrip("/")
+        if not path:
+            return self._send_listing(send_body)
+
+        match = re.fullmatch(r"sha256/([0-9a-fA-F]{64})", path)
+        digest = match.group(1).lower() if match else self.cache.entries().get(path)
+        blob = self.cache.path_for(digest) if digest else None
+        if not blob or not blob.is_file():
+            return self._send_empty(404)
+        self._send_blob(blob, digest, send_body)
+
+    def _send_listing(self, send_body: bool):
+        listing = [
+            {
+                "file": file,
+                "sha256": digest,
+                "size": self.cache.path_for(digest).stat().st_size,
+                "href": f"/{file}",
+            }
+            for file, digest in sorted(self.cache.entries().items())
+        ]
+        body = json.dumps(listing, indent=2).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    # -------------------------
+    # Responses
+    # -------------------------
+    def _send_empty(self, status: int, headers: dict = None):
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _byte_range(self, size: int, etag: str):
+        """Return (start, end) of a satisfiable single range, None for the full body, or 'invalid'."""
+        header = self.headers.get("Range")
+        if not header:
+            return None
+        if_range = self.headers.get("If-Range")
+        if if_range and if_range != etag:
+            return None
+        match = re.fullmatch(r"\s*bytes=(\d*)-(\d*)\s*", header)
+        if not match or not any(match.groups()):
+            return None  # multi-range or malformed: serve the whole file
+        first, last = match.groups()
+        if first == "":
+            start, end = max(0, size - int(last)), size - 1
+        else:
+            start, end = int(first), min(int(last), size - 1) if last else size - 1
+        if start >= size or start > end:
+            return "invalid"
+        return start, end
+
+    def _send_blob(self, blob, digest: str, send_body: bool):
+        stat = blob.stat()
+        size = stat.st_size
+        etag = f'"{digest}"'
+        headers = {
+            "ETag": etag,
+            "Accept-Ranges": "bytes",
+            "Last-Modified": email.utils.formatdate(stat.st_mtime, usegmt=True),
+            "X-Checksum-Sha256": digest,
+            "Digest": "sha-256=" + base64.b64encode(bytes.fromhex(digest)).decode("ascii"),
+            "Cache-Control": "public, max-age=31536000, immutable",
+        }
+        if self.headers.get("If-None-Match") == etag:
+            return self._send_empty(304, headers)
+
+        byte_range = self._byte_range(size, etag)
+        if byte_range == "invalid":
+            return self._send_empty(416, {"Content-Range": f"bytes */{size}"})
+
+        start, end = byte_range or (0, size - 1)
+        self.send_response(206 if byte_range else 200)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        if byte_range:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(end - start + 1))
+        self.end_headers()
+        if not send_body or size == 0:
+            return
+        self.wfile.flush()
+        with open(blob, "rb") as f:
+            # Zero-copy where the platform supports it
+            self.connection.sendfile(f, start, end - start + 1)
+
+
+class CacheServer:
+    """Expose the local artifact cache over HTTP so teammates can list this machine as a mirror."""
+
+    HOST = "0.0.0.0"
+    PORT = 8780
+
+    def __init__(self, cache: ArtifactCache = None):
+        self.cache = cache or ArtifactCache()
+
+    def serve(self, host: str = HOST, port: int = PORT):
+        handler = type("CacheRequestHandler", (_CacheRequestHandler,), {"cache": self.cache})
+        server = ThreadingHTTPServer((host, int(port)), handler)
+        server.daemon_threads = True
+        print(Fore.GREEN + f"Serving {self.cache.root} on http://{host}:{port}/ "
+                           f"({len(self.cache.entries())} artifacts)")
+        print(Fore.YELLOW + f"Teammates can add it with: set WINAPDEV_MIRRORS=http://{self._hostname(host)}:{port}/")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print(Fore.YELLOW + "\nStopping cache server")
+        finally:
+            server.server_close()
+
+    def serve_project(self, args: Arguments):
+        """CLI-friendly wrapper: --host / --port."""
+        self.serve(args.get("host", self.HOST), args.get("port", self.PORT))
+
+    @staticmethod
+    def _hostname(host: str) -> str:
+        return os.environ.get("COMPUTERNAME", "localhost") if host in ("0.0.0.0", "") else host
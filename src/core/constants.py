@@ -12,6 +12,9 @@ class Constants:
     # Key constants
     KEY_ROOT = "root"
 
+    # Environment variable listing extra artifact mirrors (URLs or directories, ';' separated)
+    ENV_MIRRORS = "WINAPDEV_MIRRORS"
+
     # Service Name constant
     SERVICE_NAME_APACHE = "PatelWorldApache"
 
@@ -1,33 +1,97 @@
+import heapq
 import os
 import shutil
 import subprocess
+import tempfile
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
 
 from colorama import Fore
 
+from src.core.install_manifest import InstallManifest
+from src.core.object_store import ObjectStore
+from src.core.remote_zip import RemoteZip
+
+
+def _extract_shard(src_file: str, target_dir: str, names: List[str], store_root: str = None) -> int:
+    """Worker entry point: extract a subset of members through a private archive handle."""
+    store = ObjectStore(store_root) if store_root else None
+    with zipfile.ZipFile(src_file, "r") as zip_ref:
+        for name in names:
+            if store:
+                store.extract(zip_ref, zip_ref.getinfo(name), target_dir)
+            else:
+                zip_ref.extract(name, target_dir)
+    return len(names)
+
 
 class Extractor:
-    def __init__(self, seven_zip_path="7z"):
+    # Below this many members the process pool start-up costs more than it saves
+    PARALLEL_MIN_MEMBERS = 200
+
+    def __init__(self, seven_zip_path="7z", workers: int = None, store: str = None):
         """
         :param seven_zip_path: Path to 7z binary (default assumes '7z' is in PATH)
+        :param workers: Parallel extraction workers (default: CPU count, 1 disables the pool)
+        :param store: Object store directory; zip members are hardlinked from it instead of written per version
         """
         # self.binaries = binaries
         self.seven_zip_path = seven_zip_path
         self.seven_zip_available = shutil.which(seven_zip_path) is not None
+        self.workers = max(1, int(workers or os.cpu_count() or 1))
+        self.store = ObjectStore(store) if store else None
 
-    def extract(self, src_file: str, target_dir: str):
-        """Extracts a given archive file into a target directory using 7-Zip or fallback extractor."""
+    def extract(self, src_file: str, target_dir: str, include=None, exclude=None):
+        """
+        Extracts a given archive file into a target directory using 7-Zip or fallback extractor.
+        Zip archives are extracted incrementally against the install manifest in target_dir,
+        limited to the members matching the include/exclude globs of the install profile.
+        """
         os.makedirs(target_dir, exist_ok=True)
         print(Fore.GREEN + f"Extracting {os.path.basename(src_file)} -> {target_dir}")
 
-        if self.seven_zip_available:
-            return self._extract_with_7z(src_file, target_dir)
-        else:
+        if not zipfile.is_zipfile(src_file):
+            if self.seven_zip_available:
+                return self._extract_with_7z(src_file, target_dir)
             return self._extract_with_windows(src_file, target_dir)
 
-    def _extract_with_7z(self, src_file: str, target_dir: str):
-        """Try extracting using 7-Zip."""
-        cmd = f'"{self.seven_zip_path}" x "{src_file}" -y -o"{target_dir}"'
+        with zipfile.ZipFile(src_file, "r") as zip_ref:
+            everything = zip_ref.infolist()
+        members = [info for info in everything if RemoteZip.matches(info.filename, include, exclude)]
+        selective = len(members) < len(everything)
+        manifest = InstallManifest(target_dir)
+        removed = manifest.prune(members)
+        todo = manifest.changed(members)
+        if not todo:
+            stale = f" ({len(removed)} stale removed)" if removed else ""
+            print(Fore.CYAN + f"✔ Up to date: {os.path.basename(src_file)}" + stale)
+            manifest.record(members)
+            return f"{src_file} already extracted"
+
+        # 7-Zip cannot link into the object store, so a store always means the native path
+        if len(todo) < len(members) or self.store:
+            print(Fore.CYAN + f"  {len(todo)}/{len(members)} members changed, {len(removed)} stale removed")
+            result = self._extract_with_windows(src_file, target_dir, todo)
+        elif self.seven_zip_available:
+            names = [info.filename for info in members] if selective else None
+            result = self._extract_with_7z(src_file, target_dir, names)
+        else:
+            result = self._extract_with_windows(src_file, target_dir, members if selective else None)
+        if selective:
+            print(Fore.CYAN + f"  {len(members)}/{len(everything)} members selected by profile")
+        manifest.record(members)
+        return result
+
+    def _extract_with_7z(self, src_file: str, target_dir: str, names: List[str] = None):
+        """Try extracting using 7-Zip, optionally only the members named in a listfile."""
+        cmd = f'"{self.seven_zip_path}" x "{src_file}" -y -mmt{self.workers} -o"{target_dir}"'
+        listfile = None
+        if names is not None:
+            with tempfile.NamedTemporaryFile("w", suffix=".lst", encoding="utf-8", delete=False) as f:
+                f.write("\n".join(names))
+                listfile = f.name
+            cmd += f' -scsUTF-8 "@{listfile}"'
         try:
             result = subprocess.run(
                 cmd, shell=True, check=True, capture_output=True, text=True
@@ -37,18 +101,69 @@ class Extractor:
         except subprocess.CalledProcessError as e:
             print(Fore.RED + f"❌ 7-Zip failed: {e.stderr}")
             raise
+        finally:
+            if listfile:
+                os.remove(listfile)
 
-    def _extract_with_windows(self, src_file: str, target_dir: str):
-        """Fallback: Extract using Windows native extractor (ZIP only)."""
-        if not src_file.lower().endswith(".zip"):
+    def _extract_with_windows(self, src_file: str, target_dir: str, members: List[zipfile.ZipInfo] = None):
+        """Fallback: Extract using Windows native extractor (ZIP only), optionally just the given members."""
+        # Cached artifacts are stored under their digest, so sniff the format instead of the extension
+        if not zipfile.is_zipfile(src_file):
             print(Fore.RED + "❌ Only .zip supported in Windows fallback extractor")
             raise RuntimeError("Unsupported archive type without 7-Zip")
 
         try:
             with zipfile.ZipFile(src_file, "r") as zip_ref:
-                zip_ref.extractall(target_dir)
-            print(Fore.CYAN + f"✔ Done (Windows Native): {os.path.basename(src_file)}")
+                members = zip_ref.infolist() if members is None else members
+                if self.workers > 1 and len(members) >= self.PARALLEL_MIN_MEMBERS:
+                    self._extract_parallel(src_file, target_dir, members)
+                    mode = f"{self.workers} workers"
+                elif self.store:
+                    for info in members:
+                        self.store.extract(zip_ref, info, target_dir)
+                    mode = "Object store"
+                else:
+                    zip_ref.extractall(target_dir, members)
+                    mode = "Windows Native"
+            print(Fore.CYAN + f"✔ Done ({mode}): {os.path.basename(src_file)}")
             return f"Extracted {src_file} using Windows native ZIP support"
         except Exception as e:
             print(Fore.RED + f"❌ Windows extractor failed: {e}")
             raise
+
+    # -------------------------
+    # Parallel extraction
+    # -------------------------
+    def _extract_parallel(self, src_file: str, target_dir: str, members: List[zipfile.ZipInfo]):
+        """
+        Same result as extractall, spread over a process pool. Inflate is CPU bound and
+        small-file creation is slow on Windows, so both scale with the number of workers.
+        """
+        files = [info for info in members if not info.is_dir()]
+
+        # Create the whole directory tree up front so workers never race on makedirs
+        directories = {os.path.dirname(InstallManifest.member_path(target_dir, info.filename)) for info in files}
+        directories.update(
+            InstallManifest.member_path(target_dir, info.filename) for info in members if info.is_dir()
+        )
+        for directory in sorted(directories):
+            os.makedirs(directory, exist_ok=True)
+
+        store_root = str(self.store.root) if self.store else None
+        shards = self._shard(files, self.workers)
+        with ProcessPoolExecutor(max_workers=len(shards)) as pool:
+            futures = [pool.submit(_extract_shard, src_file, target_dir, shard, store_root) for shard in shards]
+            for future in futures:
+                future.result()
+
+    @staticmethod
+    def _shard(members: List[zipfile.ZipInfo], count: int) -> List[List[str]]:
+        """Balance members by compressed size: largest first, each onto the lightest shard."""
+        heap = [(0, i) for i in range(min(count, len(members)))]
+        shards = [[] for _ in heap]
+        for info in sorted(members, key=lambda m: m.compress_size, reverse=True):
+            load, i = heapq.heappop(heap)
+            shards[i].append(info.filename)
+            # Count a per-file cost too, so thousands of tiny files still spread out
+            heapq.heappush(heap, (load + info.compress_size + 4096, i))
+        return [shard for shard in shards if shard]
@@ -1,23 +1,172 @@
+import contextlib
+import hashlib
+import json
 import os
+import random
+import re
 import shutil
 import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
+import urllib3
 from tqdm import tqdm  # progress bar
 
+from src.core.mirror_selector import MirrorSelector
+
+
+class _ValidatorChanged(RuntimeError):
+    """The remote artifact no longer matches the validator saved with the partial file."""
+
+
+class _Truncated(RuntimeError):
+    """The connection closed before the requested range was complete."""
+
+
+class _StreamHasher:
+    """
+    SHA-256 of a file whose segments are written out of order.
+    Bytes landing at the hashed offset are fed straight from the stream; segments that
+    ran ahead are caught up from the (freshly written, page-cached) file once the gap closes.
+    """
+
+    def __init__(self, path, segments):
+        self.path = path
+        self.segments = segments
+        self.offset = 0
+        self.sha = hashlib.sha256()
+        self.lock = threading.Lock()
+
+    def feed(self, position, data):
+        with self.lock:
+            if position == self.offset:
+                self.sha.update(data)
+                self.offset += len(data)
+
+    def catch_up(self):
+        """Hash everything between the current offset and the end of the contiguous written prefix."""
+        with self.lock:
+            prefix = 0
+            for start, end, done in sorted(self.segments):
+                prefix = start + done
+                if prefix <= end:
+                    break
+            if prefix <= self.offset:
+                return
+            with open(self.path, "rb", buffering=0) as f:
+                f.seek(self.offset)
+                while self.offset < prefix:
+                    block = f.read(min(FileDownloader.BUFFER_SIZE, prefix - self.offset))
+                    if not block:
+                        break
+                    self.sha.update(block)
+                    self.offset += len(block)
+
+    def hexdigest(self):
+        self.catch_up()
+        return self.sha.hexdigest()
+
+
+class _Progress:
+    """
+    Per-file progress bar that also reports cumulative bytes to an optional listener.
+    Updates are batched so the bar and listener fire at most every `interval` seconds.
+    """
+
+    def __init__(self, desc, total, initial=0, position=None, listener=None, interval=0.25):
+        self.desc = desc
+        self.total = total
+        self.done = initial
+        self.pending = 0
+        self.listener = listener
+        self.interval = interval
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+        self.bar = tqdm(
+            total=total, initial=initial, unit="B", unit_scale=True, desc=desc, position=position,
+            leave=position is None,
+        )
+        self._notify()
+
+    def _notify(self):
+        if self.listener:
+            self.listener(self.desc, self.done, self.total)
+
+    def _flush(self, now):
+        self.bar.update(self.pending)
+        self.pending = 0
+        self.last = now
+        self._notify()
+
+    def update(self, n):
+        with self.lock:
+            self.done += n
+            self.pending += n
+            now = time.monotonic()
+            if now - self.last >= self.interval or (self.total and self.done >= self.total):
+                self._flush(now)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        with self.lock:
+            if self.pending:
+                self._flush(time.monotonic())
+        self.bar.close()
+
 
 class FileDownloader:
-    def __init__(self, target_folder="downloads"):
-        """Initialize downloader with a target folder."""
+    """
+    In-process transfer engine.
+
+    Resumable parallel HTTP Range segments (single stream when the server has no Range
+    support), SHA-256 while streaming, one reusable read buffer per stream, throttled
+    progress, connect/read timeouts and retries with exponential backoff.
+    curl / PowerShell / wget are only used when explicitly enabled via external_tools.
+    """
+
+    # Artifacts smaller than this are not worth splitting into ranges
+    SEGMENT_MIN_SIZE = 4 * 1024 * 1024
+    CONNECTIONS = 8
+    BUFFER_SIZE = 1024 * 1024
+    TIMEOUT = (10, 60)  # connect, read (seconds)
+    RETRIES = 4
+    BACKOFF = 1.0  # seconds before the first retry, doubled on each attempt
+    PROGRESS_INTERVAL = 0.25
+    PROXIES = {"http": None, "https": None}
+    # Range offsets must refer to the stored bytes, so never accept a transfer encoding
+    HEADERS = {"Accept-Encoding": "identity"}
+
+    def __init__(self, target_folder="downloads", connections=CONNECTIONS, session=None, position=None,
+                 listener=None, external_tools=False):
+        """
+        Initialize downloader with a target folder.
+        :param session: shared requests.Session (connection pool) to reuse instead of a private one
+        :param position: tqdm line for the progress bar when several downloads run side by side
+        :param listener: callable(name, done_bytes, total_bytes) receiving cumulative progress
+        :param external_tools: fall back to curl / PowerShell / wget when the native engine fails
+        """
         self.target_folder = os.path.abspath(target_folder)
+        self.connections = max(1, int(connections))
+        self.session = session
+        self.position = position
+        self.listener = listener
+        self.external_tools = external_tools
+        self._digests = {}
         os.makedirs(self.target_folder, exist_ok=True)
 
-    def _run_command(self, command):
-        """Helper: Run a shell command safely."""
+    # ------------------------
+    # External tools (opt-in)
+    # ------------------------
+    @staticmethod
+    def _run_command(command):
+        """Helper: Run an external tool without a shell."""
         try:
             result = subprocess.run(
                 command,
-                shell=True,
                 check=True,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
@@ -27,42 +176,391 @@ class FileDownloader:
             return False
 
     def _download_with_curl(self, url, filepath):
-        return self._run_command(f'curl -L -o "{filepath}" "{url}"')
+        return self._run_command(["curl", "-fL", "--retry", str(self.RETRIES), "-o", filepath, url])
 
     def _download_with_powershell(self, url, filepath):
+        quote = self._powershell_quote
         return self._run_command(
-            f"powershell -Command \"Invoke-WebRequest -Uri '{url}' -OutFile '{filepath}'\""
+            ["powershell", "-NoProfile", "-Command", f"Invoke-WebRequest -Uri {quote(url)} -OutFile {quote(filepath)}"]
         )
 
+    @staticmethod
+    def _powershell_quote(value: str) -> str:
+        """Single-quoted PowerShell string literal (embedded quotes doubled)."""
+        return "'" + value.replace("'", "''") + "'"
+
     def _download_with_wget(self, url, filepath):
-        return self._run_command(f'wget -O "{filepath}" "{url}"')
+        return self._run_command(["wget", "-O", filepath, url])
+
+    def _download_external(self, url, filepath):
+        """Try the external tools in turn; returns the SHA-256 of the result."""
+        tmp_path = filepath + ".tmp"
+        strategies = [
+            ("curl", shutil.which("curl") and self._download_with_curl),
+            ("PowerShell", os.name == "nt" and self._download_with_powershell),
+            ("wget", shutil.which("wget") and self._download_with_wget),
+        ]
+        for name, strategy in strategies:
+            if strategy and strategy(url, tmp_path):
+                os.replace(tmp_path, filepath)
+                print(f"✅ Downloaded with {name}")
+                return self.hash_file(filepath)
+        self._discard(tmp_path)
+        raise RuntimeError("❌ All download methods failed!")
+
+    # ------------------------
+    # Plumbing
+    # ------------------------
+    def _open_session(self):
+        """The shared pooled session if one was given, else a private one sized for our segments."""
+        if self.session is not None:
+            return contextlib.nullcontext(self.session)
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=self.connections)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _get(self, session, url, headers=None):
+        return session.get(
+            url, headers={**self.HEADERS, **(headers or {})}, stream=True, timeout=self.TIMEOUT,
+            proxies=self.PROXIES,
+        )
+
+    def _progress(self, filepath, total, initial=0):
+        return _Progress(
+            os.path.basename(filepath), total, initial, self.position, self.listener, self.PROGRESS_INTERVAL
+        )
+
+    def _stream(self, resp, f, on_chunk, stop=None):
+        """Copy a response body into f through one reusable buffer."""
+        buffer = bytearray(self.BUFFER_SIZE)
+        view = memoryview(buffer)
+        while not (stop and stop.is_set()):
+            n = resp.raw.readinto(buffer)
+            if not n:
+                break
+            f.write(view[:n])
+            on_chunk(view[:n])
+
+    @staticmethod
+    def _retryable(error):
+        if isinstance(error, requests.HTTPError):
+            status = error.response.status_code if error.response is not None else 0
+            return status == 429 or status >= 500
+        return isinstance(
+            error, (requests.ConnectionError, requests.Timeout, urllib3.exceptions.HTTPError, _Truncated)
+        )
+
+    def _with_retries(self, action, description, stop=None):
+        """Run action(), retrying transient network failures with exponential backoff and jitter."""
+        for attempt in range(self.RETRIES + 1):
+            try:
+                return action()
+            except Exception as e:
+                if attempt == self.RETRIES or not self._retryable(e) or (stop and stop.is_set()):
+                    raise
+                delay = self.BACKOFF * 2 ** attempt * (0.5 + random.random())
+                print(f"↻ {description} failed ({e}), retry {attempt + 1}/{self.RETRIES} in {delay:.1f}s")
+                time.sleep(delay)
+
+    @staticmethod
+    def _part_paths(filepath):
+        """Partial data and its resume metadata live next to the final file."""
+        return filepath + ".part", filepath + ".part.json"
 
-    def _download_with_requests(self, url, filepath):
+    @staticmethod
+    def _load_state(meta_path):
         try:
-            with requests.get(
-                    url, stream=True, timeout=60, proxies={"http": None, "https": None}
-            ) as resp:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _save_state(meta_path, state):
+        tmp = meta_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp, meta_path)
+
+    @staticmethod
+    def _discard(*paths):
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    # ------------------------
+    # Native engine
+    # ------------------------
+    def _probe(self, session, url):
+        """
+        Ask for the first byte only.
+        Returns size, Range support and the validator (strong ETag or Last-Modified) for If-Range.
+        """
+        with self._get(session, url, {"Range": "bytes=0-0"}) as resp:
+            resp.raise_for_status()
+            etag = resp.headers.get("etag")
+            info = {
+                "size": None,
+                "ranged": False,
+                "etag": etag,
+                "last_modified": resp.headers.get("last-modified"),
+                "validator": etag if etag and not etag.startswith("W/") else resp.headers.get("last-modified"),
+            }
+            if resp.status_code == 206:
+                match = re.match(r"bytes\s+0-0/(\d+)", resp.headers.get("content-range", ""))
+                if match:
+                    info.update(size=int(match.group(1)), ranged=True)
+                    return info
+            size = resp.headers.get("content-length")
+            info["size"] = int(size) if size else None
+            return info
+
+    def _plan_segments(self, size):
+        """Split [0, size) into contiguous [start, end, done] byte ranges, one per connection."""
+        count = min(self.connections, max(1, size // self.SEGMENT_MIN_SIZE))
+        step = -(-size // count)
+        return [[start, min(start + step, size) - 1, 0] for start in range(0, size, step)]
+
+    def _resume_state(self, url, info, part_path, meta_path):
+        """Return the saved state if the partial file still belongs to the same remote artifact."""
+        state = self._load_state(meta_path)
+        if (
+                state
+                and info["validator"]
+                and state.get("url") == url
+                and state.get("size") == info["size"]
+                and state.get("validator") == info["validator"]
+                and os.path.exists(part_path)
+                and os.path.getsize(part_path) == info["size"]
+        ):
+            return state
+        return None
+
+    def _fetch_segment(self, session, url, part_path, segment, validator, bar, checkpoint, stop, hasher):
+        """Fetch the missing tail of one segment and write it at its offset in the preallocated file."""
+        start, end, done = segment
+        if start + done > end:
+            return
+        headers = {"Range": f"bytes={start + done}-{end}"}
+        if validator:
+            headers["If-Range"] = validator
+        with self._get(session, url, headers) as resp:
+            resp.raise_for_status()
+            if resp.status_code != 206:
+                raise _ValidatorChanged(f"Server ignored range {start + done}-{end} (HTTP {resp.status_code})")
+
+            def on_chunk(chunk):
+                position = start + segment[2]
+                segment[2] += len(chunk)
+                hasher.feed(position, chunk)
+                bar.update(len(chunk))
+                checkpoint()
+
+            # Unbuffered, so the saved progress never runs ahead of the bytes handed to the OS
+            with open(part_path, "r+b", buffering=0) as f:
+                f.seek(start + done)
+                self._stream(resp, f, on_chunk, stop)
+        if stop.is_set():
+            return
+        if start + segment[2] <= end:
+            raise _Truncated(f"Segment {start}-{end} truncated after {segment[2]} bytes")
+        hasher.catch_up()
+
+    def _download_ranged(self, session, url, info, part_path, meta_path):
+        """
+        Parallel Range segments into a preallocated .part file, resuming any saved progress.
+        Returns the SHA-256 of the completed file.
+        """
+        state = self._resume_state(url, info, part_path, meta_path)
+        if state:
+            print(f"↻ Resuming partial download ({sum(s[2] for s in state['segments'])} bytes on disk)")
+        else:
+            state = {
+                "url": url,
+                "size": info["size"],
+                "etag": info["etag"],
+                "last_modified": info["last_modified"],
+                "validator": info["validator"],
+                "segments": self._plan_segments(info["size"]),
+            }
+            with open(part_path, "wb") as f:
+                f.truncate(info["size"])
+
+        segments = state["segments"]
+        hasher = _StreamHasher(part_path, segments)
+        hasher.catch_up()
+        lock = threading.Lock()
+        stop = threading.Event()
+        last_save = [time.monotonic()]
+
+        def checkpoint(force=False):
+            now = time.monotonic()
+            if force or now - last_save[0] >= 1.0:
+                with lock:
+                    last_save[0] = now
+                    self._save_state(meta_path, state)
+
+        checkpoint(force=True)
+        try:
+            with (
+                self._progress(part_path, info["size"], sum(s[2] for s in segments)) as bar,
+                ThreadPoolExecutor(max_workers=len(segments)) as pool,
+            ):
+                futures = [
+                    pool.submit(
+                        self._with_retries,
+                        lambda segment=segment: self._fetch_segment(
+                            session, url, part_path, segment, state["validator"], bar, checkpoint, stop, hasher
+                        ),
+                        f"Segment {segment[0]}-{segment[1]}",
+                        stop,
+                    )
+                    for segment in segments
+                ]
+                try:
+                    for future in futures:
+                        future.result()
+                except BaseException:
+                    stop.set()
+                    raise
+        finally:
+            checkpoint(force=True)
+        return hasher.hexdigest()
+
+    def _download_stream(self, session, url, part_path):
+        """Single stream for servers without Range support; a retry starts over. Returns the SHA-256."""
+        with self._get(session, url) as resp:
+            resp.raise_for_status()
+            total = int(resp.headers.get("content-length", 0))
+            sha = hashlib.sha256()
+            with (
+                open(part_path, "wb") as f,
+                self._progress(part_path, total) as bar,
+            ):
+                def on_chunk(chunk):
+                    sha.update(chunk)
+                    bar.update(len(chunk))
+
+                self._stream(resp, f, on_chunk)
+                if total and f.tell() != total:
+                    raise _Truncated(f"Stream truncated after {f.tell()} of {total} bytes")
+        return sha.hexdigest()
+
+    def _download_ordered(self, session, url, info, part_path, sink):
+        """
+        One in-order stream for a sink that consumes the body as it arrives.
+        A dropped connection continues from the last byte with If-Range; without Range
+        support the sink cannot rewind, so the transfer fails instead. Returns the SHA-256.
+        """
+        sha = hashlib.sha256()
+        position = [0]
+        total = info["size"]
+
+        def attempt(bar):
+            headers = {}
+            if position[0]:
+                if not info["ranged"]:
+                    raise RuntimeError("Connection lost and the server cannot resume a streamed transfer")
+                headers["Range"] = f"bytes={position[0]}-"
+                if info["validator"]:
+                    headers["If-Range"] = info["validator"]
+            with self._get(session, url, headers) as resp:
                 resp.raise_for_status()
-                total = int(resp.headers.get("content-length", 0))
-                with (
-                    open(filepath, "wb") as f,
-                    tqdm(
-                        total=total,
-                        unit="B",
-                        unit_scale=True,
-                        desc=os.path.basename(filepath),
-                    ) as bar,
-                ):
-                    for chunk in resp.iter_content(8192):
-                        f.write(chunk)
-                        bar.update(len(chunk))
-            return True
-        except Exception as e:
-            print(f"❌ Python requests failed: {e}")
-            return False
+                if position[0] and resp.status_code != 206:
+                    raise _ValidatorChanged(f"Server ignored resume at byte {position[0]} (HTTP {resp.status_code})")
+
+                def on_chunk(chunk):
+                    sink.feed(position[0], chunk)
+                    sha.update(chunk)
+                    position[0] += len(chunk)
+                    bar.update(len(chunk))
+
+                with open(part_path, "r+b" if position[0] else "wb") as f:
+                    f.seek(position[0])
+                    self._stream(resp, f, on_chunk)
+            if total and position[0] != total:
+                raise _Truncated(f"Stream truncated after {position[0]} of {total} bytes")
+
+        with self._progress(part_path, total) as bar:
+            self._with_retries(lambda: attempt(bar), "Download")
+        return sha.hexdigest()
+
+    def _download_native(self, url, filepath, sink=None):
+        """
+        Resumable parallel HTTP Range segments, falling back to a single stream.
+        With a sink the body is streamed in order instead (see _download_ordered).
+        Returns the SHA-256 computed while streaming; raises on failure.
+        """
+        part_path, meta_path = self._part_paths(filepath)
+        with self._open_session() as session:
+            info = self._with_retries(lambda: self._probe(session, url), "Probe")
+            if sink:
+                digest = self._download_ordered(session, url, info, part_path, sink)
+            elif info["ranged"]:
+                try:
+                    digest = self._download_ranged(session, url, info, part_path, meta_path)
+                except _ValidatorChanged as e:
+                    print(f"↻ Remote file changed, restarting download: {e}")
+                    self._discard(part_path, meta_path)
+                    info = self._with_retries(lambda: self._probe(session, url), "Probe")
+                    digest = self._download_ranged(session, url, info, part_path, meta_path)
+            else:
+                digest = self._with_retries(lambda: self._download_stream(session, url, part_path), "Download")
+        os.replace(part_path, filepath)
+        self._discard(meta_path)
+        return digest
 
-    def download(self, url, filename=None):
-        """Download a file using curl, PowerShell, wget, or requests."""
+    def _copy_local(self, source, filepath, sink=None):
+        """Copy from a local/network-share mirror, hashing (and feeding the sink) on the way. Returns the SHA-256."""
+        sha = hashlib.sha256()
+        tmp_path = filepath + ".tmp"
+        buffer = bytearray(self.BUFFER_SIZE)
+        view = memoryview(buffer)
+        with (
+            open(source, "rb", buffering=0) as src,
+            open(tmp_path, "wb") as dst,
+            self._progress(filepath, os.path.getsize(source)) as bar,
+        ):
+            while n := src.readinto(buffer):
+                if sink:
+                    sink.feed(dst.tell(), view[:n])
+                dst.write(view[:n])
+                sha.update(view[:n])
+                bar.update(n)
+        os.replace(tmp_path, filepath)
+        return sha.hexdigest()
+
+    # ------------------------
+    # Public API
+    # ------------------------
+    @staticmethod
+    def hash_file(filepath):
+        """SHA-256 of a file on disk (only needed for files not streamed by this downloader)."""
+        sha = hashlib.sha256()
+        with open(filepath, "rb", buffering=0) as f:
+            while block := f.read(FileDownloader.BUFFER_SIZE):
+                sha.update(block)
+        return sha.hexdigest()
+
+    def sha256(self, filepath):
+        """Digest of a downloaded file; computed during the transfer whenever possible."""
+        filepath = os.path.abspath(filepath)
+        if filepath not in self._digests:
+            self._digests[filepath] = self.hash_file(filepath)
+        return self._digests[filepath]
+
+    def download(self, url, filename=None, checksum=None, sink=None):
+        """
+        Download a file with the in-process engine (external tools only if enabled).
+        Local paths and file:// URLs (directory mirrors) are copied instead.
+        When a SHA-256 checksum is given the result is verified and discarded on mismatch.
+        A sink (feed(offset, data) / finish(path) / abort()) receives the body in order while
+        it downloads, e.g. to extract an archive on the fly; it is finished only once verified.
+        """
         if not filename:
             filename = os.path.basename(url.split("?")[0]) or "download.tmp"
 
@@ -70,27 +568,33 @@ class FileDownloader:
 
         print(f"\n⬇️  Downloading {url}\n   → {filepath}")
 
-        # Strategy 1: curl
-        if shutil.which("curl") and self._download_with_curl(url, filepath):
-            print("✅ Downloaded with curl")
-            return filepath
-
-        # Strategy 2: PowerShell (Windows only)
-        if os.name == "nt" and self._download_with_powershell(url, filepath):
-            print("✅ Downloaded with PowerShell")
-            return filepath
-
-        # Strategy 3: wget
-        if shutil.which("wget") and self._download_with_wget(url, filepath):
-            print("✅ Downloaded with wget")
-            return filepath
-
-        # Strategy 4: Python requests
-        if self._download_with_requests(url, filepath):
-            print("✅ Downloaded with Python requests")
-            return filepath
+        try:
+            if MirrorSelector.is_local(url):
+                digest = self._copy_local(MirrorSelector.local_path(url), filepath, sink)
+                print("✅ Copied from local mirror")
+            else:
+                try:
+                    digest = self._download_native(url, filepath, sink)
+                    print("✅ Downloaded")
+                except Exception as e:
+                    # A sink has consumed part of the stream, so only a plain download may switch tools
+                    if not self.external_tools or sink:
+                        raise RuntimeError(f"❌ Download failed: {e}") from e
+                    # External tools cannot resume; they use their own temp file so the .part stays resumable
+                    print(f"❌ Native download failed: {e}")
+                    digest = self._download_external(url, filepath)
 
-        raise RuntimeError("❌ All download methods failed!")
+            self._digests[os.path.abspath(filepath)] = digest
+            if checksum and digest != checksum.lower():
+                self._discard(filepath)
+                raise RuntimeError(f"❌ Checksum mismatch for {filename}: expected {checksum.lower()}, got {digest}")
+        except BaseException:
+            if sink:
+                sink.abort()
+            raise
+        if sink:
+            sink.finish(filepath)
+        return filepath
 
 
 # ------------------------
@@ -98,7 +602,7 @@ class FileDownloader:
 # ------------------------
 if __name__ == "__main__":
     url = "https://www.apachelounge.com/download/VS17/binaries/httpd-2.4.65-250724-Win64-VS17.zip"
-    downloader = Downloader("my_downloads")
+    downloader = FileDownloader("my_downloads")
     try:
         file_path = downloader.download(url)
         print(f"\n🎉 File saved at: {file_path}")
@@ -1,6 +1,8 @@
 import os.path
 import webbrowser
 
+from src.core.template_engine import TemplateEngine
+
 
 class Helper:
     def __init__(self):
@@ -12,22 +14,8 @@ class Helper:
 
     @staticmethod
     def replace_tokens(destination, tokens_list):
-        with open(destination, "r+") as fp:
-            file_data = fp.read()
-            for eachToken, token_value in tokens_list.items():
-                token = (
-                    f"[#{eachToken}#]"
-                    if isinstance(token_value, str)
-                    else f"'[#{eachToken}#]'"
-                )
-                if not isinstance(token_value, str):
-                    token_value = str(token_value)
-                file_data = file_data.replace(token, token_value)
-
-            fp.seek(0)
-            fp.truncate()
-            fp.write(file_data)
-        fp.close()
+        """Render the [#TOKEN#] placeholders of a file in place (single pass, atomic write)."""
+        TemplateEngine().render_to(destination, destination, tokens_list)
 
     @staticmethod
     def open_app(hostname: str, port: int = 80, ssl: bool = False):
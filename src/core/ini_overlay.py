@@ -0,0 +1,162 @@
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+from colorama import Fore
+
+from src.core.path_manager import PathManager
+from src.core.template_engine import TemplateEngine
+
+
+class IniOverlay:
+    """
+    Per-vhost PHP settings layered over the global php.ini.
+
+    The settings of a vhost are kept in ini/<hostname>.json under the deployment root and
+    rendered as php_admin_value/php_admin_flag lines into the vhost's own <VirtualHost>
+    block (see directives()). Several vhosts often share one DocumentRoot (www by default),
+    so the settings cannot live in its .htaccess or .user.ini without leaking into each
+    other; earlier managed blocks found there are removed. The project's own .htaccess
+    cannot override admin values.
+
+    Only PHP_INI_PERDIR and PHP_INI_ALL directives can be overridden this way; the
+    PHP_INI_SYSTEM ones below are rejected.
+    """
+
+    SYSTEM_KEYS = frozenset({
+        "allow_url_fopen", "allow_url_include", "disable_classes", "disable_functions", "enable_dl",
+        "expose_php", "extension", "extension_dir", "file_uploads", "max_file_uploads", "realpath_cache_size",
+        "realpath_cache_ttl", "sys_temp_dir", "upload_tmp_dir", "user_ini.cache_ttl", "user_ini.filename",
+        "zend_extension", "zend.enable_gc", "opcache.blacklist_filename", "opcache.enable_cli",
+        "opcache.error_log", "opcache.file_cache", "opcache.file_cache_only", "opcache.force_restart_timeout",
+        "opcache.huge_code_pages", "opcache.interned_strings_buffer", "opcache.jit_buffer_size",
+        "opcache.lockfile_path", "opcache.log_verbosity_level", "opcache.max_accelerated_files",
+        "opcache.max_file_size", "opcache.max_wasted_percentage", "opcache.memory_consumption",
+        "opcache.optimization_level", "opcache.preload", "opcache.preload_user", "opcache.protect_memory",
+        "opcache.restrict_api", "opcache.save_comments", "opcache.use_cwd", "opcache.validate_permission",
+        "opcache.validate_root",
+    })
+    KEY_PATTERN = re.compile(r"^[a-z_][a-z0-9_.]*$", re.IGNORECASE)
+    FLAG_VALUES = ("on", "off", "true", "false", "yes", "no")
+
+    def __init__(self, hostname: str, document_root: str = None, folder: str = None):
+        self.hostname = hostname
+        self.path = Path(folder or PathManager().deploy_structure("ini_overlays")) / f"{hostname}.json"
+        state = self._load()
+        self.document_root = document_root or state.get("document_root")
+        self.settings: Dict[str, str] = state.get("settings", {})
+
+    # -------------------------
+    # Public operations
+    # -------------------------
+    @staticmethod
+    def parse(spec) -> Dict[str, str]:
+        """'memory_limit=512M,display_errors=On' -> {'memory_limit': '512M', 'display_errors': 'On'}"""
+        settings = {}
+        for part in str(spec or "").split(","):
+            key, eq, value = part.partition("=")
+            if key.strip():
+                if not eq:
+                    raise ValueError(f"Missing value for PHP setting '{key.strip()}' (expected key=value)")
+                settings[key.strip()] = value.strip()
+        return settings
+
+    def set(self, settings: Dict[str, str]):
+        for key in settings:
+            self.validate(key)
+        self.settings.update({key: str(value) for key, value in settings.items()})
+
+    def unset(self, keys: Iterable[str]):
+        for key in keys:
+            self.settings.pop(key.strip(), None)
+
+    @classmethod
+    def validate(cls, key: str):
+        if not cls.KEY_PATTERN.match(key):
+            raise ValueError(f"Invalid PHP setting name '{key}'")
+        if key.lower() in cls.SYSTEM_KEYS:
+            raise ValueError(f"'{key}' is a PHP_INI_SYSTEM setting; change it in the global php.ini instead")
+
+    def apply(self):
+        """Save the settings; the caller re-renders the vhost block that carries them."""
+        if self.settings:
+            self._save()
+        else:
+            self._delete()
+        if self.document_root:
+            self._strip_legacy()
+
+    def remove(self):
+        """Drop the vhost's stored settings."""
+        self.settings = {}
+        self.apply()
+
+    def directives(self) -> List[str]:
+        """Lines for the vhost's <VirtualHost> block; empty without settings."""
+        if not self.settings:
+            return []
+        lines = ["<IfModule php_module>"]
+        for key, value in sorted(self.settings.items()):
+            directive = "php_admin_flag" if value.lower() in self.FLAG_VALUES else "php_admin_value"
+            lines.append(f"    {directive} {key} {self._quote(value)}")
+        lines.append("</IfModule>")
+        return lines
+
+    def report(self):
+        if not self.settings:
+            print(f"{Fore.YELLOW}No PHP overrides for {self.hostname}")
+            return
+        print(f"{Fore.CYAN}PHP overrides for {self.hostname} ({self.document_root}):")
+        for key, value in sorted(self.settings.items()):
+            print(f"  {key} = {value}")
+
+    # -------------------------
+    # Rendering
+    # -------------------------
+    def _strip_legacy(self):
+        """Remove the managed blocks older versions wrote into the DocumentRoot's .htaccess and .user.ini."""
+        for name, comment in ((".htaccess", "#"), (".user.ini", ";")):
+            path = os.path.join(self.document_root, name)
+            begin = f"{comment} BEGIN WinAPDev php settings for {self.hostname} (managed by vhost:ini)"
+            end = f"{comment} END WinAPDev php settings for {self.hostname}"
+            try:
+                with open(path, "r", encoding="utf-8", newline="") as f:
+                    text = f.read()
+            except FileNotFoundError:
+                continue
+            rest = re.sub(rf"{re.escape(begin)}\n.*?{re.escape(end)}\n*", "", text, flags=re.DOTALL)
+            if rest == text:
+                continue
+            if rest.strip():
+                TemplateEngine.write_if_changed(path, rest)
+            else:
+                os.remove(path)
+
+    @staticmethod
+    def _quote(value: str) -> str:
+        return f'"{value}"' if re.search(r"[\s;=]", value) and not value.startswith('"') else value
+
+    # -------------------------
+    # Utilities
+    # -------------------------
+    def _load(self) -> dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"document_root": self.document_root, "settings": self.settings}, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.path)
+
+    def _delete(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
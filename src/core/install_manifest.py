@@ -0,0 +1,152 @@
+import json
+import os
+import zipfile
+from typing import Iterable, List
+
+from colorama import Fore
+
+
+class InstallManifest:
+    """
+    Record of what an archive extraction put on disk: size, CRC32 and mtime per member.
+
+    A re-extraction compares the archive's central directory with the manifest and
+    only writes members that are new, changed upstream, or no longer intact on disk.
+    The same data drives dev:verify without re-reading the archive.
+    """
+
+    FILE_NAME = ".winapdev-manifest.json"
+    CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, target_dir: str):
+        self.target_dir = target_dir
+        self.path = os.path.join(target_dir, self.FILE_NAME)
+        self.meta = {}
+        self.entries = self._load()
+
+    # -------------------------
+    # Extraction planning
+    # -------------------------
+    def changed(self, members: Iterable[zipfile.ZipInfo]) -> List[zipfile.ZipInfo]:
+        """Members that have to be (re)written; intact files recorded with the same CRC are skipped."""
+        todo = []
+        for info in members:
+            if info.is_dir():
+                if not os.path.isdir(self.member_path(self.target_dir, info.filename)):
+                    todo.append(info)
+                continue
+            entry = self.entries.get(info.filename)
+            if (
+                    entry and entry["crc"] == info.CRC and entry["size"] == info.file_size
+                    and self._unchanged(info.filename, entry)
+            ):
+                continue
+            todo.append(info)
+        return todo
+
+    def prune(self, members: Iterable[zipfile.ZipInfo]) -> List[str]:
+        """Delete files recorded by an earlier extraction that the archive no longer provides."""
+        keep = {info.filename for info in members}
+        removed = []
+        for name in self.entries:
+            if name in keep:
+                continue
+            path = self.member_path(self.target_dir, name)
+            try:
+                os.remove(path)
+                removed.append(name)
+            except FileNotFoundError:
+                pass
+        return removed
+
+    def record(self, members: Iterable[zipfile.ZipInfo]):
+        """Snapshot the extracted files as they are on disk now."""
+        entries = {}
+        for info in members:
+            if info.is_dir():
+                continue
+            try:
+                stat = os.stat(self.member_path(self.target_dir, info.filename))
+            except OSError:
+                continue
+            entries[info.filename] = {"size": info.file_size, "crc": info.CRC, "mtime": stat.st_mtime_ns}
+        self.entries = entries
+        self._save()
+
+    def tag(self, **meta):
+        """Store install details (e.g. the profile) next to the member list."""
+        self.meta.update(meta)
+        self._save()
+
+    # -------------------------
+    # Integrity check
+    # -------------------------
+    def verify(self, deep: bool = False) -> dict:
+        """
+        {member: 'missing'|'size'|'modified'} for every damaged file.
+        Files whose size and mtime still match are trusted unless deep is set; otherwise the CRC decides.
+        """
+        problems = {}
+        for name, entry in self.entries.items():
+            path = self.member_path(self.target_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                problems[name] = "missing"
+                continue
+            if stat.st_size != entry["size"]:
+                problems[name] = "size"
+            elif (deep or stat.st_mtime_ns != entry["mtime"]) and self.crc32(path) != entry["crc"]:
+                problems[name] = "modified"
+        return problems
+
+    def report(self, problems: dict):
+        for name, problem in sorted(problems.items()):
+            print(Fore.RED + f"  {problem:<9}" + Fore.WHITE + f" {name}")
+
+    # -------------------------
+    # Utilities
+    # -------------------------
+    @classmethod
+    def crc32(cls, path: str) -> int:
+        crc = 0
+        with open(path, "rb") as f:
+            while chunk := f.read(cls.CHUNK_SIZE):
+                crc = zipfile.crc32(chunk, crc)
+        return crc
+
+    @staticmethod
+    def member_path(target_dir: str, filename: str) -> str:
+        """Where ZipFile.extract places a member (same sanitising rules)."""
+        arcname = filename.replace("/", os.path.sep)
+        if os.path.altsep:
+            arcname = arcname.replace(os.path.altsep, os.path.sep)
+        arcname = os.path.splitdrive(arcname)[1]
+        invalid = ("", os.path.curdir, os.path.pardir)
+        arcname = os.path.sep.join(x for x in arcname.split(os.path.sep) if x not in invalid)
+        if os.path.sep == "\\":
+            arcname = zipfile.ZipFile._sanitize_windows_name(arcname, os.path.sep)
+        return os.path.normpath(os.path.join(target_dir, arcname))
+
+    def _unchanged(self, name: str, entry: dict) -> bool:
+        try:
+            stat = os.stat(self.member_path(self.target_dir, name))
+        except OSError:
+            return False
+        return stat.st_size == entry["size"] and stat.st_mtime_ns == entry["mtime"]
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.meta = data.get("meta", {})
+            return data.get("members", {})
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        os.makedirs(self.target_dir, exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "meta": self.meta, "members": self.entries}, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
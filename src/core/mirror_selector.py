@@ -0,0 +1,175 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Optional
+from urllib.parse import unquote, urlparse
+
+import requests
+
+from src.core.constants import Constants
+from src.core.path_manager import PathManager
+
+
+class MirrorSelector:
+    """
+    Rank the sources of an artifact by measured speed.
+
+    Sources are upstream URLs, archive/internal mirrors or local directories. Every HTTP
+    source is probed concurrently with a small Range request; time-to-first-byte and
+    throughput are blended into the measurements kept from earlier runs, and the source
+    with the lowest estimated transfer time wins. Unhealthy sources sink to the end.
+    """
+
+    PROBE_BYTES = 256 * 1024
+    PROBE_TIMEOUT = 5
+    # Measurements younger than this are trusted without probing again
+    FRESH_SECONDS = 10 * 60
+    # Weight of a new probe against the stored history
+    SMOOTHING = 0.5
+    # Assumed artifact size when a source does not report one
+    DEFAULT_SIZE = 32 * 1024 * 1024
+    STATE_FILE = "mirrors.json"
+    PROXIES = {"http": None, "https": None}
+
+    _state_lock = threading.Lock()
+
+    def __init__(self, state_file=None, session: Optional[requests.Session] = None):
+        self.state_file = Path(state_file or Path(PathManager().project_structure("cache")) / self.STATE_FILE)
+        self.session = session or requests.Session()
+
+    # -------------------------
+    # Public operations
+    # -------------------------
+    @staticmethod
+    def extra_mirrors() -> List[str]:
+        """Additional mirror bases (URLs or directories) from the environment, ';' separated."""
+        return [m.strip() for m in os.environ.get(Constants.ENV_MIRRORS, "").split(";") if m.strip()]
+
+    @classmethod
+    def sources(cls, item: dict) -> List[str]:
+        """All candidate locations of an artifact: its own sources plus configured mirror bases."""
+        candidates = list(item.get("sources") or [])
+        for base in cls.extra_mirrors():
+            if cls.is_local(base):
+                candidates.append(os.path.join(cls.local_path(base), item.get("file")))
+            else:
+                candidates.append(f"{base.rstrip('/')}/{item.get('file')}")
+        return list(dict.fromkeys(candidates))
+
+    @staticmethod
+    def is_local(source: str) -> bool:
+        return urlparse(source).scheme in ("", "file") or (len(source) > 1 and source[1] == ":")
+
+    @staticmethod
+    def local_path(source: str) -> str:
+        parsed = urlparse(source)
+        if parsed.scheme == "file":
+            path = unquote(parsed.path)
+            # file:///C:/x -> C:/x on Windows
+            return path[1:] if len(path) > 2 and path[2] == ":" else path
+        return source
+
+    def rank(self, item: dict) -> List[str]:
+        """Sources ordered fastest first; a single source is returned without probing."""
+        sources = self.sources(item)
+        if len(sources) <= 1:
+            return sources
+
+        state = self._load()
+        now = time.time()
+        stale = [
+            s for s in sources
+            if not self.is_local(s) and now - state.get(s, {}).get("checked", 0) > self.FRESH_SECONDS
+        ]
+        if stale:
+            with ThreadPoolExecutor(max_workers=len(stale)) as pool:
+                results = dict(zip(stale, pool.map(self._probe, stale)))
+            with self._state_lock:
+                state = self._load()
+                for source, result in results.items():
+                    state[source] = self._blend(state.get(source), result)
+                self._save(state)
+
+        return sorted(sources, key=lambda s: self._estimate(s, state))
+
+    def best(self, item: dict, remote_only: bool = False) -> Optional[str]:
+        ranked = self.rank(item)
+        if remote_only:
+            ranked = [s for s in ranked if not self.is_local(s)]
+        return ranked[0] if ranked else None
+
+    # -------------------------
+    # Measurements
+    # -------------------------
+    def _probe(self, url: str) -> dict:
+        """Fetch the first PROBE_BYTES and time it."""
+        started = time.monotonic()
+        try:
+            with self.session.get(
+                    url, headers={"Range": f"bytes=0-{self.PROBE_BYTES - 1}"}, stream=True,
+                    timeout=self.PROBE_TIMEOUT, proxies=self.PROXIES
+            ) as resp:
+                resp.raise_for_status()
+                first_byte = time.monotonic()
+                received = 0
+                for chunk in resp.iter_content(64 * 1024):
+                    received += len(chunk)
+                    if received >= self.PROBE_BYTES:
+                        break
+                elapsed = max(time.monotonic() - first_byte, 1e-6)
+                total = resp.headers.get("content-range", "").rpartition("/")[2]
+                if not total.isdigit():
+                    total = resp.headers.get("content-length", "") if resp.status_code == 200 else ""
+                return {
+                    "healthy": True,
+                    "latency": first_byte - started,
+                    "throughput": received / elapsed,
+                    "size": int(total) if total.isdigit() else None,
+                    "ranged": resp.status_code == 206,
+                }
+        except Exception as e:
+            return {"healthy": False, "error": str(e)}
+
+    def _blend(self, previous: Optional[dict], result: dict) -> dict:
+        entry = dict(previous or {})
+        entry["checked"] = time.time()
+        entry["healthy"] = result["healthy"]
+        if not result["healthy"]:
+            entry["error"] = result["error"]
+            entry["failures"] = entry.get("failures", 0) + 1
+            return entry
+        for key in ("latency", "throughput"):
+            old = entry.get(key)
+            entry[key] = result[key] if old is None else old + self.SMOOTHING * (result[key] - old)
+        entry.update(size=result["size"] or entry.get("size"), ranged=result["ranged"], failures=0)
+        entry.pop("error", None)
+        return entry
+
+    def _estimate(self, source: str, state: dict) -> float:
+        """Expected seconds to fetch the whole artifact from this source."""
+        if self.is_local(source):
+            return 0.0 if os.path.isfile(self.local_path(source)) else float("inf")
+        entry = state.get(source)
+        if not entry or not entry.get("healthy") or not entry.get("throughput"):
+            return float("inf")
+        return entry["latency"] + (entry.get("size") or self.DEFAULT_SIZE) / entry["throughput"]
+
+    # -------------------------
+    # Utilities
+    # -------------------------
+    def _load(self) -> dict:
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, state: dict):
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_file.with_name(self.state_file.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.state_file)
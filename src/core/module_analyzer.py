@@ -0,0 +1,135 @@
+import os
+from collections import defaultdict
+from typing import Dict, List
+
+from colorama import Fore
+
+from src.core.apache_config import ApacheConfig, ConfigNode
+from src.core.apache_modules import ApacheModules
+from src.core.template_engine import TemplateEngine
+
+
+class ModuleAnalyzer:
+    """
+    Finds the LoadModule lines no directive in use depends on.
+
+    Usage is collected from httpd.conf with everything it includes and from the .htaccess
+    files under every DocumentRoot. A directive inside <IfModule x> does not keep module x
+    loaded: that block only exists to be skipped when x is absent. Modules the
+    analyzer has no directive table for are always kept.
+    """
+
+    # Needed by every PHP site even when no directive mentions them
+    ALWAYS = ("authz_core_module", "dir_module", "mime_module", "log_config_module", "php_module")
+    DEPENDS = {
+        "auth_basic_module": ("authn_core_module",),
+        "auth_digest_module": ("authn_core_module",),
+        "proxy_http_module": ("proxy_module",),
+        "proxy_fcgi_module": ("proxy_module",),
+        "proxy_wstunnel_module": ("proxy_module",),
+        "proxy_html_module": ("proxy_module", "xml2enc_module"),
+        "proxy_balancer_module": ("proxy_module", "lbmethod_byrequests_module", "slotmem_shm_module"),
+    }
+    SKIP_DIRS = {".git", "node_modules"}
+
+    def __init__(self, config: ApacheConfig):
+        self.config = config
+
+    # -------------------------
+    # Public operations
+    # -------------------------
+    def analyze(self) -> dict:
+        """{loaded, used, keep, drop, missing}: module -> LoadModule node / directives using it."""
+        tree = self.config.parse()
+        loaded = {node.args[0]: node for node in tree.find("LoadModule") if node.args}
+        used: Dict[str, List[ConfigNode]] = defaultdict(list)
+        self._collect(tree, frozenset(), used)
+        for htaccess in self._htaccess_files(tree):
+            for node in ApacheConfig(htaccess, self.config.server_root).parse().walk(active_only=False):
+                for module in ApacheModules.requires(node.name, node.args):
+                    used[module].append(node)
+
+        needed = set(used) | set(self.ALWAYS)
+        pending = list(needed)
+        while pending:
+            for dependency in self.DEPENDS.get(pending.pop(), ()):
+                if dependency not in needed:
+                    needed.add(dependency)
+                    pending.append(dependency)
+
+        keep = sorted(m for m in loaded if m in needed or not ApacheModules.known(m))
+        return {
+            "loaded": loaded,
+            "used": used,
+            "keep": keep,
+            "drop": sorted(m for m in loaded if m not in keep),
+            "missing": sorted(m for m in used if m not in loaded and m not in ApacheConfig.STATIC_MODULES),
+        }
+
+    def report(self, result: dict):
+        for module in result["keep"]:
+            reasons = result["used"].get(module)
+            reason = f"{reasons[0].name} ({reasons[0].file}:{reasons[0].line})" if reasons else (
+                "baseline" if module in self.ALWAYS or module in self._dependencies(result) else "unknown module, kept"
+            )
+            print(Fore.GREEN + f"  keep     {module:<28}" + Fore.WHITE + f" {reason}")
+        for module in result["drop"]:
+            print(Fore.YELLOW + f"  drop     {module:<28}" + Fore.WHITE + " no directive in use needs it")
+        for module in result["missing"]:
+            node = result["used"][module][0]
+            print(Fore.RED + f"  missing  {module:<28}" + Fore.WHITE + f" {node.name} ({node.file}:{node.line})")
+
+        print(Fore.CYAN + "\nMinimal LoadModule list:")
+        for module in result["keep"]:
+            print(f"LoadModule {module} {result['loaded'][module].args[1]}")
+        print(
+            Fore.CYAN + f"\n{len(result['keep'])} of {len(result['loaded'])} modules needed, "
+                        f"{len(result['drop'])} can be dropped"
+        )
+
+    def apply(self, result: dict) -> List[str]:
+        """Comment out the LoadModule lines of the dropped modules; returns the files rewritten."""
+        lines_by_file = defaultdict(set)
+        for module in result["drop"]:
+            node = result["loaded"][module]
+            lines_by_file[node.file].add(node.line)
+
+        written = []
+        for path, numbers in lines_by_file.items():
+            with open(path, "r", encoding="utf-8", newline="") as f:
+                lines = f.read().splitlines(keepends=True)
+            for number in numbers:
+                line = lines[number - 1]
+                if line.lstrip().startswith("LoadModule"):
+                    indent = line[:len(line) - len(line.lstrip())]
+                    lines[number - 1] = f"{indent}#{line.lstrip()}"
+            TemplateEngine.write_atomic(path, "".join(lines))
+            written.append(path)
+        return written
+
+    # -------------------------
+    # Utilities
+    # -------------------------
+    def _collect(self, node: ConfigNode, guards: frozenset, used: dict):
+        for child in node.children:
+            if not child.active:
+                continue
+            if child.key == "ifmodule" and child.args and not child.args[0].startswith("!"):
+                self._collect(child, guards | {ApacheConfig.module_id(child.args[0])}, used)
+                continue
+            # A directive guarded by its own module is optional as a whole (ScriptAlias in <IfModule alias_module>)
+            if ApacheModules.provider(child.name) not in guards:
+                for module in ApacheModules.requires(child.name, child.args):
+                    used[module].append(child)
+            self._collect(child, guards, used)
+
+    def _htaccess_files(self, tree: ConfigNode):
+        roots = {self.config.resolve(node.args[0]) for node in tree.find("DocumentRoot") if node.args}
+        for root in sorted(roots):
+            for directory, dirs, files in os.walk(root):
+                dirs[:] = [d for d in dirs if d not in self.SKIP_DIRS]
+                if ".htaccess" in files:
+                    yield os.path.join(directory, ".htaccess")
+
+    def _dependencies(self, result: dict) -> set:
+        return {d for module in result["keep"] for d in self.DEPENDS.get(module, ())}
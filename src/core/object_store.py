@@ -0,0 +1,132 @@
+import fnmatch
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+from src.core.install_manifest import InstallManifest
+
+
+class ObjectStore:
+    """
+    Deduplicated store of extracted file contents shared by every installed version.
+
+    Objects are keyed by the SHA-256 of their content, computed while a member is
+    inflated. A member whose content is already stored is hardlinked into the version
+    tree instead of being kept as another copy, so installed patch releases share every
+    file that did not change. CRC32 and size from the zip directory are not used as keys:
+    they are not collision resistant, and two different files sharing an inode would
+    silently replace each other.
+
+    Files the stack rewrites in place (configs, ini files, htdocs) are never linked: a
+    write through one link would change every version sharing the object.
+    """
+
+    MUTABLE = ("*.conf", "*.ini", "*.htaccess", "*/htdocs/*")
+    BUFFER_SIZE = 1024 * 1024
+    # Staged writes older than this are leftovers of an interrupted run, not in flight
+    STALE_SECONDS = 3600
+
+    def __init__(self, root):
+        self.root = Path(root)
+
+    # -------------------------
+    # Public operations
+    # -------------------------
+    def path_for(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+
+    @classmethod
+    def is_mutable(cls, name: str) -> bool:
+        return any(fnmatch.fnmatch(name, pattern) for pattern in cls.MUTABLE)
+
+    def extract(self, zip_ref: zipfile.ZipFile, info: zipfile.ZipInfo, target_dir: str) -> str:
+        """Place one member in target_dir: a hardlink into the store, or a private copy for mutable files."""
+        dest = InstallManifest.member_path(target_dir, info.filename)
+        if info.is_dir():
+            os.makedirs(dest, exist_ok=True)
+            return dest
+        if self.is_mutable(info.filename):
+            return zip_ref.extract(info, target_dir)
+
+        staged = self.staging_path()
+        digest = hashlib.sha256()
+        with zip_ref.open(info) as src, open(staged, "wb") as dst:
+            while True:
+                chunk = src.read(self.BUFFER_SIZE)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                dst.write(chunk)
+        return self.publish(staged, digest.hexdigest(), info, target_dir)
+
+    def staging_path(self) -> Path:
+        """Unique temporary file (parallel workers may stage at once) to write content to before publish()."""
+        folder = self.root / "tmp"
+        folder.mkdir(parents=True, exist_ok=True)
+        fd, path = tempfile.mkstemp(suffix=".tmp", dir=folder)
+        os.close(fd)
+        return Path(path)
+
+    def publish(self, staged, digest: str, info: zipfile.ZipInfo, target_dir: str) -> str:
+        """Store fully written content under its SHA-256 (unless already there) and link it into target_dir."""
+        obj = self.path_for(digest)
+        dest = InstallManifest.member_path(target_dir, info.filename)
+        # A damaged file being repaired may be a link to the object itself: then the object is damaged too
+        damaged = os.path.lexists(dest) and obj.exists() and os.path.samefile(dest, obj)
+        if self._valid(obj, info.file_size) and not damaged:
+            os.remove(staged)
+        else:
+            obj.parent.mkdir(parents=True, exist_ok=True)
+            if obj.exists():
+                os.remove(obj)
+            # A rename when staged on the store's volume, a copy when staged elsewhere
+            shutil.move(staged, obj)
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        self._link(obj, dest)
+        return dest
+
+    def gc(self) -> int:
+        """
+        Drop objects no version links to any more (and interrupted writes). Only call it once
+        no extraction is running: between publishing an object and linking it, it has no link.
+        """
+        removed = 0
+        if not self.root.is_dir():
+            return removed
+        for path in self.root.glob("*/*"):
+            try:
+                stat = path.stat()
+                if path.name.endswith(".tmp"):
+                    stale = time.time() - stat.st_mtime > self.STALE_SECONDS
+                else:
+                    stale = stat.st_nlink <= 1
+                if stale:
+                    path.unlink()
+                    removed += 1
+            except OSError:
+                pass
+        return removed
+
+    # -------------------------
+    # Utilities
+    # -------------------------
+    @staticmethod
+    def _valid(obj: Path, size: int) -> bool:
+        try:
+            return obj.stat().st_size == size
+        except OSError:
+            return False
+
+    @staticmethod
+    def _link(obj: Path, dest: str):
+        if os.path.lexists(dest):
+            os.remove(dest)
+        try:
+            os.link(obj, dest)
+        except OSError:
+            # File systems without hardlinks (FAT32, some network shares) get a plain copy
+            shutil.copyfile(obj, dest)
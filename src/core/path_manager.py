@@ -17,6 +17,8 @@ class PathManager:
             Constants.KEY_ROOT: self._project_root,
             "prerequisite": self._project_root / "src" / "prerequisite",
             "templates": self._project_root / "src" / "includes" / "templates",
+            "binary": self._project_root / "src" / "binary",
+            "cache": self._project_root / "src" / "cache",
         }
 
         # --- Deployment structure ---
@@ -40,15 +42,24 @@ class PathManager:
         self._structure = {
             Constants.KEY_ROOT: self._deployment_root,
             Constants.DIR_BIN: self._deployment_root / Constants.DIR_BIN,
+            # Deduplicated file contents hardlinked into every installed version
+            "objects": self._deployment_root / Constants.DIR_BIN / ".objects",
             Constants.DIR_TEMP: self._deployment_root / Constants.DIR_TEMP,
             Constants.DIR_WWW: self._deployment_root / Constants.DIR_WWW,
             Constants.DIR_COMMAND: self._deployment_root / Constants.DIR_COMMAND,
+            # Per-vhost PHP setting overrides (vhost:ini)
+            "ini_overlays": self._deployment_root / "ini",
+            # opcache.preload scripts generated per project
+            "preload": self._deployment_root / "preload",
 
             # Apache related
             "apache_root": apache_root,
             "httpd_exe": apache_root / "bin" / "httpd.exe",
             "httpd_conf": apache_root / "conf" / "httpd.conf",
             "httpd_vhost_conf": apache_root / "conf" / "extra" / "httpd-vhosts.conf",
+            # One <hostname>.conf per virtual host, included from httpd-vhosts.conf
+            "httpd_vhosts_dir": apache_root / "conf" / "vhosts.d",
+            "httpd_tuning_conf": apache_root / "conf" / "extra" / "httpd-tuning.conf",
 
             # PHP related
             "php_root": php_root,
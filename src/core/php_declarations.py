@@ -0,0 +1,114 @@
+import re
+from typing import Dict, List
+
+
+class PhpDeclarations:
+    """
+    Lightweight scanner for the classes, interfaces, traits and enums a PHP file declares.
+
+    It is not a PHP parser: comments and string literals are blanked out, then a single
+    regex pass tracks namespaces, `use` imports and braces. That is enough to resolve
+    what each declaration extends, implements or uses to fully qualified names, which is
+    all a preload order needs.
+    """
+
+    NOISE = re.compile(
+        r"/\*.*?\*/|//[^\n]*|#(?!\[)[^\n]*"
+        r"|'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\""
+        r"|<<<[ \t]*['\"]?(\w+)['\"]?\r?\n.*?\n[ \t]*\1\b",
+        re.DOTALL,
+    )
+    TOKENS = re.compile(
+        r"(?P<namespace>\bnamespace\s+(?P<ns>[\w\\]+)\s*(?P<nsopen>\{|;))"
+        r"|(?P<use>\buse\s+(?!\()(?P<names>(?:\\\{[^}]*\}|[^;{])+?)\s*(?P<useend>;|\{))"
+        r"|(?P<decl>(?<!::)(?<!->)\b(?P<kind>class|interface|trait|enum)\s+(?!extends\b|implements\b)(?P<name>\w+)"
+        r"(?:\s*:\s*[\w\\]+)?(?P<heritage>[^{;]*)\{)"
+        r"|(?P<open>\{)|(?P<close>\})",
+        re.IGNORECASE,
+    )
+    HERITAGE = re.compile(r"\b(extends|implements)\s+([\w\\,\s]+?)(?=\s+(?:extends|implements)\b|\s*$)", re.IGNORECASE)
+
+    # -------------------------
+    # Public operations
+    # -------------------------
+    @classmethod
+    def parse(cls, text: str) -> List[Dict]:
+        """[{name, kind, depends}] for every named declaration, names fully qualified without leading '\\'."""
+        code = cls.NOISE.sub(lambda m: "\n" * m.group(0).count("\n") or " ", text)
+        declarations = []
+        namespace, imports = "", {}
+        # One entry per open brace: 'namespace', a declaration dict, or None for any other block
+        stack = []
+
+        for match in cls.TOKENS.finditer(code):
+            if match.group("namespace"):
+                namespace, imports = match.group("ns").strip("\\"), {}
+                if match.group("nsopen") == "{":
+                    stack.append("namespace")
+            elif match.group("use"):
+                owner = next((entry for entry in reversed(stack) if entry is not None), None)
+                names = [n.strip() for n in match.group("names").split(",")]
+                if isinstance(owner, dict):
+                    # use Trait1, Trait2; inside a class body
+                    owner["depends"].extend(cls.resolve(n, namespace, imports) for n in names if n)
+                elif not any(entry is None for entry in stack):
+                    imports.update(cls._imports(match.group("names")))
+                if match.group("useend") == "{":
+                    stack.append(None)
+            elif match.group("decl"):
+                declaration = {
+                    "name": cls.resolve(match.group("name"), namespace, {}, declare=True),
+                    "kind": match.group("kind").lower(),
+                    "depends": [],
+                }
+                for _, names in cls.HERITAGE.findall(match.group("heritage")):
+                    declaration["depends"].extend(
+                        cls.resolve(n.strip(), namespace, imports) for n in names.split(",") if n.strip()
+                    )
+                declarations.append(declaration)
+                stack.append(declaration)
+            elif match.group("open"):
+                stack.append(None)
+            elif match.group("close") and stack:
+                if stack.pop() == "namespace":
+                    namespace, imports = "", {}
+        return declarations
+
+    @staticmethod
+    def resolve(name: str, namespace: str, imports: dict, declare: bool = False) -> str:
+        """PHP name resolution for class references (and declarations when declare is set)."""
+        if name.startswith("\\"):
+            return name.lstrip("\\")
+        if name.lower().startswith("namespace\\"):
+            name = name[len("namespace\\"):]
+        elif not declare:
+            first, _, rest = name.partition("\\")
+            if first.lower() in imports:
+                return imports[first.lower()] + ("\\" + rest if rest else "")
+        return f"{namespace}\\{name}" if namespace else name
+
+    # -------------------------
+    # Utilities
+    # -------------------------
+    @staticmethod
+    def _imports(statement: str) -> dict:
+        """{alias (lower case): fully qualified name} from the body of a `use` statement."""
+        statement = statement.strip()
+        if re.match(r"(function|const)\s", statement, re.IGNORECASE):
+            return {}
+        group = re.fullmatch(r"([\w\\]+)\\\{(.*)\}", statement, re.DOTALL)
+        if group:
+            # use Prefix\{A, B as C}
+            parts = [f"{group.group(1)}\\{part.strip()}" for part in group.group(2).split(",") if part.strip()]
+        else:
+            parts = statement.split(",")
+        imports = {}
+        for part in parts:
+            part = part.strip()
+            match = re.fullmatch(r"([\w\\]+?)(?:\s+as\s+(\w+))?", part, re.IGNORECASE)
+            if not match:
+                continue
+            name = match.group(1).strip("\\")
+            alias = match.group(2) or name.rsplit("\\", 1)[-1]
+            imports[alias.lower()] = name
+        return imports
@@ -0,0 +1,70 @@
+import math
+
+import psutil
+
+
+class PhpTuning:
+    """
+    OPcache and realpath cache sizes for the PHP code actually being served.
+
+    Input is a ProjectScanner result. Every value is rounded to a coarse step (OPcache's
+    own prime table, 32 MB, powers of two) so ordinary project growth does not change
+    php.ini, and with it force an Apache restart, on every update.
+    """
+
+    # opcache.max_accelerated_files is rounded up to one of these internally
+    ACCELERATED_FILES_STEPS = (3907, 7963, 16229, 32531, 65407, 130987, 262237, 524521, 1048793)
+    # Shared memory per byte of PHP source (opcodes, class tables, literals)
+    MEMORY_PER_SOURCE_BYTE = 3
+    BASE_MEMORY_MB = 64
+    MB = 1024 * 1024
+
+    def __init__(self, scan: dict, memory_mb: int = None):
+        self.files = scan.get("files", 0)
+        self.bytes = scan.get("bytes", 0)
+        self.dirs = scan.get("dirs", 0)
+        self.memory_mb = memory_mb or psutil.virtual_memory().total // self.MB
+
+    # -------------------------
+    # Public operations
+    # -------------------------
+    def max_accelerated_files(self) -> int:
+        # Half again as many slots as files: vendor updates and new code need room
+        wanted = int(self.files * 1.5)
+        return next((step for step in self.ACCELERATED_FILES_STEPS if step >= wanted), self.ACCELERATED_FILES_STEPS[-1])
+
+    def memory_consumption(self) -> int:
+        """MB of shared memory, capped at an eighth of the RAM."""
+        wanted = self.BASE_MEMORY_MB + self.bytes * self.MEMORY_PER_SOURCE_BYTE / self.MB
+        cap = max(128, self.memory_mb // 8)
+        return min(32 * math.ceil(wanted / 32), cap)
+
+    def interned_strings_buffer(self) -> int:
+        """MB for interned strings (class, function and constant names): 8 per 4000 files."""
+        return min(64, 8 * max(1, math.ceil(self.files / 4000)))
+
+    def jit_buffer_size(self) -> int:
+        """MB for JIT-compiled code, a quarter of the opcode cache."""
+        return self._power_of_two(max(32, min(256, self.memory_consumption() // 4)))
+
+    def realpath_cache_size(self) -> int:
+        """KB for resolved paths, ~256 bytes per file and directory, never below PHP's 4096K default."""
+        wanted = (self.files + self.dirs) * 256 // 1024
+        return self._power_of_two(max(4096, min(65536, wanted)))
+
+    def tokens(self) -> dict:
+        return {
+            "OPCACHE_MEMORY_CONSUMPTION": self.memory_consumption(),
+            "OPCACHE_INTERNED_STRINGS_BUFFER": self.interned_strings_buffer(),
+            "OPCACHE_MAX_ACCELERATED_FILES": self.max_accelerated_files(),
+            "OPCACHE_JIT_BUFFER_SIZE": f"{self.jit_buffer_size()}M",
+            "REALPATH_CACHE_SIZE": f"{self.realpath_cache_size()}K",
+            "REALPATH_CACHE_TTL": 600,
+        }
+
+    # -------------------------
+    # Utilities
+    # -------------------------
+    @staticmethod
+    def _power_of_two(value: int) -> int:
+        return 1 << max(0, math.ceil(math.log2(value)))
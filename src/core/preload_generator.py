@@ -0,0 +1,219 @@
+import fnmatch
+import heapq
+import os
+import re
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from src.core.path_manager import PathManager
+from src.core.php_declarations import PhpDeclarations
+from src.core.template_engine import TemplateEngine
+
+
+class PreloadGenerator:
+    """
+    Builds an opcache.preload script for one PHP project.
+
+    Class files come from Composer's classmap when the project has one (vendor is not
+    walked then) plus the project's own sources. Each file's declarations are scanned
+    with PhpDeclarations, and the files are ordered so every parent class, interface
+    and trait is compiled before its users. The script uses opcache_compile_file(), so
+    nothing is executed at server start.
+
+    Classes whose ancestry cannot be resolved are left out: preloading them would only
+    produce "Can't preload unlinked class" warnings.
+    """
+
+    CLASSMAP = os.path.join("vendor", "composer", "autoload_classmap.php")
+    CLASSMAP_ENTRY = re.compile(r"'((?:[^'\\]|\\.)+)'\s*=>\s*\$(vendorDir|baseDir)\s*\.\s*'([^']+)'")
+    SKIP_DIRS = {".git", "node_modules", "tests", "Tests", "test", "storage", "var", "cache"}
+    # Polyfills redeclare built-in classes for older PHP versions
+    EXCLUDE = ("*/Resources/stubs/*", "*/symfony/polyfill-*")
+    ACTIVE_SCRIPT = "preload.php"
+
+    def __init__(self, project_root: str, namespaces: Optional[Iterable[str]] = None):
+        self.project_root = os.path.abspath(project_root)
+        self.namespaces = [n.strip("\\").lower() + "\\" for n in (namespaces or []) if n.strip("\\")]
+
+    # -------------------------
+    # Public operations
+    # -------------------------
+    def generate(self) -> Dict:
+        """{files: [path in compile order], classes: count, skipped: {class: unresolved dependency}}"""
+        declared, by_file = self._declarations()
+        skipped = self._unresolvable(declared, by_file)
+
+        broken = {name.lower() for name in skipped}
+        wanted = [name for name in declared if name not in broken and self._selected(name)]
+        # Everything a wanted class inherits from has to be compiled first, selected or not
+        needed, pending = set(), list(wanted)
+        while pending:
+            name = pending.pop()
+            if name in needed:
+                continue
+            needed.add(name)
+            pending.extend(d.lower() for d in declared[name]["depends"] if d.lower() in declared)
+
+        files = {declared[name]["file"] for name in needed}
+        requires = defaultdict(set)
+        for name in needed:
+            for dependency in declared[name]["depends"]:
+                source = declared.get(dependency.lower(), {}).get("file")
+                if source and source != declared[name]["file"]:
+                    requires[declared[name]["file"]].add(source)
+        return {"files": self._order(files, requires), "classes": len(needed), "skipped": skipped}
+
+    def write(self, target: str, result: Dict) -> bool:
+        lines = [
+            "<?php",
+            f"// opcache.preload script for {self.project_root.replace(os.sep, '/')}",
+            f"// {len(result['files'])} files, {result['classes']} classes in dependency order.",
+            "// Regenerate after composer install/update. Generated by WinAPDev, do not edit.",
+            "foreach ([",
+            *[f"    {self._php_string(path)}," for path in result["files"]],
+            "] as $file) {",
+            "    opcache_compile_file($file);",
+            "}",
+            "",
+        ]
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        return TemplateEngine.write_if_changed(target, "\n".join(lines))
+
+    @classmethod
+    def activate(cls, script: str) -> str:
+        """Point the server-wide preload entry (opcache.preload is per server, not per vhost) at script."""
+        active = os.path.join(os.path.dirname(script), cls.ACTIVE_SCRIPT)
+        target = cls._php_string("/" + os.path.basename(script))
+        TemplateEngine.write_if_changed(active, f"<?php\nrequire __DIR__ . {target};\n")
+        return active
+
+    @classmethod
+    def active_script(cls) -> str:
+        """Value for the opcache.preload token: the active script, or empty where PHP cannot preload."""
+        path = os.path.join(PathManager().deploy_structure("preload"), cls.ACTIVE_SCRIPT)
+        return path if cls.supported() and os.path.exists(path) else ""
+
+    @staticmethod
+    def supported() -> bool:
+        # PHP refuses opcache.preload on Windows
+        return os.name != "nt"
+
+    @staticmethod
+    def project_root_of(document_root: str) -> str:
+        """Nearest directory holding composer.json, looking a few levels above a public/ or web/ root."""
+        path = Path(document_root).resolve()
+        for candidate in [path, *list(path.parents)[:3]]:
+            if (candidate / "composer.json").exists():
+                return str(candidate)
+        return str(path)
+
+    # -------------------------
+    # Utilities
+    # -------------------------
+    def _declarations(self):
+        """{class (lower case): {name, kind, depends, file}} and {file: [class, ...]}."""
+        declared, by_file = {}, defaultdict(list)
+        classmap = self._classmap()
+        for path in sorted(set(classmap.values()) | set(self._own_sources())):
+            if any(fnmatch.fnmatch(path.replace(os.sep, "/"), pattern) for pattern in self.EXCLUDE):
+                continue
+            try:
+                with open(path, "r", encoding="utf-8", errors="replace") as f:
+                    declarations = PhpDeclarations.parse(f.read())
+            except OSError:
+                continue
+            for declaration in declarations:
+                key = declaration["name"].lower()
+                # Composer decides which file provides a class that is declared more than once
+                owner = classmap.get(key)
+                if key in declared or (owner and owner != path):
+                    by_file[path].append(None)  # file redeclares a class: never compile it
+                    continue
+                declared[key] = dict(declaration, file=path)
+                by_file[path].append(key)
+        return declared, by_file
+
+    def _unresolvable(self, declared: dict, by_file: dict) -> Dict[str, str]:
+        """Classes that cannot be linked at preload time, with the dependency that breaks them."""
+        skipped = {}
+        for path, names in by_file.items():
+            if None in names:
+                skipped.update({name: "declared elsewhere too" for name in names if name})
+        changed = True
+        while changed:
+            changed = False
+            for name, declaration in declared.items():
+                if name in skipped:
+                    continue
+                for dependency in declaration["depends"]:
+                    key = dependency.lower()
+                    # Unqualified unknown names are PHP's own (Countable, Stringable, ...)
+                    missing = key not in declared and "\\" in key
+                    if missing or key in skipped:
+                        skipped[name] = dependency
+                        break
+                else:
+                    # A file is compiled as a whole, so one broken class excludes its neighbours
+                    broken = next((n for n in by_file[declaration["file"]] if n in skipped), None)
+                    if broken is None:
+                        continue
+                    skipped[name] = f"shares a file with {declared[broken]['name']}"
+                changed = True
+        return {declared[name]["name"]: reason for name, reason in skipped.items()}
+
+    def _selected(self, name: str) -> bool:
+        return not self.namespaces or any(name.startswith(prefix) for prefix in self.namespaces)
+
+    def _classmap(self) -> Dict[str, str]:
+        path = os.path.join(self.project_root, self.CLASSMAP)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                text = f.read()
+        except OSError:
+            return {}
+        vendor = os.path.join(self.project_root, "vendor")
+        classmap = {}
+        for name, base, relative in self.CLASSMAP_ENTRY.findall(text):
+            root = vendor if base == "vendorDir" else self.project_root
+            file = os.path.normpath(root + relative)
+            if os.path.isfile(file):
+                classmap[name.replace("\\\\", "\\").lower()] = file
+        return classmap
+
+    def _own_sources(self) -> List[str]:
+        """PHP files of the project itself (vendor comes from the classmap when there is one)."""
+        skip = set(self.SKIP_DIRS)
+        if os.path.exists(os.path.join(self.project_root, self.CLASSMAP)):
+            skip.add("vendor")
+        sources = []
+        for directory, dirs, files in os.walk(self.project_root):
+            dirs[:] = [d for d in dirs if d not in skip]
+            sources.extend(os.path.join(directory, f) for f in files if f.endswith(".php"))
+        return sources
+
+    @staticmethod
+    def _order(files: set, requires: dict) -> List[str]:
+        """Topological order (Kahn), alphabetical among equals; files in a cycle go last."""
+        remaining = {f: {r for r in requires.get(f, ()) if r in files} for f in files}
+        users = defaultdict(set)
+        for file, deps in remaining.items():
+            for dep in deps:
+                users[dep].add(file)
+        ready = [f for f, deps in remaining.items() if not deps]
+        heapq.heapify(ready)
+        ordered = []
+        while ready:
+            file = heapq.heappop(ready)
+            ordered.append(file)
+            for user in users[file]:
+                remaining[user].discard(file)
+                if not remaining[user]:
+                    heapq.heappush(ready, user)
+        placed = set(ordered)
+        return ordered + sorted(f for f in files if f not in placed)
+
+    @staticmethod
+    def _php_string(value: str) -> str:
+        value = value.replace(os.sep, "/").replace("\\", "\\\\").replace("'", "\\'")
+        return f"'{value}'"
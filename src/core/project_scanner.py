@@ -0,0 +1,118 @@
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Iterable
+
+from src.core.path_manager import PathManager
+
+
+class ProjectScanner:
+    """
+    Counts the PHP files (and their bytes) under a set of document roots.
+
+    Directories are listed in parallel by a thread pool. Per-directory results are kept
+    in a cache keyed by the directory's mtime, which changes whenever an entry is added,
+    removed or renamed in it; an unchanged directory costs one stat on the next scan
+    instead of a full listing. Sizes of files edited in place are refreshed the next
+    time their directory changes.
+    """
+
+    FILE_NAME = ".winapdev-scan.json"
+    PHP_EXTENSIONS = (".php", ".phtml", ".inc")
+    SKIP_DIRS = {".git", ".svn", ".idea", "node_modules"}
+
+    def __init__(self, roots: Iterable[str], cache_path=None, workers: int = None):
+        self.roots = sorted({os.path.normpath(str(root)) for root in roots})
+        self.cache_path = Path(cache_path or PathManager().deploy_root() / self.FILE_NAME)
+        self.workers = workers or min(32, (os.cpu_count() or 1) * 4)
+
+    # -------------------------
+    # Public operations
+    # -------------------------
+    def scan(self) -> dict:
+        """{files, bytes, dirs} over all roots, plus per-root totals under 'roots'."""
+        cache = self._load()
+        entries = {}
+        seen = set(self.roots)
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            pending = {pool.submit(self._scan_dir, root, cache.get(root)) for root in self.roots}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path, entry = future.result()
+                    if entry is None:
+                        continue
+                    entries[path] = entry
+                    for name in entry["subdirs"]:
+                        child = os.path.join(path, name)
+                        if child not in seen:
+                            seen.add(child)
+                            pending.add(pool.submit(self._scan_dir, child, cache.get(child)))
+        self._save(entries)
+
+        totals = {"files": 0, "bytes": 0, "dirs": len(entries), "roots": {}}
+        for root in self.roots:
+            totals["roots"][root] = {"files": 0, "bytes": 0}
+        # Nested roots (a vhost inside www) get their own files, the outer root the rest
+        deepest_first = sorted(self.roots, key=len, reverse=True)
+        for path, entry in entries.items():
+            totals["files"] += entry["files"]
+            totals["bytes"] += entry["bytes"]
+            root = next((r for r in deepest_first if path == r or path.startswith(r + os.sep)), None)
+            if root:
+                totals["roots"][root]["files"] += entry["files"]
+                totals["roots"][root]["bytes"] += entry["bytes"]
+        return totals
+
+    # -------------------------
+    # Utilities
+    # -------------------------
+    @classmethod
+    def _scan_dir(cls, path: str, cached: dict = None):
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return path, None
+        if cached and cached.get("mtime") == mtime:
+            return path, cached
+
+        entry = {"mtime": mtime, "files": 0, "bytes": 0, "subdirs": []}
+        try:
+            with os.scandir(path) as it:
+                for item in it:
+                    try:
+                        if item.is_dir(follow_symlinks=False):
+                            if item.name not in cls.SKIP_DIRS:
+                                entry["subdirs"].append(item.name)
+                        elif item.name.lower().endswith(cls.PHP_EXTENSIONS) and item.is_file():
+                            entry["files"] += 1
+                            entry["bytes"] += item.stat().st_size
+                    except OSError:
+                        continue
+        except OSError:
+            return path, None
+        return path, entry
+
+    def _load(self) -> dict:
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, entries: dict):
+        # Keep entries of roots not scanned this time (other vhosts may be scanned separately)
+        merged = {
+            path: entry for path, entry in self._load().items()
+            if not any(path == root or path.startswith(root + os.sep) for root in self.roots)
+        }
+        merged.update(entries)
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_path.with_name(self.cache_path.name + ".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(merged, f, separators=(",", ":"))
+            os.replace(tmp, self.cache_path)
+        except OSError:
+            pass
@@ -0,0 +1,243 @@
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import List, Optional
+
+import requests
+from colorama import Fore
+
+from src.core.console_logger import ConsoleLogger
+from src.core.path_manager import PathManager
+
+
+class ReleaseCatalog:
+    """
+    Locally cached index of available Apache/PHP releases.
+
+    Each upstream release index is fetched once and stored with its ETag/Last-Modified.
+    After the TTL expires it is revalidated with a conditional GET, so an unchanged index
+    costs a 304 and no parsing. Listing and resolution only ever read the local files.
+
+    The versions dev:setup installs stay fixed by the Binaries table (every deployed path
+    is derived from its file names); setup only uses the catalog to pin() the published
+    SHA-256 of those files. Listing and resolve() are informational.
+    """
+
+    TTL = 24 * 60 * 60
+    # A SHA-256 in a published checksum file (a SHA-512 is longer and does not match)
+    SHA256_PATTERN = re.compile(r"(?<![0-9a-fA-F])[0-9a-fA-F]{64}(?![0-9a-fA-F])")
+    PROXIES = {"http": None, "https": None}
+
+    INDEXES = {
+        "php": {
+            "url": "https://windows.php.net/downloads/releases/releases.json",
+            "base": "https://windows.php.net/downloads/releases/",
+            "archive": "https://windows.php.net/downloads/releases/archives/",
+        },
+        "apache": {
+            "url": "https://www.apachelounge.com/download/",
+            "base": "https://www.apachelounge.com",
+        },
+    }
+
+    def __init__(self, root=None, ttl: int = TTL, indexes: dict = None, session: requests.Session = None):
+        self.root = Path(root or Path(PathManager().project_structure("cache")) / "catalog")
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.indexes = indexes or self.INDEXES
+        self.session = session or requests.Session()
+
+    # -------------------------
+    # Public operations
+    # -------------------------
+    def refresh(self, force: bool = False) -> dict:
+        """Revalidate every index older than the TTL. Returns {name: 'fresh'|'not-modified'|'updated'|'failed'}."""
+        status = {}
+        for name, index in self.indexes.items():
+            entry = self._load(name)
+            if entry and not force and time.time() - entry.get("checked", 0) < self.ttl:
+                status[name] = "fresh"
+                continue
+            try:
+                status[name] = self._revalidate(name, index, entry)
+            except Exception as e:
+                ConsoleLogger.warning(f"Could not refresh {name} release index: {e}")
+                status[name] = "failed"
+                continue
+            ConsoleLogger.info(f"{name} release index: {status[name]}")
+        return status
+
+    def releases(self, name: str) -> List[dict]:
+        """Releases of one component from the local cache, newest first."""
+        entry = self._load(name)
+        return entry.get("releases", []) if entry else []
+
+    def resolve(self, name: str, version: str = "") -> Optional[dict]:
+        """Newest cached release whose version equals or starts with `version` (e.g. '8.3' or '8.3.4')."""
+        for release in self.releases(name):
+            if not version or release["version"] == version or release["version"].startswith(version.rstrip(".") + "."):
+                return release
+        return None
+
+    def pin(self, binaries: dict) -> dict:
+        """
+        Fill in the checksum of every binary that has none pinned with the SHA-256 its upstream
+        index publishes for that exact file. Binaries the catalog has no digest for keep None
+        and are downloaded unverified (with a warning).
+        """
+        unpinned = {k: v for k, v in binaries.items() if not v.get("checksum") and k in self.indexes}
+        if not unpinned:
+            return binaries
+        self.refresh()
+        for key, item in unpinned.items():
+            release = next((r for r in self.releases(key) if r["file"] == item.get("file")), None)
+            if release is None:
+                continue
+            try:
+                checksum = release.get("checksum") or self._published_checksum(key, release)
+            except Exception as e:
+                ConsoleLogger.warning(f"Could not fetch the published checksum of {item.get('file')}: {e}")
+                continue
+            if checksum:
+                item["checksum"] = checksum
+                ConsoleLogger.info(f"{item.get('file')}: verifying against the published SHA-256 {checksum}")
+        return binaries
+
+    def list(self, name: str = None):
+        """Print cached releases (refreshing stale indexes first)."""
+        self.refresh()
+        for component in [name] if name else self.indexes:
+            print(Fore.GREEN + f"\n[{component}]")
+            releases = self.releases(component)
+            if not releases:
+                print(Fore.YELLOW + "  No releases cached")
+            for release in releases:
+                print(Fore.CYAN + f"  {release['version']:<12}" + Fore.WHITE + f" {release['file']}")
+
+    # -------------------------
+    # HTTP
+    # -------------------------
+    def _revalidate(self, name: str, index: dict, entry: Optional[dict]) -> str:
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        resp = self.session.get(index["url"], headers=headers, timeout=30, proxies=self.PROXIES)
+        if resp.status_code == 304 and entry:
+            entry["checked"] = time.time()
+            self._save(name, entry)
+            return "not-modified"
+        resp.raise_for_status()
+
+        parser = getattr(self, f"_parse_{name}")
+        self._save(name, {
+            "url": index["url"],
+            "etag": resp.headers.get("etag"),
+            "last_modified": resp.headers.get("last-modified"),
+            "checked": time.time(),
+            "releases": self._sorted(parser(resp.text, index)),
+        })
+        return "updated"
+
+    def _published_checksum(self, name: str, release: dict) -> Optional[str]:
+        """SHA-256 from the release's checksum file, stored in the cached index once fetched."""
+        if not release.get("checksum_url"):
+            return None
+        resp = self.session.get(release["checksum_url"], timeout=30, proxies=self.PROXIES)
+        resp.raise_for_status()
+        match = self.SHA256_PATTERN.search(resp.text)
+        if not match:
+            return None
+        entry = self._load(name)
+        for cached in entry.get("releases", []):
+            if cached["file"] == release["file"]:
+                cached["checksum"] = match.group(0).lower()
+        self._save(name, entry)
+        return match.group(0).lower()
+
+    # -------------------------
+    # Index parsers
+    # -------------------------
+    @staticmethod
+    def _parse_php(text: str, index: dict) -> List[dict]:
+        """windows.php.net releases.json: one entry per branch, thread-safe x64 builds only (mod_php needs TS)."""
+        releases = []
+        for branch in json.loads(text).values():
+            if not isinstance(branch, dict):
+                continue
+            for variant, build in branch.items():
+                if not (variant.startswith("ts-") and variant.endswith("-x64")) or "zip" not in build:
+                    continue
+                path = build["zip"]["path"]
+                releases.append({
+                    "version": branch["version"],
+                    "variant": variant,
+                    "file": path,
+                    "checksum": build["zip"].get("sha256"),
+                    "sources": [index["base"] + path] + ([index["archive"] + path] if index.get("archive") else []),
+                })
+        return releases
+
+    @staticmethod
+    def _parse_apache(text: str, index: dict) -> List[dict]:
+        """
+        Apache Lounge download page: httpd-<version>-<build>-win64-<VS>.zip links. The page only
+        links each zip's checksum file (<zip>.txt); its SHA-256 is fetched when a release is pinned.
+        """
+        pattern = re.compile(
+            r'href="(?P<path>[^"]*/(?P<file>httpd-(?P<version>\d+\.\d+\.\d+)-\d+-[Ww]in64-(?P<vs>VS\d+)\.zip))"'
+        )
+        checksum_links = {
+            match["file"]: match["path"]
+            for match in re.finditer(r'href="(?P<path>[^"]*/(?P<file>httpd-[^"/]+\.zip)\.(?:txt|sha256))"', text)
+        }
+        releases, seen = [], set()
+        for match in pattern.finditer(text):
+            if match["file"] in seen:
+                continue
+            seen.add(match["file"])
+            path = match["path"]
+            checksum_path = checksum_links.get(match["file"])
+            releases.append({
+                "version": match["version"],
+                "variant": match["vs"],
+                "file": match["file"],
+                "checksum": None,
+                "checksum_url": ReleaseCatalog._absolute(checksum_path, index) if checksum_path else None,
+                "sources": [ReleaseCatalog._absolute(path, index)],
+            })
+        return releases
+
+    # -------------------------
+    # Utilities
+    # -------------------------
+    @staticmethod
+    def _sorted(releases: List[dict]) -> List[dict]:
+        def key(release: dict) -> tuple:
+            return tuple(int(p) for p in release["version"].split(".") if p.isdigit()), release["variant"]
+
+        return sorted(releases, key=key, reverse=True)
+
+    @staticmethod
+    def _absolute(path: str, index: dict) -> str:
+        return path if path.startswith("http") else index["base"] + path
+
+    def _path(self, name: str) -> Path:
+        return self.root / f"{name}.json"
+
+    def _load(self, name: str) -> Optional[dict]:
+        try:
+            with open(self._path(name), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save(self, name: str, entry: dict):
+        tmp = self._path(name).with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(entry, f, indent=2)
+        os.replace(tmp, self._path(name))
@@ -0,0 +1,226 @@
+import fnmatch
+import io
+import os
+import re
+import zipfile
+from typing import Iterable, List, Optional
+
+import requests
+from colorama import Fore
+
+from src.core.install_manifest import InstallManifest
+from src.core.object_store import ObjectStore
+
+
+class _HttpRangeFile(io.RawIOBase):
+    """
+    Read-only, seekable view of a remote file backed by HTTP Range requests.
+
+    The archive tail (end-of-central-directory + central directory) is fetched once up front
+    and kept; spans reaching into it are cut at its start, so no byte is transferred twice.
+    Member data is fetched one planned span at a time, so zipfile's many small reads
+    turn into a handful of requests.
+    """
+
+    TAIL_SIZE = 256 * 1024
+    BLOCK_SIZE = 64 * 1024
+    MAX_SPAN = 8 * 1024 * 1024  # upper bound of bytes buffered in memory at once
+
+    def __init__(self, url: str, session: requests.Session, proxies: dict):
+        super().__init__()
+        self.url = url
+        self.session = session
+        self.proxies = proxies
+        self.position = 0
+        self.spans: List[tuple] = []
+        self.requests = 0
+        self.transferred = 0
+
+        tail_start, tail = self._fetch_tail()
+        self.tail_start = tail_start
+        self.tail = tail
+        self.buffer_start, self.buffer = tail_start, tail
+
+    # -------------------------
+    # HTTP
+    # -------------------------
+    def _get(self, headers: dict) -> requests.Response:
+        resp = self.session.get(self.url, headers=headers, timeout=60, proxies=self.proxies)
+        resp.raise_for_status()
+        if resp.status_code != 206:
+            raise RuntimeError(f"Server does not support Range requests for {self.url}")
+        self.requests += 1
+        self.transferred += len(resp.content)
+        return resp
+
+    def _fetch_tail(self):
+        resp = self._get({"Range": f"bytes=-{self.TAIL_SIZE}"})
+        match = re.match(r"bytes\s+(\d+)-\d+/(\d+)", resp.headers.get("content-range", ""))
+        if not match:
+            raise RuntimeError(f"Missing Content-Range for {self.url}")
+        self.size = int(match.group(2))
+        return int(match.group(1)), resp.content
+
+    def _fetch(self, start: int, end: int) -> bytes:
+        """Fetch bytes [start, end)."""
+        return self._get({"Range": f"bytes={start}-{end - 1}"}).content
+
+    # -------------------------
+    # Planning
+    # -------------------------
+    def plan(self, spans: Iterable[tuple]):
+        """Register [start, end) regions that will be read, so each is fetched in as few requests as possible."""
+        # The cached tail already holds whatever part of a span falls inside it
+        self.spans = sorted((start, min(end, self.tail_start)) for start, end in spans if start < self.tail_start)
+
+    def _read_ahead_end(self, position: int, n: int) -> int:
+        end = None
+        for start, span_end in self.spans:
+            if start <= position < span_end:
+                end = min(span_end, position + max(n, self.MAX_SPAN))
+                break
+        if end is None:
+            end = min(self.size, position + max(n, self.BLOCK_SIZE))
+        # Only reached below the tail (reads inside it are served from the cache)
+        return min(end, self.tail_start)
+
+    # -------------------------
+    # io.RawIOBase
+    # -------------------------
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self.position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self.position
+        elif whence == io.SEEK_END:
+            offset += self.size
+        self.position = max(0, offset)
+        return self.position
+
+    def read(self, n=-1):
+        if n is None or n < 0:
+            n = self.size - self.position
+        n = min(n, self.size - self.position)
+        if n <= 0:
+            return b""
+
+        out = bytearray()
+        while n:
+            data = self._from_buffer(self.tail_start, self.tail, n) or self._from_buffer(
+                self.buffer_start, self.buffer, n
+            )
+            if not data:
+                end = self._read_ahead_end(self.position, n)
+                self.buffer_start, self.buffer = self.position, self._fetch(self.position, end)
+                continue
+            out += data
+            self.position += len(data)
+            n -= len(data)
+        return bytes(out)
+
+    def _from_buffer(self, start: int, buffer: bytes, n: int) -> bytes:
+        offset = self.position - start
+        if 0 <= offset < len(buffer):
+            return buffer[offset:offset + n]
+        return b""
+
+
+class RemoteZip:
+    """
+    Extract selected members of a zip archive straight from its URL.
+
+    Reads the central directory with a tail Range request, then fetches only the byte
+    ranges of the wanted members (coalescing neighbours) and writes them into the target
+    tree. Each member is still CRC-checked by zipfile while it is written.
+    """
+
+    # Neighbouring members closer than this are fetched in one request
+    MERGE_GAP = 128 * 1024
+    PROXIES = {"http": None, "https": None}
+
+    def __init__(self, url: str, session: Optional[requests.Session] = None):
+        self.url = url
+        self.session = session or requests.Session()
+        self._file = _HttpRangeFile(url, self.session, self.PROXIES)
+        self._zip = zipfile.ZipFile(self._file)
+
+    @property
+    def size(self) -> int:
+        return self._file.size
+
+    @property
+    def transferred(self) -> int:
+        return self._file.transferred
+
+    def infolist(self) -> List[zipfile.ZipInfo]:
+        return self._zip.infolist()
+
+    @staticmethod
+    def matches(name: str, include: Optional[Iterable[str]] = None, exclude: Optional[Iterable[str]] = None) -> bool:
+        """Glob filter on archive member names; includes default to everything."""
+        if include and not any(fnmatch.fnmatch(name, pattern) for pattern in include):
+            return False
+        return not any(fnmatch.fnmatch(name, pattern) for pattern in exclude or [])
+
+    def select(self, include=None, exclude=None) -> List[zipfile.ZipInfo]:
+        return [info for info in self.infolist() if self.matches(info.filename, include, exclude)]
+
+    def _spans(self, members: List[zipfile.ZipInfo]) -> List[tuple]:
+        """
+        Byte regions covering the wanted members. A member's local header and data end
+        where the next entry begins (or where the central directory starts).
+        """
+        offsets = sorted({info.header_offset for info in self.infolist()})
+        boundaries = dict(zip(offsets, offsets[1:] + [self._zip.start_dir]))
+
+        spans = []
+        for info in sorted(members, key=lambda i: i.header_offset):
+            start, end = info.header_offset, boundaries[info.header_offset]
+            if spans and start - spans[-1][1] <= self.MERGE_GAP:
+                spans[-1][1] = max(spans[-1][1], end)
+            else:
+                spans.append([start, end])
+        return [tuple(span) for span in spans]
+
+    def extract(self, target_dir: str, include=None, exclude=None, store: ObjectStore = None) -> List[str]:
+        """
+        Extract matching members into target_dir and return their archive names.
+        Members already intact according to the install manifest are not fetched again.
+        """
+        os.makedirs(target_dir, exist_ok=True)
+        selected = self.select(include, exclude)
+        manifest = InstallManifest(target_dir)
+        manifest.prune(selected)
+        members = manifest.changed(selected)
+        self._file.plan(self._spans(members))
+        for info in sorted(members, key=lambda i: i.header_offset):
+            if store:
+                store.extract(self._zip, info, target_dir)
+            else:
+                self._zip.extract(info, target_dir)
+        manifest.record(selected)
+
+        wanted = sum(info.compress_size for info in members)
+        total = sum(info.compress_size for info in self.infolist())
+        print(
+            Fore.CYAN + f"✔ Done (Remote zip): {len(members)}/{len(self.infolist())} members, "
+                        f"{self.transferred / 1048576:.1f} MB of {self.size / 1048576:.1f} MB transferred "
+                        f"({wanted / max(total, 1):.0%} of compressed data needed)"
+        )
+        return [info.filename for info in members]
+
+    def close(self):
+        self._zip.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
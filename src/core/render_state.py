@@ -0,0 +1,70 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+from src.core.path_manager import PathManager
+
+
+class RenderState:
+    """
+    Fingerprints of every generated config file: a hash of its inputs (template, tokens,
+    vhost set) and of the output last written. When both still match, the file is known
+    to be current without rendering it again, and nothing needs a restart.
+    """
+
+    FILE_NAME = ".winapdev-render.json"
+
+    def __init__(self, path=None):
+        self.path = Path(path or PathManager().deploy_root() / self.FILE_NAME)
+        self._state = self._load()
+
+    # -------------------------
+    # Public operations
+    # -------------------------
+    @staticmethod
+    def fingerprint(*inputs) -> str:
+        payload = json.dumps(inputs, sort_keys=True, default=str, separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def digest(path) -> Optional[str]:
+        try:
+            with open(path, "rb") as f:
+                return hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            return None
+
+    def unchanged(self, target, inputs: str) -> bool:
+        """True when target was generated from these inputs and has not been modified since."""
+        entry = self._state.get(str(target))
+        return bool(entry) and entry["inputs"] == inputs and entry["output"] == self.digest(target)
+
+    def record(self, target, inputs: str):
+        self._state[str(target)] = {"inputs": inputs, "output": self.digest(target)}
+        self._save()
+
+    def refresh(self, target):
+        """Accept a deliberate edit of a generated file as its current output (until its inputs change)."""
+        entry = self._state.get(str(target))
+        if entry:
+            entry["output"] = self.digest(target)
+            self._save()
+
+    # -------------------------
+    # Utilities
+    # -------------------------
+    def _load(self) -> dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._state, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.path)
@@ -3,18 +3,29 @@ from pathlib import Path
 
 from colorama import init, Fore
 
+from src.core.apache_config import ApacheConfig
+from src.core.apache_tuning import ApacheTuning
 from src.core.app_structure import AppStructure
+from src.core.artifact_fetcher import ArtifactFetcher
 from src.core.helper import Helper
+from src.core.install_manifest import InstallManifest
 from src.core.php_env_launcher import PhpEnvLauncher
 from src.core.binaries import Binaries
+from src.core.cli_arguments import Arguments
 from src.core.console_logger import ConsoleLogger
 from src.core.constants import Constants
 from src.core.env_path_manager import EnvPathManager
 from src.core.extractor import Extractor
-from src.core.file_downloader import FileDownloader
+from src.core.mirror_selector import MirrorSelector
+from src.core.module_analyzer import ModuleAnalyzer
+from src.core.object_store import ObjectStore
 from src.core.path_manager import PathManager
 from src.core.prerequisite import Prerequisite
+from src.core.release_catalog import ReleaseCatalog
+from src.core.remote_zip import RemoteZip
+from src.core.render_state import RenderState
 from src.core.service import Service
+from src.core.template_engine import TemplateEngine
 from src.core.templates import Templates
 from src.core.virtual_host import VirtualHost
 
@@ -22,16 +33,26 @@ init(autoreset=True)
 
 
 class Server:
-    def __init__(self):
+    def __init__(self, args: Arguments = None):
         self.path_manager = PathManager()
+        self.args = args or Arguments()
 
     def init(self):
         if os.path.exists(self.path_manager.deploy_root()):
             print(f"{Fore.RED}Error: Server already setup and running")
             exit()
+        self.__profile()
+        ApacheTuning(self.args.get("tuning"))  # reject an unknown preset before downloading anything
+        try:
+            artifacts = self.__acquire_artifacts()
+        except BaseException:
+            # A binary that did finish may have created the deploy root; leave none so setup can be retried
+            if os.path.exists(self.path_manager.deploy_root()):
+                AppStructure(self.path_manager.deploy_root()).delete()
+            raise
         Prerequisite().install()
         AppStructure(self.path_manager.deploy_root()).create()
-        self.__extract_binaries()
+        self.__extract_binaries(artifacts)
 
     def setup(self):
         self.init()
@@ -43,15 +64,61 @@ class Server:
         Helper.open_app("localhost")
 
     def conf(self):
-        Service().stop()
-        self.__configure()
-        Service().install()
-        Service().start()
+        self.__apply(self.__configure(), install=True)
 
     def update(self):
-        Service().stop()
-        self.__configure()
-        Service().start()
+        self.__apply(self.__configure())
+
+    def verify(self):
+        """
+        Check the installed binaries against their install manifests.
+        --deep re-checks every CRC32, --repair re-extracts only the damaged files.
+        """
+        if not os.path.exists(self.path_manager.deploy_root()):
+            print(f"{Fore.RED}Error: Server is not set up yet")
+            return
+        deep = bool(self.args.get("deep", False))
+        damaged = 0
+        for k, v in Binaries().get().items():
+            manifest = InstallManifest(self.__binary_path(k, v))
+            if not manifest.entries:
+                ConsoleLogger.warning(f"{k}: no install manifest in {manifest.target_dir}")
+                damaged += 1
+                continue
+            problems = manifest.verify(deep=deep)
+            if problems:
+                ConsoleLogger.error(f"{k}: {len(problems)} of {len(manifest.entries)} files damaged")
+                manifest.report(problems)
+                damaged += 1
+            else:
+                ConsoleLogger.success(f"{k}: {len(manifest.entries)} files intact")
+
+        if damaged and self.args.get("repair", False):
+            self.__extract_binaries(self.__acquire_artifacts())
+        elif damaged:
+            print(
+                f"{Fore.YELLOW}Run {Fore.CYAN}python run dev:verify --repair{Fore.YELLOW} to restore the damaged files"
+            )
+
+    def modules(self):
+        """
+        Report the LoadModule lines no directive in httpd.conf, its includes or any .htaccess needs.
+        --apply comments them out and restarts Apache; the trim lasts until httpd.conf is rendered again.
+        """
+        conf = self.path_manager.deploy_structure("httpd_conf")
+        if not os.path.exists(conf):
+            print(f"{Fore.RED}Error: Server is not set up yet")
+            return
+        analyzer = ModuleAnalyzer(ApacheConfig(conf, self.path_manager.deploy_structure("apache_root")))
+        result = analyzer.analyze()
+        analyzer.report(result)
+        if not result["drop"] or not self.args.get("apply", False):
+            return
+        state = RenderState()
+        for path in analyzer.apply(result):
+            ConsoleLogger.info(f"Trimmed {path}")
+            state.refresh(path)
+        self.__apply(True)
 
     def clear(self):
         if os.path.exists(self.path_manager.deploy_root()):
@@ -63,27 +130,106 @@ class Server:
                 f"{Fore.RED}Error: {Fore.CYAN}{self.path_manager.deploy_structure(Constants.KEY_ROOT)}{Fore.RED} not found, Either it's not installed yet or already deleted."
             )
 
-    @classmethod
-    def __extract_binaries(cls):
+    def __acquire_artifacts(self) -> dict:
+        """
+        Download every missing binary and prerequisite concurrently; returns {key: local path}.
+        Binary archives are extracted while they stream in (--no-pipeline extracts afterwards).
+        """
+        print(f"{Fore.GREEN}Acquiring artifacts...")
+        prerequisite = Prerequisite()
+        fetcher = ArtifactFetcher(external_tools=bool(self.args.get("external-downloader", False)))
+        # Binaries without a pinned checksum are verified against the digest upstream publishes
+        binaries = ReleaseCatalog().pin(Binaries().get())
+        return fetcher.acquire(
+            binaries, prerequisite.lists, prerequisite.root, fetch_binaries=not self.__partial(),
+            extract_plans=None if self.args.get("no-pipeline", False) else self.__extract_plans(),
+        )
+
+    def __extract_plans(self) -> dict:
+        binaries = Binaries()
+        profile = self.__profile()
+        store = self.__store()
+        plans = {}
+        for k, v in binaries.get().items():
+            include, exclude = binaries.filters(k, profile)
+            plans[k] = {
+                "target_dir": self.__binary_path(k, v),
+                "include": include,
+                "exclude": exclude,
+                "store": ObjectStore(store) if store else None,
+                # Outside the deploy root: a failed download must not leave it behind
+                "staging_dir": os.path.join(self.path_manager.project_structure("cache"), "stream"),
+            }
+        return plans
+
+    def __extract_binaries(self, artifacts: dict):
         print(f"{Fore.GREEN}Extracting binaries...")
-        binary_root = Path(__file__).resolve().parents[1] / "binary"
+        extractor = Extractor(workers=self.args.get("extract-workers"), store=self.__store())
         binaries = Binaries()
+        profile = self.__profile()
+        print(f"{Fore.GREEN}Install profile: {Fore.CYAN}{profile}")
         for k, v in binaries.get().items():
-            source_file = binary_root / v.get("file")
-            target_path = os.path.join(PathManager().deploy_structure(Constants.DIR_BIN), k, Path(source_file).stem)
-            if not os.path.exists(source_file):
-                print(f"Source file not found, attempting to download...")
-                FileDownloader(binary_root).download(v.get("url"))
+            target_path = self.__binary_path(k, v)
+            include, exclude = binaries.filters(k, profile)
+            if k in artifacts:
+                extractor.extract(artifacts[k], target_path, include, exclude)
             else:
-                print(f"Source file found in binary")
+                # --partial: pull only the members of the profile straight from the remote archive
+                source = MirrorSelector().best(v, remote_only=True)
+                print(f"Fetching required members of {v.get('file')} from {source}")
+                with RemoteZip(source) as remote:
+                    remote.extract(target_path, include, exclude, extractor.store)
+            InstallManifest(target_path).tag(profile=profile)
+        # Only once every extraction is done: a concurrent publish briefly leaves an object unlinked
+        if extractor.store:
+            extractor.store.gc()
+
+    def __binary_path(self, key: str, binary: dict) -> str:
+        return os.path.join(self.path_manager.deploy_structure(Constants.DIR_BIN), key, Path(binary.get("file")).stem)
 
-            Extractor().extract(source_file, target_path)
+    def __store(self):
+        return None if self.args.get("no-store", False) else self.path_manager.deploy_structure("objects")
 
-    def __configure(self):
+    def __profile(self) -> str:
+        """--profile, else the profile of the existing install, else full (runtime when fetching partially)."""
+        installed = [
+            InstallManifest(self.__binary_path(k, v)).meta.get("profile") for k, v in Binaries().get().items()
+        ]
+        profile = self.args.get("profile") or next((p for p in installed if p), None) \
+            or ("runtime" if self.__partial() else "full")
+        if profile not in Binaries.PROFILES:
+            raise ValueError(f"Unknown profile '{profile}', expected one of: {', '.join(Binaries.PROFILES)}")
+        return profile
+
+    def __partial(self) -> bool:
+        return bool(self.args.get("partial", False))
+
+    def __configure(self) -> bool:
+        """Bring every generated config up to date; returns True if anything Apache reads changed."""
+        state = RenderState()
         self.__create_server_index_file()
-        Templates().deploy()
-        VirtualHost().add("localhost", 80, self.path_manager.deploy_structure(Constants.DIR_WWW))
-        VirtualHost().add("dev.local", 80, self.path_manager.deploy_structure(Constants.DIR_WWW))
+        changed = Templates(tuning=self.args.get("tuning")).deploy(state)
+
+        # An indexed registry lookup and a compare of one small file per vhost
+        www = self.path_manager.deploy_structure(Constants.DIR_WWW)
+        virtual_host = VirtualHost()
+        for hostname in ("localhost", "dev.local"):
+            changed = virtual_host.ensure(hostname, 80, www) or changed
+        return changed
+
+    def __apply(self, changed: bool, install: bool = False):
+        """Restart Apache only when its configuration changed (or --force is given) and it passes the static check."""
+        check = not self.args.get("no-check", False)
+        if not changed and not self.args.get("force", False):
+            ConsoleLogger.info("Configuration unchanged, Apache keeps running (use --force to restart anyway)")
+            Service().start(check=check)
+            return
+        if check and not Service().check(verbose=False):
+            return
+        Service().stop()
+        if install:
+            Service().install()
+        Service().start(check=False)
 
     def __write_env(self):
         EnvPathManager(system=True).add(self.path_manager.deploy_structure(Constants.DIR_COMMAND))
@@ -94,17 +240,16 @@ class Server:
         ConsoleLogger.info("Command path deleted from system environment variable")
 
     def __create_server_index_file(self):
-        print(f"{Fore.GREEN}Creating server index file...")
-
-        with open(self.path_manager.deploy_structure("index"), "w") as f:
-            f.write("""
+        html = """
                 <html>
                     <body style="padding:20px;font-family: Verdana, Geneva, Tahoma, sans-serif;">
                         <h1 style="text-align:center;color:green">Welcome to AMP Server</h1>
                         <p>Powered By - PatelWorld</p>
                     </body>
                 </html>
-            """)
+            """
+        if TemplateEngine.write_if_changed(self.path_manager.deploy_structure("index"), html):
+            print(f"{Fore.GREEN}Created server index file")
 
     def __write_batch(self):
         command_file = os.path.join(self.path_manager.deploy_structure(Constants.DIR_COMMAND),"php.env.bat")
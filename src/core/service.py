@@ -4,6 +4,7 @@ import subprocess
 import psutil
 from colorama import init, Fore
 
+from src.core.apache_config import ApacheConfig
 from src.core.constants import Constants
 from src.core.helper import Helper
 from src.core.path_manager import PathManager
@@ -31,15 +32,31 @@ class Service:
         self.stop()  # safer than direct call
         self.__service_remove()
 
-    def start(self):
+    def start(self, check: bool = True):
+        if check and not self.check(verbose=False):
+            return
         self.__service_on_off("start")
 
     def stop(self):
         self.__service_on_off("stop")
 
-    def restart(self):
+    def restart(self, check: bool = True):
+        # Validate first so a broken config never takes down a running server
+        if check and not self.check(verbose=False):
+            return
         self.stop()
-        self.start()
+        self.start(check=False)
+
+    def check(self, verbose: bool = True) -> bool:
+        """Statically validate httpd.conf and everything it includes; False when Apache would not start."""
+        conf = self.path_manager.deploy_structure("httpd_conf")
+        if not os.path.exists(conf):
+            print(Fore.RED + f"❌ Apache configuration not found: {conf}")
+            return False
+        ok = ApacheConfig(conf, self.path_manager.deploy_structure("apache_root")).report(verbose=verbose)
+        if not ok and not verbose:
+            print(Fore.YELLOW + "ℹ Service left untouched; fix the errors above (or pass --no-check)")
+        return ok
 
     @staticmethod
     def get(service_name: str):
@@ -0,0 +1,266 @@
+import hashlib
+import os
+import queue
+import shutil
+import struct
+import tempfile
+import threading
+import zipfile
+import zlib
+from typing import List, Optional
+
+from colorama import Fore
+
+from src.core.install_manifest import InstallManifest
+from src.core.object_store import ObjectStore
+from src.core.remote_zip import RemoteZip
+
+
+class _MemberWriter:
+    """Inflates one member's compressed bytes into a temporary file, checks its CRC32 and hashes it."""
+
+    def __init__(self, info: zipfile.ZipInfo, path, chunk_limit: int):
+        self.info = info
+        self.path = path
+        self.chunk_limit = chunk_limit
+        self.crc = 0
+        self.size = 0
+        self.sha256 = hashlib.sha256()
+        self.inflater = zlib.decompressobj(-15) if info.compress_type == zipfile.ZIP_DEFLATED else None
+        self.file = open(path, "wb")
+
+    def write(self, data: bytes):
+        if self.inflater is None:
+            self._emit(data)
+            return
+        # Cap the output per call so a highly compressed chunk cannot balloon in memory
+        while data:
+            self._emit(self.inflater.decompress(data, self.chunk_limit))
+            data = self.inflater.unconsumed_tail
+
+    def close(self):
+        if self.inflater is not None:
+            self._emit(self.inflater.flush())
+        self.file.close()
+        if self.crc != self.info.CRC or self.size != self.info.file_size:
+            raise zipfile.BadZipFile(f"Bad CRC-32 or size for streamed member {self.info.filename}")
+
+    def discard(self):
+        self.file.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def _emit(self, data: bytes):
+        if data:
+            self.crc = zlib.crc32(data, self.crc)
+            self.sha256.update(data)
+            self.size += len(data)
+            self.file.write(data)
+
+
+class StreamingExtractor:
+    """
+    Download sink that extracts a zip while its bytes arrive.
+
+    The member layout comes from the central directory, fetched before the transfer.
+    The downloader feeds the archive body in order; a worker thread inflates each wanted
+    member to disk, so network and disk are busy at the same time. Memory stays bounded
+    by the hand-off queue. Members that cannot be streamed (other compression methods,
+    encrypted) are extracted from the completed file in finish().
+
+    Streamed members are only staged, in a private directory outside the deploy root,
+    until the downloader has verified the whole archive. finish() creates the target and
+    moves them into place; abort() deletes the staging directory, so an unverified archive
+    leaves nothing behind: no target directory, no object and no deploy root that would
+    make the next dev:setup refuse to run.
+    """
+
+    # Chunks buffered between the network and the extraction thread
+    QUEUE_CHUNKS = 16
+    # Largest inflated block produced per decompress call
+    CHUNK_LIMIT = 1024 * 1024
+    LOCAL_HEADER = struct.Struct("<4sHHHHHIIIHH")
+    STREAMABLE = (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED)
+
+    def __init__(self, members: List[zipfile.ZipInfo], target_dir: str, include=None, exclude=None,
+                 store: Optional[ObjectStore] = None, staging_dir: str = None):
+        self.target_dir = target_dir
+        self.store = store
+        self.selected = [info for info in members if RemoteZip.matches(info.filename, include, exclude)]
+        self.manifest = InstallManifest(target_dir)
+
+        todo = self.manifest.changed(self.selected)
+        self.deferred, streamed = [], []
+        for info in todo:
+            if info.is_dir():
+                continue
+            if info.compress_type in self.STREAMABLE and not info.flag_bits & 0x1:
+                streamed.append(info)
+            else:
+                self.deferred.append(info)
+        self.directories = [info for info in todo if info.is_dir()]
+        self.pending = sorted(streamed, key=lambda i: i.header_offset)
+        # (info, staged path, SHA-256) of every member inflated but not yet placed
+        self.staged = []
+        if staging_dir:
+            os.makedirs(staging_dir, exist_ok=True)
+        self._staging = tempfile.mkdtemp(prefix="winapdev-stream-", dir=staging_dir)
+
+        self._queue = queue.Queue(maxsize=self.QUEUE_CHUNKS)
+        self._error = None
+        self._position = 0
+        self._header = bytearray()
+        self._remaining = 0
+        self._writer = None
+        self.streamed = 0
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    # -------------------------
+    # Sink interface (called by FileDownloader)
+    # -------------------------
+    def feed(self, offset: int, data):
+        """Hand over the archive bytes at offset; blocks while the extraction thread is behind."""
+        if self._error:
+            raise self._error
+        self._queue.put((offset, bytes(data)))
+
+    def finish(self, archive: str):
+        """Called once the archive is verified: place the staged members, extract the rest, record the manifest."""
+        self._stop()
+        try:
+            if self._error:
+                raise self._error
+            if self.pending:
+                raise zipfile.BadZipFile(f"Stream ended before {self.pending[0].filename}")
+            self._place()
+        except BaseException:
+            self._discard_staged()
+            raise
+        for info in self.directories:
+            os.makedirs(InstallManifest.member_path(self.target_dir, info.filename), exist_ok=True)
+        if self.deferred:
+            with zipfile.ZipFile(archive, "r") as zip_ref:
+                for info in self.deferred:
+                    if self.store:
+                        self.store.extract(zip_ref, info, self.target_dir)
+                    else:
+                        zip_ref.extract(info, self.target_dir)
+        self.manifest.prune(self.selected)
+        self.manifest.record(self.selected)
+        print(
+            Fore.CYAN + f"✔ Done (Streamed): {self.streamed} members extracted during download, "
+                        f"{len(self.deferred)} after"
+        )
+
+    def abort(self):
+        """Stop extracting and delete everything staged; nothing reached the target or the object store."""
+        self._stop()
+        if self._writer:
+            self._writer.discard()
+            self._writer = None
+        self._discard_staged()
+
+    # -------------------------
+    # Staging
+    # -------------------------
+    def _place(self):
+        os.makedirs(self.target_dir, exist_ok=True)
+        while self.staged:
+            info, path, digest = self.staged.pop(0)
+            if self.store and not ObjectStore.is_mutable(info.filename):
+                self.store.publish(path, digest, info, self.target_dir)
+            else:
+                dest = InstallManifest.member_path(self.target_dir, info.filename)
+                os.makedirs(os.path.dirname(dest), exist_ok=True)
+                if os.path.lexists(dest):
+                    os.remove(dest)
+                shutil.move(path, dest)
+        shutil.rmtree(self._staging, ignore_errors=True)
+
+    def _discard_staged(self):
+        for _, path, _ in self.staged:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        self.staged = []
+        shutil.rmtree(self._staging, ignore_errors=True)
+
+    # -------------------------
+    # Extraction thread
+    # -------------------------
+    def _stop(self):
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            if self._error:
+                continue  # keep draining so the producer never blocks
+            offset, data = item
+            try:
+                if offset != self._position:
+                    raise IOError(f"Archive stream out of order at {offset}, expected {self._position}")
+                self._consume(memoryview(data))
+            except Exception as e:
+                self._error = e
+                if self._writer:
+                    self._writer.discard()
+                    self._writer = None
+
+    def _consume(self, data: memoryview):
+        while data:
+            if self._writer:
+                take = min(self._remaining, len(data))
+                self._writer.write(data[:take])
+                self._remaining -= take
+                if not self._remaining:
+                    self._complete()
+            elif not self.pending:
+                take = len(data)  # central directory and trailing records
+            elif self._position < self.pending[0].header_offset:
+                take = min(self.pending[0].header_offset - self._position, len(data))
+            else:
+                take = self._read_header(data)
+            self._position += take
+            data = data[take:]
+
+    def _read_header(self, data: memoryview) -> int:
+        """Collect the local file header of the next wanted member; returns the bytes taken."""
+        fixed = self.LOCAL_HEADER.size
+        take = min(fixed + self._variable_length() - len(self._header), len(data))
+        self._header += data[:take]
+        # Once the fixed part is in, the name/extra lengths may extend what is still needed
+        if len(self._header) >= fixed and len(self._header) == fixed + self._variable_length():
+            self._open(self.pending[0])
+        return take
+
+    def _variable_length(self) -> int:
+        """File name + extra field length of the header being collected (0 until known)."""
+        if len(self._header) < self.LOCAL_HEADER.size:
+            return 0
+        return sum(self.LOCAL_HEADER.unpack(self._header[:self.LOCAL_HEADER.size])[9:])
+
+    def _open(self, info: zipfile.ZipInfo):
+        if self._header[:4] != zipfile.stringFileHeader:
+            raise zipfile.BadZipFile(f"Bad local header for {info.filename}")
+        self._header.clear()
+        self._remaining = info.compress_size
+        path = os.path.join(self._staging, f"{len(self.staged)}.part")
+        self._writer = _MemberWriter(info, path, self.CHUNK_LIMIT)
+        if not self._remaining:
+            self._complete()
+
+    def _complete(self):
+        writer, self._writer = self._writer, None
+        writer.close()
+        self.staged.append((writer.info, writer.path, writer.sha256.hexdigest()))
+        self.pending.pop(0)
+        self.streamed += 1
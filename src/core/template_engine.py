@@ -0,0 +1,122 @@
+import os
+import re
+import tempfile
+import threading
+from typing import List, Tuple, Union
+
+
+class TemplateError(ValueError):
+    """A template references a token without a value, or a value has no token."""
+
+
+class TemplateEngine:
+    """
+    Single-pass renderer for the [#TOKEN#] placeholders in config templates.
+
+    A template is scanned once into literal and token segments; the compiled form is cached
+    per path and reused until the file's mtime or size changes. Rendering is one join over
+    the segments, and output files are replaced atomically so a crash never leaves half a config.
+
+    Placeholder forms (same as the historical Helper.replace_tokens):
+      [#NAME#]     replaced by the value as text
+      '[#NAME#]'   quoted form for non-string values (numbers, booleans): the quotes are dropped
+    """
+
+    PATTERN = re.compile(r"'\[#(\w+)#\]'|\[#(\w+)#\]")
+
+    _cache = {}
+    _cache_lock = threading.Lock()
+
+    # -------------------------
+    # Public operations
+    # -------------------------
+    def compile(self, path: str) -> List[Union[str, Tuple[str, bool]]]:
+        """Literal strings and (token, quoted) pairs, from cache when the file is unchanged."""
+        stat = os.stat(path)
+        key = os.path.abspath(path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached and cached[0] == signature:
+                return cached[1]
+
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            segments = self.parse(f.read())
+        with self._cache_lock:
+            self._cache[key] = (signature, segments)
+        return segments
+
+    @classmethod
+    def parse(cls, text: str) -> List[Union[str, Tuple[str, bool]]]:
+        segments, position = [], 0
+        for match in cls.PATTERN.finditer(text):
+            if match.start() > position:
+                segments.append(text[position:match.start()])
+            quoted = match.group(1) is not None
+            segments.append((match.group(1) if quoted else match.group(2), quoted))
+            position = match.end()
+        if position < len(text):
+            segments.append(text[position:])
+        return segments
+
+    def render(self, path: str, tokens: dict) -> str:
+        segments = self.compile(path)
+        used = {segment[0] for segment in segments if isinstance(segment, tuple)}
+        missing = sorted(used - tokens.keys())
+        unknown = sorted(tokens.keys() - used)
+        if missing or unknown:
+            problems = []
+            if missing:
+                problems.append(f"no value for {', '.join(missing)}")
+            if unknown:
+                problems.append(f"no placeholder for {', '.join(unknown)}")
+            raise TemplateError(f"Template {path}: {'; '.join(problems)}")
+
+        return "".join(
+            segment if isinstance(segment, str) else self._format(tokens[segment[0]], segment[1])
+            for segment in segments
+        )
+
+    def render_to(self, path: str, target: str, tokens: dict) -> bool:
+        """Render a template from memory into target; returns False when target already had that content."""
+        return self.write_if_changed(target, self.render(path, tokens))
+
+    @classmethod
+    def write_if_changed(cls, target: str, text: str) -> bool:
+        """Atomically write text to target unless it is byte-identical already. Returns whether it wrote."""
+        try:
+            with open(target, "rb") as f:
+                if f.read() == text.encode("utf-8"):
+                    return False
+        except FileNotFoundError:
+            pass
+        cls.write_atomic(target, text)
+        return True
+
+    @staticmethod
+    def write_atomic(target: str, text: str):
+        """Write to a temporary file next to target, then rename it over target."""
+        directory = os.path.dirname(os.path.abspath(target))
+        fd, tmp = tempfile.mkstemp(prefix=os.path.basename(target) + ".", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, target)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except FileNotFoundError:
+                pass
+            raise
+
+    # -------------------------
+    # Utilities
+    # -------------------------
+    @staticmethod
+    def _format(value, quoted: bool) -> str:
+        # A string in a quoted placeholder keeps its quotes, as a plain text replacement would
+        if quoted and isinstance(value, str):
+            return f"'{value}'"
+        return str(value)
@@ -1,16 +1,27 @@
 import os
-import shutil
 
+from colorama import Fore
+
+from src.core.apache_config import ApacheConfig
+from src.core.apache_tuning import ApacheTuning
 from src.core.constants import Constants
-from src.core.helper import Helper
 from src.core.path_manager import PathManager
+from src.core.php_tuning import PhpTuning
+from src.core.preload_generator import PreloadGenerator
+from src.core.project_scanner import ProjectScanner
+from src.core.render_state import RenderState
+from src.core.template_engine import TemplateEngine
 
 
 class Templates:
-    def __init__(self):
+    def __init__(self, tuning: str = None):
         self.path_manager = PathManager()
         self.source_template = self.path_manager.project_structure('templates')
         self.deployment_structure = self.path_manager.deploy_structure(Constants.DIR_BIN)
+        # An explicit preset wins, then the one the current include was rendered with
+        tuning_conf = self.path_manager.deploy_structure("httpd_tuning_conf")
+        self.tuning = ApacheTuning(tuning or ApacheTuning.installed_preset(tuning_conf))
+        self.php_tuning = PhpTuning(ProjectScanner(self.__document_roots()).scan())
 
         # Example template categories
         self.__lists = {
@@ -27,6 +38,14 @@ class Templates:
                     'PHP_ROOT': self.path_manager.deploy_structure("php_root"),
                 }
             },
+            "apache_tuning": {
+                "name": "Apache tuning Template",
+                "description": "MPM, keep-alive and I/O settings sized for this machine",
+                "file": "httpd-tuning.conf",
+                "source": os.path.join(self.path_manager.project_structure("templates"), "httpd-tuning.conf"),
+                "target": tuning_conf,
+                "tokens": self.tuning.tokens(),
+            },
             "php_ini": {
                 "name": "PHP ini Template",
                 "description": "Base php.ini template",
@@ -36,14 +55,39 @@ class Templates:
                 "tokens": {
                     'DEPLOYMENT_ROOT': str(self.path_manager.deploy_root()),
                     'PHP_ROOT': self.path_manager.deploy_structure('php_root'),
-                    'PHP_TIMEZONE': '"UTC"'
+                    'PHP_TIMEZONE': '"UTC"',
+                    **self.php_tuning.tokens(),
+                    'OPCACHE_PRELOAD': PreloadGenerator.active_script(),
                 }
             },
         }
 
-    def deploy(self):
-        """This will transfer the base template with token to target place then token will be replaced based on current setup"""
+    def deploy(self, state: RenderState = None) -> bool:
+        """
+        Render each base template with the tokens of the current setup and atomically replace its target.
+        Targets whose template and tokens are unchanged, or whose content would be identical, are not written.
+        Returns True if any file changed.
+        """
+        engine = TemplateEngine()
+        state = state or RenderState()
+        changed = False
         for k, v in self.__lists.items():
-            if v.get('source') and v.get('target'):
-                shutil.copy2(v.get('source'), v.get('target'))
-                Helper.replace_tokens(v.get('target'), v.get('tokens'))
+            if not (v.get('source') and v.get('target')):
+                continue
+            inputs = RenderState.fingerprint(RenderState.digest(v.get('source')), v.get('tokens'))
+            if state.unchanged(v.get('target'), inputs):
+                continue
+            if engine.render_to(v.get('source'), v.get('target'), v.get('tokens')):
+                print(Fore.GREEN + f"[RENDERED] {v.get('target')}")
+                changed = True
+            state.record(v.get('target'), inputs)
+        return changed
+
+    def __document_roots(self) -> set:
+        """The www root plus every DocumentRoot the deployed Apache configuration serves."""
+        roots = {self.path_manager.deploy_structure(Constants.DIR_WWW)}
+        conf = self.path_manager.deploy_structure("httpd_conf")
+        if os.path.exists(conf):
+            config = ApacheConfig(conf, self.path_manager.deploy_structure("apache_root"))
+            roots.update(config.resolve(node.args[0]) for node in config.parse().find("DocumentRoot") if node.args)
+        return {root for root in roots if os.path.isdir(root)}
@@ -0,0 +1,122 @@
+import csv
+import json
+import os
+import re
+from typing import Dict, List
+
+from src.core.ini_overlay import IniOverlay
+
+
+class VhostManifest:
+    """
+    JSON or CSV list of virtual hosts for vhost:import / vhost:export.
+
+    Each entry uses the vhost:add option names: hostname, dir, port, ssl, balancer,
+    members, aliases and php. In CSV, list fields are comma separated inside their cell
+    and php is written as key=value pairs (memory_limit=512M,display_errors=On), exactly
+    like on the command line. The format follows the file extension.
+    """
+
+    FIELDS = ("hostname", "dir", "port", "ssl", "balancer", "members", "aliases", "php")
+    HOSTNAME_PATTERN = re.compile(r"^(?!-)[a-z0-9-]{1,63}(?<!-)(\.(?!-)[a-z0-9-]{1,63}(?<!-))*$", re.IGNORECASE)
+    TRUE_VALUES = ("1", "true", "yes", "on")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.format = os.path.splitext(path)[1].lower().lstrip(".")
+        if self.format not in ("json", "csv"):
+            raise ValueError(f"Unsupported manifest format '{self.format}', expected .json or .csv")
+
+    # -------------------------
+    # Public operations
+    # -------------------------
+    def load(self) -> List[Dict]:
+        """Normalised entries: {hostname, dir, port, ssl, balancer, members, aliases, php, line, problems}."""
+        with open(self.path, "r", encoding="utf-8-sig", newline="") as f:
+            if self.format == "csv":
+                rows = [(number, row) for number, row in enumerate(csv.DictReader(f), start=2)]
+            else:
+                data = json.load(f)
+                rows = list(enumerate(data.get("vhosts", []) if isinstance(data, dict) else data, start=1))
+        return [self._normalise(row, number) for number, row in rows]
+
+    def dump(self, entries: List[Dict]):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8", newline="") as f:
+            if self.format == "csv":
+                writer = csv.DictWriter(f, fieldnames=self.FIELDS, extrasaction="ignore")
+                writer.writeheader()
+                for entry in entries:
+                    writer.writerow({
+                        **entry,
+                        "members": ",".join(entry["members"]),
+                        "aliases": ",".join(entry["aliases"]),
+                        "php": ",".join(f"{k}={v}" for k, v in sorted(entry["php"].items())),
+                        "ssl": str(entry["ssl"]).lower(),
+                        "balancer": str(entry["balancer"]).lower(),
+                    })
+            else:
+                json.dump({"vhosts": [{k: entry[k] for k in self.FIELDS} for entry in entries]}, f, indent=2)
+                f.write("\n")
+        os.replace(tmp, self.path)
+
+    @classmethod
+    def validate(cls, entry: Dict) -> List[str]:
+        """Problems of one entry on its own (clashes with other entries are checked by the caller)."""
+        errors = list(entry.get("problems", []))
+        for name in [entry["hostname"], *entry["aliases"]]:
+            if not cls.HOSTNAME_PATTERN.match(name):
+                errors.append(f"invalid hostname '{name}'")
+        if not isinstance(entry["port"], int) or not 0 < entry["port"] < 65536:
+            errors.append(f"invalid port '{entry['port']}'")
+        if entry["balancer"] and not entry["members"]:
+            errors.append("balancer without members")
+        if not entry["balancer"] and not entry["dir"]:
+            errors.append("missing dir")
+        for key in entry["php"]:
+            try:
+                IniOverlay.validate(key)
+            except ValueError as e:
+                errors.append(str(e))
+        return errors
+
+    # -------------------------
+    # Utilities
+    # -------------------------
+    @classmethod
+    def _normalise(cls, row: Dict, line: int) -> Dict:
+        row = {str(k).strip().lower(): v for k, v in row.items() if k is not None} if isinstance(row, dict) else {}
+        port = row.get("port") or 80
+        try:
+            port = int(port)
+        except (TypeError, ValueError):
+            pass
+        php, problems = row.get("php") or {}, []
+        if not isinstance(php, dict):
+            try:
+                php = IniOverlay.parse(php)
+            except ValueError as e:
+                php = {}
+                problems.append(str(e))
+        return {
+            "hostname": str(row.get("hostname") or "").strip(),
+            "dir": str(row.get("dir") or "").strip() or None,
+            "port": port,
+            "ssl": cls._flag(row.get("ssl")),
+            "balancer": cls._flag(row.get("balancer")),
+            "members": cls._list(row.get("members")),
+            "aliases": cls._list(row.get("aliases")),
+            "php": {str(k): str(v) for k, v in php.items()},
+            "line": line,
+            "problems": problems,
+        }
+
+    @classmethod
+    def _flag(cls, value) -> bool:
+        return value is True or str(value or "").strip().lower() in cls.TRUE_VALUES
+
+    @staticmethod
+    def _list(value) -> List[str]:
+        items = value if isinstance(value, list) else str(value or "").split(",")
+        return [str(item).strip() for item in items if str(item).strip()]
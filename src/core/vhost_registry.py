@@ -0,0 +1,204 @@
+import json
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from src.core.path_manager import PathManager
+
+
+class VhostRegistry:
+    """
+    SQLite registry of the virtual hosts WinAPDev manages; the source the Apache vhost
+    configuration is generated from.
+
+    Hostnames and aliases are stored case-insensitively and indexed, so existence checks,
+    lookups by name or alias and listings by port are index lookups whatever the number
+    of vhosts. Blocks imported from an existing configuration that WinAPDev did not
+    generate keep their original text in `config`, and content outside any named
+    VirtualHost is kept as the preamble, so nothing is lost by switching to the registry.
+    """
+
+    FILE_NAME = "vhosts.db"
+    SCHEMA_VERSION = 1
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS vhosts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            hostname TEXT NOT NULL UNIQUE COLLATE NOCASE,
+            port INTEGER NOT NULL,
+            root TEXT,
+            ssl INTEGER NOT NULL DEFAULT 0,
+            balancer INTEGER NOT NULL DEFAULT 0,
+            members TEXT NOT NULL DEFAULT '[]',
+            config TEXT,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS vhosts_port ON vhosts (port);
+        CREATE TABLE IF NOT EXISTS aliases (
+            alias TEXT PRIMARY KEY COLLATE NOCASE,
+            vhost_id INTEGER NOT NULL REFERENCES vhosts (id) ON DELETE CASCADE
+        );
+        CREATE INDEX IF NOT EXISTS aliases_vhost ON aliases (vhost_id);
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+    """
+    FIELDS = ("port", "root", "ssl", "balancer", "members", "config", "aliases")
+
+    def __init__(self, path=None):
+        self.path = Path(path or PathManager().deploy_root() / self.FILE_NAME)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit; transaction() groups statements explicitly
+        self._conn = sqlite3.connect(str(self.path), isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._depth = 0
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] < self.SCHEMA_VERSION:
+            with self.transaction():
+                # executescript() would commit on its own, so statements run one by one
+                for statement in filter(str.strip, self.SCHEMA.split(";")):
+                    self._conn.execute(statement)
+                self._conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+    # -------------------------
+    # Public operations
+    # -------------------------
+    @contextmanager
+    def transaction(self):
+        """Group writes into one transaction; nested uses join the outer one."""
+        if self._depth == 0:
+            self._conn.execute("BEGIN IMMEDIATE")
+        self._depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._depth -= 1
+            if self._depth == 0:
+                self._conn.execute("ROLLBACK")
+            raise
+        self._depth -= 1
+        if self._depth == 0:
+            self._conn.execute("COMMIT")
+
+    def exists(self, name: str) -> bool:
+        """True if name is the hostname or an alias of a registered vhost."""
+        row = self._conn.execute(
+            "SELECT 1 FROM vhosts WHERE hostname = ? UNION ALL SELECT 1 FROM aliases WHERE alias = ? LIMIT 1",
+            (name, name),
+        ).fetchone()
+        return row is not None
+
+    def get(self, name: str) -> Optional[Dict]:
+        """The vhost with hostname or alias name."""
+        row = self._conn.execute(
+            "SELECT * FROM vhosts WHERE hostname = ? "
+            "UNION ALL SELECT v.* FROM vhosts v JOIN aliases a ON a.vhost_id = v.id WHERE a.alias = ? LIMIT 1",
+            (name, name),
+        ).fetchone()
+        if row is None:
+            return None
+        rows = self._conn.execute("SELECT alias FROM aliases WHERE vhost_id = ? ORDER BY alias", (row["id"],))
+        aliases = [r[0] for r in rows]
+        return self._record(row, aliases)
+
+    def all(self, port: int = None) -> List[Dict]:
+        """Every vhost in creation order (Apache's default vhost of a port is its first one)."""
+        query = (
+            "SELECT v.*, group_concat(a.alias, ' ') AS alias_list"
+            " FROM vhosts v LEFT JOIN aliases a ON a.vhost_id = v.id"
+        )
+        params = ()
+        if port is not None:
+            query += " WHERE v.port = ?"
+            params = (int(port),)
+        rows = self._conn.execute(query + " GROUP BY v.id ORDER BY v.id", params)
+        return [self._record(row, sorted((row["alias_list"] or "").split())) for row in rows]
+
+    def count(self) -> int:
+        return self._conn.execute("SELECT count(*) FROM vhosts").fetchone()[0]
+
+    def save(
+            self,
+            hostname: str,
+            port: int,
+            root: str = None,
+            ssl: bool = False,
+            balancer: bool = False,
+            members: Iterable[str] = (),
+            aliases: Iterable[str] = (),
+            config: str = None,
+    ) -> bool:
+        """Insert or update a vhost. Returns False when it was already registered exactly like this."""
+        wanted = {
+            "port": int(port), "root": root, "ssl": bool(ssl), "balancer": bool(balancer),
+            "members": list(members or []), "config": config, "aliases": sorted(set(aliases or ())),
+        }
+        with self.transaction():
+            current = self._conn.execute("SELECT * FROM vhosts WHERE hostname = ?", (hostname,)).fetchone()
+            if current is not None:
+                existing = self.get(current["hostname"])
+                if all(existing[k] == wanted[k] for k in self.FIELDS):
+                    return False
+            now = datetime.now().isoformat(timespec="seconds")
+            values = (
+                wanted["port"], root, int(wanted["ssl"]), int(wanted["balancer"]),
+                json.dumps(wanted["members"]), config, now,
+            )
+            if current is None:
+                vhost_id = self._conn.execute(
+                    "INSERT INTO vhosts (port, root, ssl, balancer, members, config, updated_at, hostname, created_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    values + (hostname, now),
+                ).lastrowid
+            else:
+                vhost_id = current["id"]
+                self._conn.execute(
+                    "UPDATE vhosts SET port = ?, root = ?, ssl = ?, balancer = ?, members = ?, config = ?,"
+                    " updated_at = ? WHERE id = ?",
+                    values + (vhost_id,),
+                )
+            self._conn.execute("DELETE FROM aliases WHERE vhost_id = ?", (vhost_id,))
+            self._conn.executemany(
+                "INSERT INTO aliases (alias, vhost_id) VALUES (?, ?)", [(a, vhost_id) for a in wanted["aliases"]]
+            )
+        return True
+
+    def remove(self, hostname: str) -> Optional[Dict]:
+        """Delete the vhost registered as hostname; returns the removed record."""
+        with self.transaction():
+            record = self.get(hostname)
+            if record is None or record["hostname"].lower() != hostname.lower():
+                return None
+            self._conn.execute("DELETE FROM vhosts WHERE hostname = ?", (hostname,))
+        return record
+
+    def meta(self, key: str, default: str = None) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key: str, value: Optional[str]):
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def close(self):
+        self._conn.close()
+
+    # -------------------------
+    # Utilities
+    # -------------------------
+    @staticmethod
+    def _record(row, aliases: List[str]) -> Dict:
+        return {
+            "hostname": row["hostname"],
+            "aliases": aliases,
+            "port": row["port"],
+            "root": row["root"],
+            "ssl": bool(row["ssl"]),
+            "balancer": bool(row["balancer"]),
+            "members": json.loads(row["members"]),
+            "config": row["config"],
+            "created_at": row["created_at"],
+            "updated_at": row["updated_at"],
+        }
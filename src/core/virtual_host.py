@@ -2,6 +2,8 @@ import glob
 import os
 import re
 import textwrap
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Iterable, Optional
@@ -9,13 +11,20 @@ from typing import Iterable, Optional
 from colorama import Fore
 
 # local imports (unchanged)
+from src.core.apache_config import ApacheConfig
 from src.core.certificate_manager import CertificateManager
 from src.core.cli_arguments import Arguments
 from src.core.constants import Constants
 from src.core.helper import Helper
+from src.core.ini_overlay import IniOverlay
 from src.core.path_manager import PathManager
+from src.core.preload_generator import PreloadGenerator
 from src.core.service import Service
 from src.core.system_paths import SystemPaths
+from src.core.template_engine import TemplateEngine
+from src.core.templates import Templates
+from src.core.vhost_manifest import VhostManifest
+from src.core.vhost_registry import VhostRegistry
 from src.core.windows_host_manager import WindowsHostsManager
 
 
@@ -23,6 +32,12 @@ class VirtualHost:
     """
     Manage Apache virtual host configs and Windows hosts entries.
 
+    Virtual hosts live in a VhostRegistry and each one is rendered to its own
+    conf/vhosts.d/<hostname>.conf, which httpd-vhosts.conf pulls in with a single
+    IncludeOptional; adding or removing a host writes or deletes one small file. The first
+    time the registry is used, the vhosts already in httpd-vhosts.conf are imported and
+    split out.
+
     Notes:
     - Editing apache vhost file requires appropriate permissions (run as admin if necessary).
     - Updating hosts file requires Administrator privileges.
@@ -39,6 +54,14 @@ class VirtualHost:
         if not os.path.exists(self.apache_v_host):
             raise FileNotFoundError(f"Apache vhost config not found: {self.apache_v_host}")
 
+        self.vhosts_dir = self.path_manager.deploy_structure("httpd_vhosts_dir")
+        self.ini_overlays = self.path_manager.deploy_structure("ini_overlays")
+        self.registry = VhostRegistry()
+        if self.registry.meta("seeded") is None:
+            self._seed_registry()
+        if self.registry.meta("layout") != self.LAYOUT:
+            self._migrate_layout()
+
     # -------------------------
     # Public operations
     # -------------------------
@@ -50,14 +73,18 @@ class VirtualHost:
             ssl: bool = False,
             balancer: bool = False,
             members: Optional[Iterable[str]] = None,
+            php: Optional[dict] = None,
+            aliases: Optional[Iterable[str]] = None,
     ):
-        """Add a virtual host + hosts entry. Creates certs if ssl=True."""
+        """Add a virtual host + hosts entry. Creates certs if ssl=True; php settings become the vhost's ini overlay."""
         hostname = (hostname or "").strip()
         if not hostname:
             raise ValueError("hostname must be provided")
+        aliases = [a.strip() for a in aliases or [] if a.strip()]
 
-        if self._vhost_exists(hostname):
-            print(f"{Fore.YELLOW}Warning: requested hostname {hostname} already exits")
+        taken = [name for name in [hostname, *aliases] if self.registry.exists(name)]
+        if taken:
+            print(f"{Fore.YELLOW}Warning: requested hostname {', '.join(taken)} already exits")
             exit(1)
             # raise RuntimeError(f"VirtualHost for '{hostname}' already exists in {self.apache_v_host}")
 
@@ -75,32 +102,30 @@ class VirtualHost:
             except Exception as e:
                 raise RuntimeError(f"Project root '{app_root}' missing and could not be created: {e}")
 
-        # 1. SSL certs
+        # 1. SSL certs, in <ServerRoot>/cert where the block's relative SSLCertificate* paths point
         if ssl:
             try:
-                CertificateManager.create(self.apache_v_host, hostname)
+                CertificateManager.create(self.path_manager.deploy_structure("apache_root"), hostname)
             except Exception as e:
                 raise RuntimeError(f"Failed to create certificate for {hostname}: {e}")
 
-        # 2. Build config
-        if balancer:
-            cfg = self.build_balancer(hostname, port, members or [], ssl=ssl)
-        else:
-            cfg = self.build(hostname, port, app_root, ssl=ssl)
+        # 2. Per-project PHP settings, rendered into the vhost's own block
+        if not balancer:
+            overlay = IniOverlay(hostname, app_root, self.ini_overlays)
+            overlay.set(php or {})
+            overlay.apply()
 
-        # 3. Append config safely with backup
-        self._backup_config()
-        try:
-            with open(self.apache_v_host, "a", encoding="utf-8", newline="\n") as f:
-                f.write("\n")
-                f.write(cfg)
-                f.write("\n")
-        except PermissionError as e:
-            raise PermissionError(f"Permission denied writing to {self.apache_v_host}: {e}")
+        # 3. Register and write the vhost's own config file
+        self.registry.save(
+            hostname, port, None if balancer else app_root, ssl=ssl, balancer=balancer, members=members or [],
+            aliases=aliases,
+        )
+        self._write_vhost(self.registry.get(hostname))
 
         # 4. Update hosts file
         try:
-            WindowsHostsManager().add_entry(hostname)
+            for name in [hostname, *aliases]:
+                WindowsHostsManager().add_entry(name)
         except Exception as e:
             # hosts update failed - warn (vhost added) but keep file as is
             print(f"{Fore.YELLOW}Warning: failed to update hosts file for {hostname}: {e}")
@@ -108,51 +133,43 @@ class VirtualHost:
         print(f"{Fore.GREEN}Virtual Host added for {Fore.CYAN}{hostname}")
 
     def remove(self, hostname: str):
-        """Remove virtualhost blocks containing ServerName <hostname> and update hosts."""
+        """Unregister the virtual host <hostname>, delete its config file and update hosts."""
         hostname = (hostname or "").strip()
         if not hostname:
             raise ValueError("hostname must be provided")
 
-        # read file
-        p = Path(self.apache_v_host)
-        text = p.read_text(encoding="utf-8")
-
-        # Regex to find <VirtualHost ...> ... </VirtualHost> blocks (non-greedy),
-        # and remove those that contain ServerName <hostname>
-        pattern = re.compile(
-            r"(<VirtualHost\b.*?>.*?</VirtualHost>)", re.IGNORECASE | re.DOTALL
-        )
-
-        def keep_block(m):
-            block = m.group(1)
-            # if ServerName hostname present in block -> remove it
-            if re.search(rf"^\s*ServerName\s+{re.escape(hostname)}\b", block, re.IGNORECASE | re.MULTILINE):
-                return ""  # delete block
-            # also check for ServerAlias entries (safer)
-            if re.search(rf"^\s*ServerAlias\s+.*\b{re.escape(hostname)}\b", block, re.IGNORECASE | re.MULTILINE):
-                return ""
-            return block  # keep
-
-        new_text = pattern.sub(lambda m: keep_block(m), text)
-
-        if new_text == text:
-            print(f"{Fore.YELLOW}Note: No VirtualHost block found for {hostname} in {self.apache_v_host}")
+        record = self.registry.remove(hostname)
+        if record is None:
+            print(f"{Fore.YELLOW}Note: No virtual host registered for {hostname}")
         else:
-            # backup then write
-            backup_file = self._backup_config()
-            try:
-                p.write_text(new_text, encoding="utf-8", newline="\n")
-            except PermissionError as e:
-                raise PermissionError(f"Permission denied writing to {self.apache_v_host}: {e}")
+            self._delete_vhost(record["hostname"])
+
+            IniOverlay(record["hostname"], record["root"], self.ini_overlays).remove()
 
-            # remove hosts entry
+            # remove hosts entries
             try:
-                WindowsHostsManager().delete_entry(hostname)
+                for name in [record["hostname"], *record["aliases"]]:
+                    WindowsHostsManager().delete_entry(name)
             except Exception as e:
                 print(f"{Fore.YELLOW}Warning: failed to remove hosts entry for {hostname}: {e}")
 
             print(f"{Fore.GREEN}Virtual Host removed for {Fore.CYAN}{hostname}")
 
+    def ensure(self, hostname: str, port: int, app_root: str, ssl: bool = False) -> bool:
+        """
+        Idempotent add: make the vhost for hostname match the generated block.
+        Returns False (nothing written) when it already does; a differing registration is replaced.
+        """
+        existed = self.registry.exists(hostname)
+        registered = self.registry.save(hostname, int(port), app_root, ssl=ssl)
+        if not self._write_vhost(self.registry.get(hostname)) and not registered:
+            return False
+
+        Path(app_root).mkdir(parents=True, exist_ok=True)
+        WindowsHostsManager().add_entry(hostname)
+        print(f"{Fore.GREEN}Virtual Host {'updated' if existed else 'added'} for {Fore.CYAN}{hostname}")
+        return True
+
     # -------------------------
     # CLI-friendly wrappers
     # -------------------------
@@ -170,8 +187,12 @@ class VirtualHost:
             ssl = args.get("ssl", False)
             balancer = args.get("balancer", False)
             members = args.get("members", None)
+            if isinstance(members, str):
+                members = [m.strip() for m in members.split(",") if m.strip()]
+            php = IniOverlay.parse(args.get("php"))
+            aliases = str(args.get("aliases") or "").split(",")
 
-            self.add(hostname, port, root_dir, ssl=ssl, balancer=balancer, members=members)
+            self.add(hostname, port, root_dir, ssl=ssl, balancer=balancer, members=members, php=php, aliases=aliases)
             Service().restart()
             Helper.open_app(hostname, port, ssl)
         finally:
@@ -187,12 +208,219 @@ class VirtualHost:
         finally:
             self.__cleanup_backups()
 
+    def import_projects(self, args: Arguments):
+        """
+        Add every vhost of a JSON/CSV manifest (--file): one validation pass, certificates
+        created concurrently, one registry transaction, one hosts file write and one restart.
+        Hostnames that are already registered are skipped, so a grown manifest can be re-imported.
+        """
+        path = args.get("file")
+        if not path:
+            raise RuntimeError("Provide --file=<manifest.json|manifest.csv>")
+        started = time.monotonic()
+        entries = VhostManifest(path).load()
+
+        # 1. Validate everything before anything is touched
+        errors, todo, skipped, names = [], [], [], {}
+        for entry in entries:
+            current = self.registry.get(entry["hostname"]) if entry["hostname"] else None
+            if current and current["hostname"].lower() == entry["hostname"].lower():
+                skipped.append(entry["hostname"])
+                continue
+            problems = VhostManifest.validate(entry)
+            for name in [entry["hostname"], *entry["aliases"]]:
+                if name.lower() in names:
+                    problems.append(f"{name} is also used on line {names[name.lower()]}")
+                elif self.registry.exists(name):
+                    problems.append(f"{name} is already used by a registered virtual host")
+                names.setdefault(name.lower(), entry["line"])
+            errors.extend(f"line {entry['line']} ({entry['hostname'] or '?'}): {problem}" for problem in problems)
+            todo.append(entry)
+        if errors:
+            for error in errors:
+                print(f"{Fore.RED}  {error}")
+            raise RuntimeError(f"{len(errors)} problem(s) in {path}; nothing was imported")
+        if skipped:
+            print(f"{Fore.YELLOW}Skipping {len(skipped)} already registered virtual host(s)")
+        if not todo:
+            print(f"{Fore.YELLOW}Nothing to import")
+            return
+
+        for entry in todo:
+            if not entry["balancer"]:
+                Path(entry["dir"]).mkdir(parents=True, exist_ok=True)
+
+        # 2. Certificates: one openssl process per host, run side by side
+        ssl_hosts = [entry["hostname"] for entry in todo if entry["ssl"]]
+        if ssl_hosts:
+            print(f"{Fore.GREEN}Creating {len(ssl_hosts)} certificate(s)...")
+            apache_root = self.path_manager.deploy_structure("apache_root")
+            with ThreadPoolExecutor(max_workers=min(len(ssl_hosts), (os.cpu_count() or 1) * 2)) as pool:
+                futures = {host: pool.submit(CertificateManager.create, apache_root, host) for host in ssl_hosts}
+            failed = [f"{host}: {future.exception()}" for host, future in futures.items() if future.exception()]
+            if failed:
+                raise RuntimeError("Failed to create certificates, nothing was registered:\n  " + "\n  ".join(failed))
+
+        # 3. PHP settings, registry and vhost files; a failure rolls all of them back
+        written = []
+        try:
+            for entry in todo:
+                if entry["php"] and not entry["balancer"]:
+                    overlay = IniOverlay(entry["hostname"], entry["dir"], self.ini_overlays)
+                    overlay.set(entry["php"])
+                    overlay.apply()
+            with self.registry.transaction():
+                for entry in todo:
+                    self.registry.save(
+                        entry["hostname"], entry["port"], None if entry["balancer"] else entry["dir"],
+                        ssl=entry["ssl"], balancer=entry["balancer"], members=entry["members"],
+                        aliases=entry["aliases"],
+                    )
+                    self._write_vhost(self.registry.get(entry["hostname"]))
+                    written.append(entry["hostname"])
+        except Exception:
+            for hostname in written:
+                self._delete_vhost(hostname)
+            for entry in todo:
+                if entry["php"] and not entry["balancer"]:
+                    IniOverlay(entry["hostname"], folder=self.ini_overlays).remove()
+            raise
+
+        # 4. Hosts file once
+        names = [name for entry in todo for name in [entry["hostname"], *entry["aliases"]]]
+        if not WindowsHostsManager().add_entries(names):
+            print(f"{Fore.YELLOW}Warning: failed to update the hosts file")
+
+        print(f"{Fore.GREEN}Imported {len(todo)} virtual host(s) in {time.monotonic() - started:.1f}s")
+        # 5. One restart for all of them
+        Service().restart()
+
+    def export_projects(self, args: Arguments):
+        """Write every registered vhost to a JSON/CSV manifest (--file) that vhost:import accepts."""
+        path = args.get("file")
+        if not path:
+            raise RuntimeError("Provide --file=<manifest.json|manifest.csv>")
+        records = self.registry.all()
+        entries = [
+            {
+                "hostname": record["hostname"],
+                "dir": record["root"],
+                "port": record["port"],
+                "ssl": record["ssl"],
+                "balancer": record["balancer"],
+                "members": record["members"],
+                "aliases": record["aliases"],
+                "php": IniOverlay(record["hostname"], folder=self.ini_overlays).settings,
+            }
+            for record in records
+        ]
+        VhostManifest(path).dump(entries)
+        print(f"{Fore.GREEN}Exported {len(entries)} virtual host(s) to {Fore.CYAN}{path}")
+        custom = [record["hostname"] for record in records if record["config"]]
+        if custom:
+            print(f"{Fore.YELLOW}Note: {', '.join(custom)} use hand-written blocks; only their settings are exported")
+
+    def list_projects(self, args: Arguments):
+        """Registered virtual hosts in creation order (--port=N to filter)."""
+        records = self.registry.all(port=args.get("port"))
+        if not records:
+            print(f"{Fore.YELLOW}No virtual hosts registered")
+            return
+        for record in records:
+            scheme = "https" if record["ssl"] else "http"
+            target = f"balancer -> {', '.join(record['members'])}" if record["balancer"] else record["root"]
+            print(f"{Fore.CYAN}{record['hostname']:<32}{Fore.RESET} {scheme}:{record['port']:<6} {target}")
+        print(f"{len(records)} virtual host(s)")
+
+    def show_project(self, args: Arguments):
+        """Everything registered for one vhost (--hostname, an alias works too) and its generated block."""
+        hostname = args.get("hostname")
+        if not hostname:
+            raise RuntimeError("Wrong hostname provided")
+        record = self.registry.get(hostname)
+        if record is None:
+            raise RuntimeError(f"No virtual host registered for {hostname}")
+        for key in ("hostname", "aliases", "port", "ssl", "root", "balancer", "members", "created_at", "updated_at"):
+            value = record[key]
+            if isinstance(value, list):
+                value = ", ".join(value) or "-"
+            print(f"{Fore.CYAN}{key:<11}{Fore.RESET} {value if value is not None else '-'}")
+        print(self._config_of(record))
+
+    def ini_project(self, args: Arguments):
+        """Show or change a vhost's PHP overrides (--set=key=value,... --unset=key,...); restarts Apache on change."""
+        hostname = args.get("hostname")
+        if not hostname:
+            raise RuntimeError("Wrong hostname provided")
+        record = self.registry.get(hostname)
+        if record is None or record["balancer"]:
+            raise RuntimeError(f"No virtual host with a DocumentRoot registered for {hostname}")
+        overlay = IniOverlay(record["hostname"], self.document_root(record["hostname"]), self.ini_overlays)
+
+        if args.get("set") or args.get("unset"):
+            overlay.set(IniOverlay.parse(args.get("set")))
+            overlay.unset(str(args.get("unset") or "").split(","))
+            overlay.apply()
+            if self._write_vhost(record):
+                Service().restart()
+                print(f"{Fore.GREEN}PHP settings of {Fore.CYAN}{record['hostname']}{Fore.GREEN} updated")
+        overlay.report()
+
+    def preload_project(self, args: Arguments):
+        """Generate the opcache.preload script for a vhost (--hostname) or project (--dir) and activate it."""
+        hostname = args.get("hostname")
+        root_dir = args.get("dir") or (self.document_root(hostname) if hostname else None)
+        if not root_dir:
+            raise RuntimeError("Provide --hostname of an existing virtual host or --dir of a project")
+
+        namespaces = args.get("namespace")
+        generator = PreloadGenerator(
+            PreloadGenerator.project_root_of(root_dir),
+            namespaces.split(",") if isinstance(namespaces, str) else None,
+        )
+        result = generator.generate()
+        name = hostname or Path(generator.project_root).name
+        script = os.path.join(self.path_manager.deploy_structure("preload"), f"{name}.php")
+        generator.write(script, result)
+        print(
+            f"{Fore.GREEN}Preload script for {Fore.CYAN}{name}{Fore.GREEN}: {len(result['files'])} files, "
+            f"{result['classes']} classes ({len(result['skipped'])} skipped) -> {script}"
+        )
+        for cls, reason in sorted(result["skipped"].items())[:10]:
+            print(f"{Fore.YELLOW}  skipped {cls}: {reason}")
+
+        PreloadGenerator.activate(script)
+        if not PreloadGenerator.supported():
+            print(f"{Fore.YELLOW}Note: PHP does not support opcache.preload on Windows; php.ini is left unchanged")
+            return
+        # opcache.preload is server-wide: the last generated project is the one preloaded
+        if Templates().deploy():
+            Service().restart()
+
+    def document_root(self, hostname: str) -> Optional[str]:
+        """DocumentRoot of the VirtualHost serving hostname: registered, else from the parsed Apache configuration."""
+        record = self.registry.get(hostname)
+        if record and record["root"] and not record["config"]:
+            return record["root"]
+        config = ApacheConfig()
+        for vhost in config.parse().find("VirtualHost"):
+            names = [a.lower() for n in vhost.walk() if n.key in ("servername", "serveralias") for a in n.args]
+            roots = [n.args[0] for n in vhost.walk() if n.key == "documentroot" and n.args]
+            if hostname.lower() in names and roots:
+                return config.resolve(roots[0])
+        return None
+
     # -------------------------
     # Build helpers
     # -------------------------
     @staticmethod
-    def build(hostname: str, port: int, app_root: str, ssl: bool = False) -> str:
-        """Return a demented Apache VirtualHost block."""
+    def build(
+            hostname: str, port: int, app_root: str, ssl: bool = False, aliases: Iterable[str] = (),
+            php: Iterable[str] = (),
+    ) -> str:
+        """Return a demented Apache VirtualHost block (php: IniOverlay.directives() of the vhost)."""
+        alias_line = f"\n        ServerAlias {' '.join(aliases)}" if aliases else ""
+        php_lines = "".join(f"\n        {line}" for line in php)
         ssl_block = ""
         if ssl:
             ssl_block = textwrap.dedent(
@@ -206,9 +434,9 @@ class VirtualHost:
         template = f"""
     <VirtualHost *:{port}>
         DocumentRoot "{app_root}"
-        ServerName {hostname}
+        ServerName {hostname}{alias_line}
         ErrorLog "logs/{hostname}-error.log"
-        CustomLog "logs/{hostname}-access.log" common
+        CustomLog "logs/{hostname}-access.log" common{php_lines}
         <Directory "{app_root}">
             AllowOverride All
             Require all granted
@@ -218,15 +446,19 @@ class VirtualHost:
         return textwrap.dedent(template).strip() + "\n"
 
     @staticmethod
-    def build_balancer(hostname: str, port: int, members: Iterable[str], ssl: bool = False) -> str:
+    def build_balancer(
+            hostname: str, port: int, members: Iterable[str], ssl: bool = False, aliases: Iterable[str] = ()
+    ) -> str:
         members = list(members or [])
-        balancer_members = "\n".join([f"        BalancerMember {m}" for m in members])
+        balancer_members = "\n".join([f"            BalancerMember {m}" for m in members])
+        alias_line = f"\n        ServerAlias {' '.join(aliases)}" if aliases else ""
         template = f"""
     <VirtualHost *:{port}>
+        ServerName {hostname}{alias_line}
         ProxyRequests Off
         ProxyPass / balancer://{hostname}_cluster/
         <Proxy balancer://{hostname}_cluster>
-    {balancer_members}
+{balancer_members}
         </Proxy>
     </VirtualHost>
     """
@@ -235,28 +467,107 @@ class VirtualHost:
     # -------------------------
     # Utilities
     # -------------------------
-    def _vhost_exists(self, hostname: str) -> bool:
-        """Quick check if a ServerName or ServerAlias matches hostname in config file."""
-        text = Path(self.apache_v_host).read_text(encoding="utf-8")
-        if re.search(rf"^\s*ServerName\s+{re.escape(hostname)}\b", text, re.IGNORECASE | re.MULTILINE):
-            return True
-        if re.search(rf"^\s*ServerAlias\s+.*\b{re.escape(hostname)}\b", text, re.IGNORECASE | re.MULTILINE):
-            return True
-        return False
-
-    def _backup_config(self):
-        """Create a timestamped backup of the vhost config before modification."""
-        src = Path(self.apache_v_host)
-        if not src.exists():
-            return
-        ts = datetime.now().strftime("%Y%m%d%H%M%S")
-        dest = src.with_name(f"{src.name}.bak.{ts}")
+    # Active <VirtualHost ...> ... </VirtualHost> blocks (non-greedy, commented-out examples excluded)
+    BLOCK_PATTERN = re.compile(
+        r"^[ \t]*(<VirtualHost\b[^>]*>.*?^[ \t]*</VirtualHost>)[ \t]*\n*", re.IGNORECASE | re.DOTALL | re.MULTILINE
+    )
+    HEADER = "# Generated by WinAPDev from its vhost registry; use vhost:add / vhost:remove instead of editing."
+    INCLUDE = 'IncludeOptional "conf/vhosts.d/*.conf"'
+    LAYOUT = "vhosts.d"
+
+    def _config_of(self, record: dict) -> str:
+        """Verbatim block of an imported vhost, else the generated one; both carry the vhost's PHP settings."""
+        if record["balancer"] and not record["config"]:
+            return self.build_balancer(
+                record["hostname"], record["port"], record["members"], ssl=record["ssl"], aliases=record["aliases"]
+            )
+        php = IniOverlay(record["hostname"], folder=self.ini_overlays).directives()
+        if not record["config"]:
+            return self.build(
+                record["hostname"], record["port"], record["root"], ssl=record["ssl"], aliases=record["aliases"],
+                php=php,
+            )
+        if not php:
+            return record["config"]
+        head, _, tail = record["config"].rpartition("</VirtualHost>")
+        return head + "".join(f"    {line}\n" for line in php) + "</VirtualHost>" + tail
+
+    def _vhost_file(self, hostname: str) -> str:
+        return os.path.join(self.vhosts_dir, re.sub(r"[^\w.-]", "_", hostname.lower()) + ".conf")
+
+    def _write_vhost(self, record: dict) -> bool:
+        """Write conf/vhosts.d/<hostname>.conf; returns True if it changed."""
+        path = self._vhost_file(record["hostname"])
         try:
-            dest.write_bytes(src.read_bytes())
-            print(f"[backup] {src} -> {dest}")
-            return dest
-        except Exception as e:
-            print(f"{Fore.YELLOW}Warning: failed to create backup of {src}: {e}")
+            os.makedirs(self.vhosts_dir, exist_ok=True)
+            return TemplateEngine.write_if_changed(path, self._config_of(record))
+        except PermissionError as e:
+            raise PermissionError(f"Permission denied writing to {path}: {e}")
+
+    def _delete_vhost(self, hostname: str):
+        try:
+            os.remove(self._vhost_file(hostname))
+        except FileNotFoundError:
+            pass
+
+    def _migrate_layout(self):
+        """One-time split into vhosts.d: a file per vhost; httpd-vhosts.conf keeps the preamble and the include."""
+        for record in self.registry.all():
+            self._write_vhost(record)
+        parts = [self.HEADER, self.registry.meta("preamble", ""), self.INCLUDE]
+        text = "\n\n".join(part.strip() for part in parts if part and part.strip()) + "\n"
+        try:
+            TemplateEngine.write_if_changed(self.apache_v_host, text)
+        except PermissionError as e:
+            raise PermissionError(f"Permission denied writing to {self.apache_v_host}: {e}")
+        self.registry.set_meta("layout", self.LAYOUT)
+        print(f"{Fore.GREEN}Virtual hosts moved to one file each under {Fore.CYAN}{self.vhosts_dir}")
+
+    def _seed_registry(self):
+        """
+        One-time import of the vhosts in httpd-vhosts.conf and vhosts.d; unnamed blocks and
+        other content become the preamble.
+        """
+        sources = [self.apache_v_host] + sorted(glob.glob(os.path.join(self.vhosts_dir, "*.conf")))
+        text = "\n".join(Path(source).read_text(encoding="utf-8") for source in sources)
+        text = text.replace(self.HEADER, "").replace(self.INCLUDE, "")
+        records, seen = [], set()
+
+        def take(match):
+            block = match.group(1)
+            directives = {}
+            for line in block.splitlines()[1:-1]:
+                words = line.split()
+                if words and not words[0].startswith("#"):
+                    directives.setdefault(words[0].lower(), []).append([w.strip('"') for w in words[1:]])
+            hostname = (directives.get("servername") or [[None]])[0][0]
+            if not hostname or hostname.lower() in seen:
+                return match.group(0)
+            seen.add(hostname.lower())
+            port = re.search(r":(\d+)\s*>", block.splitlines()[0])
+            record = {
+                "hostname": hostname,
+                "port": int(port.group(1)) if port else 80,
+                "root": (directives.get("documentroot") or [[None]])[0][0],
+                "ssl": any(args[:1] and args[0].lower() == "on" for args in directives.get("sslengine", [])),
+                "members": [args[0] for args in directives.get("balancermember", []) if args],
+                "aliases": [alias for args in directives.get("serveralias", []) for alias in args],
+            }
+            record["balancer"] = bool(record["members"])
+            record["config"] = block.strip() + "\n"
+            if record["config"].strip() == self._config_of(dict(record, config=None)).strip():
+                record["config"] = None
+            records.append(record)
+            return ""
+
+        preamble = self.BLOCK_PATTERN.sub(take, text)
+        with self.registry.transaction():
+            for record in records:
+                self.registry.save(**record)
+            self.registry.set_meta("preamble", preamble.strip())
+            self.registry.set_meta("seeded", datetime.now().isoformat(timespec="seconds"))
+        if records:
+            print(f"{Fore.GREEN}Imported {len(records)} virtual host(s) from {self.apache_v_host} into the registry")
 
     @staticmethod
     def __cleanup_backups():
@@ -109,6 +109,35 @@ class WindowsHostsManager:
             print(f"[!] Error while adding entry: {e}")
             return False
 
+    def add_entries(self, domains: List[str], ip="127.0.0.1") -> bool:
+        """
+        Idempotent bulk add with a single read and a single write of the hosts file.
+        True if all are added or already exist, False on failure.
+        """
+        try:
+            ipaddress.ip_address(ip)
+            lines = self._read_hosts()
+            present = set()
+            for line in lines:
+                parsed = self._parse_mapping(line)
+                if parsed and parsed[1] == ip:
+                    present.update(self._norm(h) for h in parsed[2])
+
+            missing = []
+            for domain in domains:
+                if self._norm(domain) not in present:
+                    present.add(self._norm(domain))
+                    missing.append(domain)
+            if missing:
+                if lines and not lines[-1].endswith("\n"):
+                    lines[-1] += "\n"
+                lines.extend(f"{ip}\t{domain}\n" for domain in missing)
+                self._write_hosts_atomic(lines)
+            return True
+        except Exception as e:
+            print(f"[!] Error while adding entries: {e}")
+            return False
+
     def delete_entry(self, domain: str, ip: Optional[str] = None) -> bool:
         """
         Delete entries:
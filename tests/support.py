@@ -0,0 +1,92 @@
+import hashlib
+import http.server
+import re
+import threading
+
+
+class RangeServer:
+    """
+    Local HTTP server for one in-memory file, with Range / If-Range support.
+
+    ranged=False answers every request with the whole file. truncate maps a range start
+    to the number of body bytes sent before the connection is dropped, to interrupt a
+    transfer part way. served counts the body bytes actually sent, ranges the requested
+    [start, end) regions.
+    """
+
+    def __init__(self, data: bytes, ranged: bool = True):
+        self.ranged = ranged
+        self.truncate = {}
+        self.served = 0
+        self.ranges = []
+        self._lock = threading.Lock()
+        self.set_data(data)
+        self._server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}/archive.zip"
+
+    def set_data(self, data: bytes):
+        """Replace the served file; its ETag changes with it."""
+        self.data = data
+        self.etag = '"%s"' % hashlib.sha256(data).hexdigest()[:16]
+
+    def reset(self):
+        with self._lock:
+            self.served = 0
+            self.ranges = []
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self):
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                data = server.data
+                start, end, status = 0, len(data), 200
+                match = re.fullmatch(r"bytes=(\d*)-(\d*)", self.headers.get("Range", ""))
+                if_range = self.headers.get("If-Range")
+                if match and server.ranged and if_range in (None, server.etag):
+                    first, last = match.groups()
+                    if first:
+                        start, end = int(first), min(int(last) + 1 if last else len(data), len(data))
+                    else:
+                        start, end = max(0, len(data) - int(last)), len(data)
+                    status = 206
+                body = data[start:end]
+
+                self.send_response(status)
+                if status == 206:
+                    self.send_header("Content-Range", f"bytes {start}-{end - 1}/{len(data)}")
+                    self.send_header("Accept-Ranges", "bytes")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", server.etag)
+                self.end_headers()
+
+                cut = server.truncate.get(start) if status == 206 else None
+                if cut is not None and cut < len(body):
+                    body = body[:cut]
+                    self.close_connection = True
+                try:
+                    self.wfile.write(body)
+                except ConnectionError:
+                    return  # the client gave up on this segment
+                with server._lock:
+                    server.served += len(body)
+                    server.ranges.append((start, end))
+
+        return Handler
@@ -0,0 +1,91 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from src.core.file_downloader import FileDownloader
+from tests.support import RangeServer
+
+
+class FileDownloaderTest(unittest.TestCase):
+    SIZE = 1024 * 1024
+    SEGMENT = 256 * 1024
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder, ignore_errors=True)
+        self.data = os.urandom(self.SIZE)
+        self.server = RangeServer(self.data).__enter__()
+        self.addCleanup(self.server.__exit__)
+
+    def downloader(self) -> FileDownloader:
+        downloader = FileDownloader(self.folder, connections=4)
+        downloader.SEGMENT_MIN_SIZE = self.SEGMENT
+        downloader.RETRIES = 0
+        return downloader
+
+    def read(self, path) -> bytes:
+        with open(path, "rb") as f:
+            return f.read()
+
+    def test_downloads_in_parallel_range_segments(self):
+        downloader = self.downloader()
+        path = downloader.download(self.server.url)
+
+        self.assertEqual(self.read(path), self.data)
+        self.assertEqual(downloader.sha256(path), hashlib.sha256(self.data).hexdigest())
+        segments = sorted(r for r in self.server.ranges if r != (0, 1))
+        self.assertEqual(segments, [(start, start + self.SEGMENT) for start in range(0, self.SIZE, self.SEGMENT)])
+        self.assertFalse(os.path.exists(path + ".part"))
+        self.assertFalse(os.path.exists(path + ".part.json"))
+
+    def test_resumes_interrupted_download_from_part_file(self):
+        self.server.truncate = {0: 100000}
+        with self.assertRaises(RuntimeError):
+            self.downloader().download(self.server.url)
+
+        target = os.path.join(self.folder, "archive.zip")
+        self.assertFalse(os.path.exists(target))
+        with open(target + ".part.json", "r", encoding="utf-8") as f:
+            state = json.load(f)
+        done = sum(segment[2] for segment in state["segments"])
+        self.assertGreaterEqual(done, 100000)
+
+        self.server.truncate = {}
+        self.server.reset()
+        path = self.downloader().download(self.server.url)
+
+        self.assertEqual(self.read(path), self.data)
+        # Only the probe byte and the missing tails of the segments travel again
+        self.assertEqual(self.server.served, 1 + self.SIZE - done)
+        self.assertNotIn((0, self.SEGMENT), self.server.ranges)
+
+    def test_restarts_when_the_remote_file_changed(self):
+        self.server.truncate = {0: 100000}
+        with self.assertRaises(RuntimeError):
+            self.downloader().download(self.server.url)
+
+        changed = os.urandom(self.SIZE)
+        self.server.set_data(changed)
+        self.server.truncate = {}
+        path = self.downloader().download(self.server.url)
+
+        self.assertEqual(self.read(path), changed)
+
+    def test_single_stream_without_range_support(self):
+        self.server.ranged = False
+        path = self.downloader().download(self.server.url)
+
+        self.assertEqual(self.read(path), self.data)
+
+    def test_checksum_mismatch_discards_the_file(self):
+        with self.assertRaises(RuntimeError):
+            self.downloader().download(self.server.url, checksum="0" * 64)
+
+        self.assertEqual(os.listdir(self.folder), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
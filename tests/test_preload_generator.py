@@ -0,0 +1,102 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from src.core.preload_generator import PreloadGenerator
+
+PROJECT = {
+    "composer.json": "{}",
+    "src/Contracts/Named.php": "<?php\nnamespace App\\Contracts;\ninterface Named {}\n",
+    "src/Concerns/Greets.php": "<?php\nnamespace App\\Concerns;\ntrait Greets {}\n",
+    "src/Base.php": (
+        "<?php\nnamespace App;\n\nuse App\\Contracts\\Named;\n\n"
+        "abstract class Base implements Named\n{\n    use Concerns\\Greets;\n}\n"
+    ),
+    "src/Http/Controller.php": (
+        "<?php\nnamespace App\\Http;\n\nuse App\\Base;\n\n"
+        "class Controller extends Base implements \\Countable\n{\n"
+        "    public function count(): int { return 0; }\n}\n"
+    ),
+    "src/Http/Client.php": "<?php\nnamespace App\\Http;\n\nclass Client extends \\Acme\\Lib\\Service {}\n",
+    "src/Broken.php": "<?php\nnamespace App;\n\nclass Broken extends \\Missing\\Ancestor {}\nclass Neighbour {}\n",
+    "src/Uses/Child.php": "<?php\nnamespace App\\Uses;\n\nclass Child extends \\App\\Broken {}\n",
+    "tests/SomeTest.php": "<?php\nnamespace Tests;\n\nclass SomeTest {}\n",
+    "vendor/composer/autoload_classmap.php": (
+        "<?php\n$vendorDir = dirname(__DIR__);\n$baseDir = dirname($vendorDir);\n\nreturn array(\n"
+        "    'Acme\\\\Lib\\\\Service' => $vendorDir . '/acme/lib/src/Service.php',\n);\n"
+    ),
+    "vendor/acme/lib/src/Service.php": "<?php\nnamespace Acme\\Lib;\n\nclass Service {}\n",
+    "vendor/acme/lib/src/Unlisted.php": "<?php\nnamespace Acme\\Lib;\n\nclass Unlisted {}\n",
+}
+
+
+class PreloadGeneratorTest(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        for name, text in PROJECT.items():
+            path = os.path.join(self.root, *name.split("/"))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+
+    def files(self, result) -> list:
+        return [os.path.relpath(path, self.root).replace(os.sep, "/") for path in result["files"]]
+
+    def test_parents_interfaces_and_traits_come_first(self):
+        files = self.files(PreloadGenerator(self.root).generate())
+
+        self.assertLess(files.index("src/Contracts/Named.php"), files.index("src/Base.php"))
+        self.assertLess(files.index("src/Concerns/Greets.php"), files.index("src/Base.php"))
+        self.assertLess(files.index("src/Base.php"), files.index("src/Http/Controller.php"))
+        self.assertLess(files.index("vendor/acme/lib/src/Service.php"), files.index("src/Http/Client.php"))
+
+    def test_vendor_comes_from_the_classmap_and_tests_are_skipped(self):
+        files = self.files(PreloadGenerator(self.root).generate())
+
+        self.assertIn("vendor/acme/lib/src/Service.php", files)
+        self.assertNotIn("vendor/acme/lib/src/Unlisted.php", files)
+        self.assertNotIn("tests/SomeTest.php", files)
+
+    def test_unresolvable_classes_and_their_users_are_skipped(self):
+        result = PreloadGenerator(self.root).generate()
+
+        self.assertEqual(result["skipped"], {
+            "App\\Broken": "Missing\\Ancestor",
+            "App\\Neighbour": "shares a file with App\\Broken",
+            "App\\Uses\\Child": "App\\Broken",
+        })
+        self.assertNotIn("src/Broken.php", self.files(result))
+        self.assertNotIn("src/Uses/Child.php", self.files(result))
+        self.assertEqual(result["classes"], 6)
+
+    def test_namespace_filter_keeps_the_dependencies(self):
+        files = self.files(PreloadGenerator(self.root, ["App\\Http"]).generate())
+
+        self.assertEqual(sorted(files), sorted([
+            "src/Contracts/Named.php", "src/Concerns/Greets.php", "src/Base.php",
+            "src/Http/Controller.php", "src/Http/Client.php", "vendor/acme/lib/src/Service.php",
+        ]))
+
+    def test_files_in_a_cycle_go_last(self):
+        order = PreloadGenerator._order({"a.php", "b.php", "c.php"}, {"a.php": {"b.php"}, "b.php": {"a.php"}})
+
+        self.assertEqual(order, ["c.php", "a.php", "b.php"])
+
+    def test_script_compiles_the_files_in_order(self):
+        generator = PreloadGenerator(self.root)
+        result = generator.generate()
+        script = os.path.join(self.root, "preload", "app.php")
+
+        self.assertTrue(generator.write(script, result))
+        self.assertFalse(generator.write(script, result))
+        with open(script, "r", encoding="utf-8") as f:
+            text = f.read()
+        positions = [text.index(path.replace(os.sep, "/")) for path in result["files"]]
+        self.assertEqual(positions, sorted(positions))
+        self.assertIn("opcache_compile_file($file);", text)
+
+
+if __name__ == "__main__":
+    unittest.main()
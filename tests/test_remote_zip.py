@@ -0,0 +1,85 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+
+from src.core.remote_zip import RemoteZip
+from tests.support import RangeServer
+
+
+class RemoteZipTest(unittest.TestCase):
+    MEMBERS = 40
+    MEMBER_SIZE = 50 * 1024
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder, ignore_errors=True)
+        self.contents = {f"Apache24/bin/f{i:02}.dll": os.urandom(self.MEMBER_SIZE) for i in range(self.MEMBERS)}
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as zip_ref:
+            for name, data in self.contents.items():
+                zip_ref.writestr(name, data)
+        self.archive = buffer.getvalue()
+        self.server = RangeServer(self.archive).__enter__()
+        self.addCleanup(self.server.__exit__)
+
+    def extract(self, target: str, include=None) -> RemoteZip:
+        with RemoteZip(self.server.url) as remote:
+            remote.extract(os.path.join(self.folder, target), include)
+        return remote
+
+    def assertExtracted(self, target: str, names):
+        for name in names:
+            with open(os.path.join(self.folder, target, name), "rb") as f:
+                self.assertEqual(f.read(), self.contents[name], name)
+
+    def test_full_extract_transfers_every_byte_once(self):
+        remote = self.extract("all")
+
+        self.assertExtracted("all", self.contents)
+        # The cached tail serves the members it overlaps, so nothing is fetched twice
+        self.assertEqual(remote.transferred, len(self.archive))
+        self.assertEqual(self.server.served, len(self.archive))
+
+    def test_selected_members_fetch_only_their_span(self):
+        remote = self.extract("one", include=["Apache24/bin/f03.dll"])
+
+        self.assertExtracted("one", ["Apache24/bin/f03.dll"])
+        self.assertFalse(os.path.exists(os.path.join(self.folder, "one", "Apache24", "bin", "f04.dll")))
+        # The tail request plus one request for the member's header and data
+        self.assertEqual(remote._file.requests, 2)
+        tail = remote._file.TAIL_SIZE
+        self.assertLess(remote.transferred, tail + 2 * self.MEMBER_SIZE)
+
+    def test_intact_members_are_not_fetched_again(self):
+        self.extract("again")
+        self.server.reset()
+        remote = self.extract("again")
+
+        self.assertEqual(remote._file.requests, 1)
+        self.assertEqual(self.server.served, remote._file.TAIL_SIZE)
+
+    def test_neighbouring_members_share_a_span(self):
+        with RemoteZip(self.server.url) as remote:
+            members = {info.filename: info for info in remote.infolist()}
+            near = remote._spans([members["Apache24/bin/f01.dll"], members["Apache24/bin/f02.dll"]])
+            far = remote._spans([members["Apache24/bin/f01.dll"], members["Apache24/bin/f30.dll"]])
+
+        self.assertEqual(len(near), 1)
+        self.assertEqual(near[0][0], members["Apache24/bin/f01.dll"].header_offset)
+        self.assertEqual(near[0][1], members["Apache24/bin/f03.dll"].header_offset)
+        self.assertEqual(len(far), 2)
+
+    def test_plan_clips_spans_at_the_cached_tail(self):
+        with RemoteZip(self.server.url) as remote:
+            tail_start = remote._file.tail_start
+            remote._file.plan([(tail_start + 10, tail_start + 20), (tail_start - 100, tail_start + 100), (0, 10)])
+
+            self.assertEqual(remote._file.spans, [(0, 10), (tail_start - 100, tail_start)])
+            self.assertEqual(remote._file._read_ahead_end(tail_start - 100, 1), tail_start)
+
+
+if __name__ == "__main__":
+    unittest.main()